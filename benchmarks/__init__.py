@@ -0,0 +1,3 @@
+"""
+Benchmarks - Reproducible performance measurements against a local Postgres
+"""
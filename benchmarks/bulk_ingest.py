@@ -0,0 +1,90 @@
+# benchmarks/bulk_ingest.py
+"""
+Bulk order ingestion throughput (COPY staging + set-based inserts).
+
+Usage:
+    uv run python -m benchmarks.bulk_ingest --orders 20000 --tenant-id 3
+
+Feeds synthetic ManualOrderRequest payloads to ``bulk_ingest_orders`` inside
+a transaction that is rolled back, and reports orders/s.
+"""
+
+import argparse
+import asyncio
+import json
+import random
+import time
+
+import asyncpg
+
+from src.services.orders_bulk import bulk_ingest_orders
+
+
+class _Rollback(Exception):
+    """Raised to discard the benchmark transaction"""
+
+
+async def _payloads(count: int, product_ids: list[int], items: int):
+    for row_no in range(1, count + 1):
+        yield (
+            row_no,
+            {
+                "payment_method": random.choice(["cash", "card", "bank_transfer"]),
+                "items": [
+                    {"product_id": pid, "quantity": random.randint(1, 5)}
+                    for pid in random.sample(product_ids, min(items, len(product_ids)))
+                ],
+            },
+        )
+
+
+async def main(args: argparse.Namespace) -> dict:
+    if args.dsn is None:
+        from src.core.config import settings
+
+        args.dsn = settings.DATABASE_URL
+
+    conn = await asyncpg.connect(args.dsn)
+    try:
+        product_ids = [
+            row["id"]
+            for row in await conn.fetch(
+                "SELECT id FROM product WHERE tenant_id = $1 AND sale_price > 0",
+                args.tenant_id,
+            )
+        ]
+        if not product_ids:
+            raise SystemExit(f"Tenant {args.tenant_id} has no products to order")
+
+        result = {}
+        start = time.perf_counter()
+        try:
+            async with conn.transaction():
+                result = await bulk_ingest_orders(
+                    _payloads(args.orders, product_ids, args.items),
+                    conn=conn,
+                    tenant_id=args.tenant_id,
+                )
+                elapsed = time.perf_counter() - start
+                raise _Rollback
+        except _Rollback:
+            pass
+
+        return {
+            "orders": args.orders,
+            "inserted": result["inserted"],
+            "failed": result["failed"],
+            "seconds": round(elapsed, 3),
+            "orders_per_second": round(result["inserted"] / elapsed, 1),
+        }
+    finally:
+        await conn.close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--dsn", default=None, help="defaults to settings.DATABASE_URL")
+    parser.add_argument("--tenant-id", type=int, default=3)
+    parser.add_argument("--orders", type=int, default=20000)
+    parser.add_argument("--items", type=int, default=3, help="line items per order")
+    print(json.dumps(asyncio.run(main(parser.parse_args())), indent=2))
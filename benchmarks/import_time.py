@@ -0,0 +1,91 @@
+# benchmarks/import_time.py
+"""
+Import-time profile and budget check for the application.
+
+Usage:
+    uv run python -m benchmarks.import_time --budget 1.0 --top 15
+
+Imports --module (src.main by default) in fresh interpreters with
+``-X importtime``, keeps the fastest of --runs, prints the slowest modules by
+cumulative time and exits with status 1 if the import takes longer than
+--budget seconds (IMPORT_TIME_BUDGET env var, 1.0 by default). The same
+budget is enforced by tests/test_import_time.py.
+"""
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+
+DEFAULT_BUDGET = float(os.environ.get("IMPORT_TIME_BUDGET", "1.0"))
+
+# Must never be imported by src.main (loaded lazily on first use)
+LAZY_MODULES = ("pandas", "numpy", "pyarrow", "afip")
+
+
+def profile_import(module: str) -> list[tuple[str, int, int]]:
+    """(module, self_us, cumulative_us) for every module imported"""
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        capture_output=True,
+        text=True,
+    )
+    if result.returncode != 0:
+        raise SystemExit(f"import {module} failed:\n{result.stderr[-2000:]}")
+
+    rows = []
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cumulative_us, name = line.removeprefix("import time:").split("|")
+        rows.append((name.strip(), int(self_us), int(cumulative_us)))
+    return rows
+
+
+def main(args: argparse.Namespace) -> int:
+    runs = [profile_import(args.module) for _ in range(args.runs)]
+    totals = [
+        next(cumulative for name, _, cumulative in rows if name == args.module)
+        for rows in runs
+    ]
+    best = runs[totals.index(min(totals))]
+    seconds = min(totals) / 1e6
+
+    top_level = {name.split(".")[0] for name, _, _ in best}
+    eager = sorted(top_level & set(LAZY_MODULES))
+
+    report = {
+        "module": args.module,
+        "seconds": round(seconds, 3),
+        "budget_seconds": args.budget,
+        "runs": [round(t / 1e6, 3) for t in totals],
+        "slowest": [
+            {"module": name, "cumulative_ms": round(cum / 1000, 1)}
+            for name, _, cum in sorted(best, key=lambda r: r[2], reverse=True)[
+                : args.top
+            ]
+        ],
+        "eager_heavy_imports": eager,
+    }
+    print(json.dumps(report, indent=2))
+
+    if seconds > args.budget:
+        print(
+            f"import {args.module} took {seconds:.3f}s, budget is {args.budget:.3f}s",
+            file=sys.stderr,
+        )
+        return 1
+    if eager:
+        print(f"Imported eagerly: {', '.join(eager)}", file=sys.stderr)
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--module", default="src.main")
+    parser.add_argument("--budget", type=float, default=DEFAULT_BUDGET, help="seconds")
+    parser.add_argument("--runs", type=int, default=3, help="keep the fastest")
+    parser.add_argument("--top", type=int, default=15)
+    sys.exit(main(parser.parse_args()))
@@ -0,0 +1,327 @@
+# benchmarks/load_test.py
+"""
+HTTP load test against a running API.
+
+Usage:
+    uv run python -m benchmarks.seed --orders 100000
+    uv run uvicorn src.main:app --workers 4 &
+    uv run python -m benchmarks.load_test --tenant-id 4 --concurrency 32 --duration 30
+
+Each scenario hammers one endpoint at --concurrency for --duration seconds (or
+--requests requests) and records throughput, status codes, p50/p95/p99 and a
+latency histogram. Results are written to --output as JSON; compare two runs
+with ``python -m benchmarks.load_test --compare before.json after.json``.
+"""
+
+import argparse
+import asyncio
+import bisect
+import json
+import random
+import subprocess
+import sys
+import time
+from collections import Counter
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Awaitable, Callable
+
+import httpx
+
+# Upper bounds (ms) of the latency histogram buckets; the last one is open
+HISTOGRAM_BUCKETS_MS = [1, 2, 5, 10, 20, 50, 100, 200, 500, 1000, 2000, 5000]
+
+PAYMENT_METHODS = ["cash", "card", "bank_transfer", "mercado_pago"]
+SEARCH_TERMS = ["torta", "alfajor", "pan", "budín", "tarta", "galletita", "LT"]
+
+
+class ScenarioContext:
+    """Ids sampled from the target tenant and the seeded RNG, shared by
+    every scenario"""
+
+    def __init__(
+        self,
+        tenant_id: int,
+        order_ids: list[int],
+        product_ids: list[int],
+        rng: random.Random,
+    ):
+        self.tenant_id = tenant_id
+        self.order_ids = order_ids
+        self.product_ids = product_ids
+        self.rng = rng
+
+    @classmethod
+    async def load(
+        cls, client: httpx.AsyncClient, tenant_id: int, seed: int
+    ) -> "ScenarioContext":
+        orders = await client.get(
+            "/orders", params={"tenant_id": tenant_id, "fields": "id", "limit": 500}
+        )
+        orders.raise_for_status()
+        products = await client.get(
+            "/products/search", params={"query": "LT", "tenant_id": tenant_id}
+        )
+        products.raise_for_status()
+
+        return cls(
+            tenant_id=tenant_id,
+            order_ids=[o["id"] for o in orders.json()["data"]],
+            product_ids=[p["id"] for p in products.json()],
+            rng=random.Random(seed),
+        )
+
+
+Scenario = Callable[[httpx.AsyncClient, ScenarioContext], Awaitable[httpx.Response]]
+
+
+async def create_order(client: httpx.AsyncClient, ctx: ScenarioContext):
+    items = ctx.rng.sample(ctx.product_ids, min(3, len(ctx.product_ids)))
+    return await client.post(
+        "/orders",
+        params={"tenant_id": ctx.tenant_id},
+        json={
+            "payment_method": ctx.rng.choice(PAYMENT_METHODS),
+            "items": [
+                {"product_id": pid, "quantity": ctx.rng.randint(1, 5)} for pid in items
+            ],
+        },
+    )
+
+
+async def list_orders(client: httpx.AsyncClient, ctx: ScenarioContext):
+    return await client.get("/orders", params={"tenant_id": ctx.tenant_id})
+
+
+async def get_order(client: httpx.AsyncClient, ctx: ScenarioContext):
+    order_id = ctx.rng.choice(ctx.order_ids)
+    return await client.get(f"/orders/{order_id}", params={"tenant_id": ctx.tenant_id})
+
+
+async def sales_report(client: httpx.AsyncClient, ctx: ScenarioContext):
+    return await client.get("/sales/reports", params={"tenant_id": ctx.tenant_id})
+
+
+async def search_products(client: httpx.AsyncClient, ctx: ScenarioContext):
+    return await client.get(
+        "/products/search",
+        params={"query": ctx.rng.choice(SEARCH_TERMS), "tenant_id": ctx.tenant_id},
+    )
+
+
+async def export_inventory(client: httpx.AsyncClient, ctx: ScenarioContext):
+    return await client.get("/exports/inventory", params={"tenant_id": ctx.tenant_id})
+
+
+SCENARIOS: dict[str, Scenario] = {
+    "create_order": create_order,
+    "list_orders": list_orders,
+    "get_order": get_order,
+    "sales_report": sales_report,
+    "search_products": search_products,
+    "export_inventory": export_inventory,
+}
+
+
+def percentile(sorted_values: list[float], pct: float) -> float:
+    if not sorted_values:
+        return 0.0
+    index = min(
+        len(sorted_values) - 1, int(round(pct / 100 * (len(sorted_values) - 1)))
+    )
+    return sorted_values[index]
+
+
+def summarize(
+    latencies_ms: list[float], statuses: Counter, errors: int, elapsed: float
+) -> dict:
+    latencies_ms.sort()
+    histogram = Counter(
+        bisect.bisect_left(HISTOGRAM_BUCKETS_MS, value) for value in latencies_ms
+    )
+    labels = [f"<={b}ms" for b in HISTOGRAM_BUCKETS_MS] + [
+        f">{HISTOGRAM_BUCKETS_MS[-1]}ms"
+    ]
+
+    return {
+        "requests": len(latencies_ms),
+        "errors": errors,
+        "status_codes": {str(code): n for code, n in sorted(statuses.items())},
+        "seconds": round(elapsed, 3),
+        "requests_per_second": round(len(latencies_ms) / elapsed, 1)
+        if elapsed
+        else 0.0,
+        "latency_ms": {
+            "min": round(latencies_ms[0], 2) if latencies_ms else 0.0,
+            "p50": round(percentile(latencies_ms, 50), 2),
+            "p95": round(percentile(latencies_ms, 95), 2),
+            "p99": round(percentile(latencies_ms, 99), 2),
+            "max": round(latencies_ms[-1], 2) if latencies_ms else 0.0,
+        },
+        "histogram": {labels[i]: histogram.get(i, 0) for i in range(len(labels))},
+    }
+
+
+async def run_scenario(
+    client: httpx.AsyncClient,
+    ctx: ScenarioContext,
+    scenario: Scenario,
+    concurrency: int,
+    duration: float,
+    max_requests: int | None,
+) -> dict:
+    latencies_ms: list[float] = []
+    statuses: Counter[int] = Counter()
+    errors = 0
+    issued = 0
+    deadline = time.perf_counter() + duration
+
+    async def worker():
+        nonlocal errors, issued
+        while time.perf_counter() < deadline:
+            if max_requests is not None:
+                if issued >= max_requests:
+                    return
+                issued += 1
+
+            start = time.perf_counter()
+            try:
+                response = await scenario(client, ctx)
+                await response.aread()
+                statuses[response.status_code] += 1
+                if response.status_code >= 400:
+                    errors += 1
+            except httpx.HTTPError:
+                statuses[0] += 1
+                errors += 1
+            latencies_ms.append((time.perf_counter() - start) * 1000)
+
+    start = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    return summarize(latencies_ms, statuses, errors, time.perf_counter() - start)
+
+
+def _git_revision() -> str | None:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            capture_output=True,
+            text=True,
+            check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+async def main(args: argparse.Namespace) -> dict:
+    limits = httpx.Limits(
+        max_connections=args.concurrency, max_keepalive_connections=args.concurrency
+    )
+    async with httpx.AsyncClient(
+        base_url=args.base_url, limits=limits, timeout=args.timeout
+    ) as client:
+        ctx = await ScenarioContext.load(client, args.tenant_id, args.seed)
+        if not ctx.product_ids or not ctx.order_ids:
+            raise SystemExit(
+                f"Tenant {args.tenant_id} has no orders/products; run benchmarks.seed first"
+            )
+
+        results = {}
+        for name in args.scenarios:
+            results[name] = await run_scenario(
+                client,
+                ctx,
+                SCENARIOS[name],
+                concurrency=args.concurrency,
+                duration=args.duration,
+                max_requests=args.requests,
+            )
+            print(
+                f"{name:>18}: {results[name]['requests_per_second']:>8} req/s  "
+                f"p50 {results[name]['latency_ms']['p50']:>8} ms  "
+                f"p99 {results[name]['latency_ms']['p99']:>8} ms  "
+                f"errors {results[name]['errors']}",
+                file=sys.stderr,
+            )
+
+    return {
+        "revision": _git_revision(),
+        "started_at": datetime.now(timezone.utc).isoformat(),
+        "base_url": args.base_url,
+        "tenant_id": args.tenant_id,
+        "concurrency": args.concurrency,
+        "duration": args.duration,
+        "requests": args.requests,
+        "seed": args.seed,
+        "scenarios": results,
+    }
+
+
+def compare(before_path: str, after_path: str) -> dict:
+    """Per-scenario throughput and p99 change between two result files"""
+    before = json.loads(Path(before_path).read_text())["scenarios"]
+    after = json.loads(Path(after_path).read_text())["scenarios"]
+
+    def change(old: float, new: float) -> float | None:
+        return round((new - old) / old * 100, 1) if old else None
+
+    return {
+        name: {
+            "requests_per_second": [
+                before[name]["requests_per_second"],
+                after[name]["requests_per_second"],
+                change(
+                    before[name]["requests_per_second"],
+                    after[name]["requests_per_second"],
+                ),
+            ],
+            "p99_ms": [
+                before[name]["latency_ms"]["p99"],
+                after[name]["latency_ms"]["p99"],
+                change(
+                    before[name]["latency_ms"]["p99"], after[name]["latency_ms"]["p99"]
+                ),
+            ],
+        }
+        for name in before
+        if name in after
+    }
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--base-url", default="http://localhost:8000")
+    parser.add_argument("--tenant-id", type=int, default=3)
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument(
+        "--duration", type=float, default=20.0, help="seconds per scenario"
+    )
+    parser.add_argument(
+        "--requests", type=int, default=None, help="stop each scenario after N requests"
+    )
+    parser.add_argument("--timeout", type=float, default=30.0)
+    parser.add_argument(
+        "--seed", type=int, default=1, help="seeds the request mix (ids, terms)"
+    )
+    parser.add_argument(
+        "--scenarios",
+        nargs="+",
+        choices=list(SCENARIOS),
+        default=list(SCENARIOS),
+    )
+    parser.add_argument("--output", default=None, help="write results JSON here")
+    parser.add_argument(
+        "--compare",
+        nargs=2,
+        metavar=("BEFORE", "AFTER"),
+        help="diff two result files instead of running",
+    )
+    args = parser.parse_args()
+
+    if args.compare:
+        print(json.dumps(compare(*args.compare), indent=2))
+    else:
+        report = json.dumps(asyncio.run(main(args)), indent=2)
+        if args.output:
+            Path(args.output).write_text(report)
+        print(report)
@@ -0,0 +1,210 @@
+# benchmarks/order_write.py
+"""
+Order write benchmark: legacy multi-statement pipeline vs ``create_order``.
+
+Usage:
+    uv run python -m benchmarks.order_write --orders 500 --tenant-id 3
+
+Runs both pipelines against the same database, counting round trips with an
+asyncpg query logger and reporting p50/p99 latency. Each order is created
+inside a transaction that is rolled back, so the benchmark leaves no data.
+"""
+
+import argparse
+import asyncio
+import json
+import statistics
+import time
+
+import asyncpg
+
+from src.api.schemas import ManualOrderRequest, PaymentMethod, ProductQty
+from src.services.orders import create_new_order
+
+
+class _Rollback(Exception):
+    """Raised to discard the benchmark transaction"""
+
+
+async def legacy_create_order(
+    order: ManualOrderRequest, conn: asyncpg.Connection, tenant_id: int
+) -> None:
+    """Statement sequence of the pre-008 ``create_new_order`` (baseline)"""
+    if order.customer_id:
+        await conn.fetchrow(
+            "SELECT * FROM customer WHERE id = $1 AND tenant_id = $2",
+            order.customer_id,
+            tenant_id,
+        )
+
+    order_row = await conn.fetchrow(
+        """
+        INSERT INTO "order"(customer_id, payment_method, notes, total_price, tenant_id)
+        VALUES ($1, $2, $3, $4, $5)
+        RETURNING id, created_at, order_date
+        """,
+        order.customer_id,
+        order.payment_method.value,
+        order.notes,
+        1,
+        tenant_id,
+    )
+    order_id = order_row["id"]
+
+    rows = await conn.fetch(
+        "SELECT id, name, sale_price, historical_cost FROM product WHERE id = ANY($1)",
+        [item.product_id for item in order.items],
+    )
+    products = {row["id"]: row for row in rows}
+
+    await conn.executemany(
+        """
+        INSERT INTO order_product (order_id, product_name, product_id, quantity, unit_price, iva_rate, tenant_id)
+        VALUES ($1, $2, $3, $4, $5, $6, $7)
+        """,
+        [
+            (
+                order_id,
+                products[item.product_id]["name"],
+                item.product_id,
+                item.quantity,
+                products[item.product_id]["sale_price"],
+                21.00,
+                tenant_id,
+            )
+            for item in order.items
+        ],
+    )
+
+    total = sum(products[i.product_id]["sale_price"] * i.quantity for i in order.items)
+    cost = sum(
+        (products[i.product_id]["historical_cost"] or 0) * i.quantity
+        for i in order.items
+    )
+    await conn.execute(
+        'UPDATE "order" SET total_price = $1 WHERE id = $2', total, order_id
+    )
+
+    entry_insert = "INSERT INTO ledger_entry(tenant_id, entry_date, order_id) VALUES($1, $2, $3) RETURNING id"
+    account_lookup = "SELECT id FROM ledger_account WHERE code = $1 AND tenant_id = $2"
+    line_insert = "INSERT INTO ledger_line(tenant_id, entry_id, account_id, debit, credit) VALUES ($1, $2, $3, $4, $5)"
+
+    entry_id = await conn.fetchval(
+        entry_insert, tenant_id, order_row["order_date"], order_id
+    )
+    cash_or_bank_id = await conn.fetchval(account_lookup, "1.2", tenant_id)
+    sales_id = await conn.fetchval(account_lookup, "4.1", tenant_id)
+    entry2_id = await conn.fetchval(
+        entry_insert, tenant_id, order_row["order_date"], order_id
+    )
+    cogs_id = await conn.fetchval(account_lookup, "5.1", tenant_id)
+    inventory_id = await conn.fetchval(account_lookup, "1.4", tenant_id)
+
+    await conn.executemany(
+        line_insert,
+        [
+            (tenant_id, entry2_id, cogs_id, cost, 0),
+            (tenant_id, entry2_id, inventory_id, 0, cost),
+        ],
+    )
+    await conn.executemany(
+        line_insert,
+        [
+            (tenant_id, entry_id, cash_or_bank_id, total, 0),
+            (tenant_id, entry_id, sales_id, 0, total),
+        ],
+    )
+
+
+async def new_create_order(
+    order: ManualOrderRequest, conn: asyncpg.Connection, tenant_id: int
+) -> None:
+    await create_new_order(order, conn, tenant_id=tenant_id)
+
+
+def _percentile(samples: list[float], pct: float) -> float:
+    ordered = sorted(samples)
+    index = min(len(ordered) - 1, round(pct / 100 * (len(ordered) - 1)))
+    return ordered[index]
+
+
+async def _run(pipeline, conn, orders, tenant_id) -> dict:
+    round_trips = 0
+
+    def count_query(record):
+        nonlocal round_trips
+        round_trips += 1
+
+    latencies = []
+    conn.add_query_logger(count_query)
+    try:
+        for order in orders:
+            start = time.perf_counter()
+            try:
+                async with conn.transaction():
+                    await pipeline(order, conn, tenant_id)
+                    raise _Rollback
+            except _Rollback:
+                pass
+            latencies.append((time.perf_counter() - start) * 1000)
+    finally:
+        conn.remove_query_logger(count_query)
+
+    return {
+        "orders": len(orders),
+        # BEGIN/ROLLBACK are included in the count for both pipelines
+        "round_trips_per_order": round_trips / len(orders),
+        "p50_ms": round(statistics.median(latencies), 3),
+        "p99_ms": round(_percentile(latencies, 99), 3),
+        "mean_ms": round(statistics.fmean(latencies), 3),
+    }
+
+
+async def main(args: argparse.Namespace) -> dict:
+    if args.dsn is None:
+        from src.core.config import settings
+
+        args.dsn = settings.DATABASE_URL
+
+    conn = await asyncpg.connect(args.dsn)
+    try:
+        product_ids = [
+            row["id"]
+            for row in await conn.fetch(
+                "SELECT id FROM product WHERE tenant_id = $1 ORDER BY id LIMIT $2",
+                args.tenant_id,
+                args.items,
+            )
+        ]
+        if not product_ids:
+            raise SystemExit(f"Tenant {args.tenant_id} has no products to order")
+
+        orders = [
+            ManualOrderRequest(
+                payment_method=PaymentMethod.CARD,
+                items=[ProductQty(product_id=pid, quantity=1) for pid in product_ids],
+            )
+            for _ in range(args.orders)
+        ]
+
+        # Warm up plans/caches on both paths before measuring
+        await _run(legacy_create_order, conn, orders[:10], args.tenant_id)
+        await _run(new_create_order, conn, orders[:10], args.tenant_id)
+
+        return {
+            "items_per_order": len(product_ids),
+            "before": await _run(legacy_create_order, conn, orders, args.tenant_id),
+            "after": await _run(new_create_order, conn, orders, args.tenant_id),
+        }
+    finally:
+        await conn.close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--dsn", default=None, help="defaults to settings.DATABASE_URL")
+    parser.add_argument("--tenant-id", type=int, default=3)
+    parser.add_argument("--orders", type=int, default=500)
+    parser.add_argument("--items", type=int, default=3, help="line items per order")
+    report = asyncio.run(main(parser.parse_args()))
+    print(json.dumps(report, indent=2))
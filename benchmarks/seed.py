@@ -0,0 +1,215 @@
+# benchmarks/seed.py
+"""
+Seed a local Postgres with synthetic load-test tenants.
+
+Usage:
+    uv run python -m benchmarks.seed --tenants 1 --products 5000 --customers 2000 --orders 100000
+
+Each tenant gets a chart of accounts, products, customers and orders (the
+orders go through the same COPY-based path as POST /orders/bulk). Prints the
+created tenant ids as JSON; pass one of them to benchmarks.load_test.
+
+Every random value comes from a Python RNG seeded by --seed, so the same
+--seed and --as-of produce the same dataset (ids depend on the database).
+"""
+
+import argparse
+import asyncio
+import json
+import random
+import time
+from datetime import date, datetime, time as dt_time, timedelta, timezone
+
+import asyncpg
+
+from src.services.orders_bulk import bulk_ingest_orders
+
+CHART_OF_ACCOUNTS = [
+    ("1.1", "Caja"),
+    ("1.2", "Banco"),
+    ("1.4", "Inventario"),
+    ("4.1", "Ventas"),
+    ("5.1", "Costo de Mercadería Vendida"),
+]
+
+PAYMENT_METHODS = ["cash", "card", "bank_transfer", "mercado_pago"]
+
+ORDER_CHUNK_SIZE = 10_000
+
+
+async def seed_tenant(
+    conn: asyncpg.Connection,
+    products: int,
+    customers: int,
+    orders: int,
+    items_per_order: int,
+    seed: int,
+    as_of: datetime,
+) -> dict:
+    rng = random.Random(seed)
+
+    tenant_id = await conn.fetchval(
+        "INSERT INTO tenant (name) VALUES ($1) RETURNING id", f"Load test {seed}"
+    )
+
+    await conn.executemany(
+        "INSERT INTO ledger_account (tenant_id, code, name) VALUES ($1, $2, $3)",
+        [(tenant_id, code, name) for code, name in CHART_OF_ACCOUNTS],
+    )
+
+    await conn.execute(
+        """
+        INSERT INTO product (
+            name, sku, category, supplier, sale_price, historical_cost,
+            replacement_cost, current_stock, min_stock, tenant_id
+        )
+        SELECT
+            'Producto ' || (ARRAY['Torta', 'Alfajor', 'Pan', 'Budín', 'Tarta', 'Galletita'])[1 + g % 6] || ' ' || g,
+            'LT' || $1 || '-' || lpad(g::TEXT, 7, '0'),
+            (ARRAY['Tortas', 'Panes', 'Facturas', 'Bebidas'])[1 + g % 4],
+            'Proveedor ' || (g % 25),
+            price,
+            round(price * 0.55, 2),
+            round(price * 0.6, 2),
+            (g % 200)::NUMERIC,
+            10,
+            $1
+        FROM unnest($2::NUMERIC[]) WITH ORDINALITY AS p(price, g)
+        """,
+        tenant_id,
+        [round(100 + rng.random() * 9900, 2) for _ in range(products)],
+    )
+
+    await conn.execute(
+        """
+        INSERT INTO customer (name, email, phone, tenant_id)
+        SELECT
+            'Cliente ' || g,
+            'cliente' || g || '@loadtest.local',
+            '11' || lpad(g::TEXT, 8, '0'),
+            $1
+        FROM generate_series(1, $2) AS g
+        """,
+        tenant_id,
+        customers,
+    )
+
+    product_ids = [
+        r["id"]
+        for r in await conn.fetch(
+            "SELECT id FROM product WHERE tenant_id = $1 ORDER BY id", tenant_id
+        )
+    ]
+    customer_ids = [
+        r["id"]
+        for r in await conn.fetch(
+            "SELECT id FROM customer WHERE tenant_id = $1 ORDER BY id", tenant_id
+        )
+    ]
+
+    async def payloads(start: int, count: int):
+        for row_no in range(start, start + count):
+            yield (
+                row_no,
+                {
+                    "customer_id": rng.choice(customer_ids)
+                    if customer_ids and rng.random() < 0.7
+                    else None,
+                    "payment_method": rng.choice(PAYMENT_METHODS),
+                    "items": [
+                        {"product_id": pid, "quantity": rng.randint(1, 5)}
+                        for pid in rng.sample(
+                            product_ids, min(items_per_order, len(product_ids))
+                        )
+                    ],
+                },
+            )
+
+    inserted = 0
+    for start in range(1, orders + 1, ORDER_CHUNK_SIZE):
+        result = await bulk_ingest_orders(
+            payloads(start, min(ORDER_CHUNK_SIZE, orders - start + 1)),
+            conn=conn,
+            tenant_id=tenant_id,
+        )
+        inserted += result["inserted"]
+
+    # Spread order dates over the year before --as-of so date filters and
+    # reports have work; ledger entries move with their order
+    order_ids = [
+        r["id"]
+        for r in await conn.fetch(
+            'SELECT id FROM "order" WHERE tenant_id = $1 ORDER BY id', tenant_id
+        )
+    ]
+    await conn.execute(
+        """
+        WITH moved AS (
+            UPDATE "order" AS o
+            SET order_date = d.order_date
+            FROM unnest($2::INT[], $3::TIMESTAMPTZ[]) AS d(id, order_date)
+            WHERE o.id = d.id AND o.tenant_id = $1
+            RETURNING o.id, o.order_date
+        )
+        UPDATE ledger_entry AS le
+        SET entry_date = moved.order_date
+        FROM moved
+        WHERE le.order_id = moved.id AND le.tenant_id = $1
+        """,
+        tenant_id,
+        order_ids,
+        [as_of - timedelta(seconds=rng.random() * 365 * 86400) for _ in order_ids],
+    )
+
+    return {
+        "tenant_id": tenant_id,
+        "products": len(product_ids),
+        "customers": len(customer_ids),
+        "orders": inserted,
+    }
+
+
+async def main(args: argparse.Namespace) -> list[dict]:
+    if args.dsn is None:
+        from src.core.config import settings
+
+        args.dsn = settings.DATABASE_URL
+
+    conn = await asyncpg.connect(args.dsn)
+    try:
+        tenants = []
+        for n in range(args.tenants):
+            start = time.perf_counter()
+            tenant = await seed_tenant(
+                conn,
+                products=args.products,
+                customers=args.customers,
+                orders=args.orders,
+                items_per_order=args.items,
+                seed=args.seed + n,
+                as_of=datetime.combine(args.as_of, dt_time(), timezone.utc),
+            )
+            tenant["seconds"] = round(time.perf_counter() - start, 1)
+            tenants.append(tenant)
+        await conn.execute("ANALYZE")
+        return tenants
+    finally:
+        await conn.close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--dsn", default=None, help="defaults to settings.DATABASE_URL")
+    parser.add_argument("--tenants", type=int, default=1)
+    parser.add_argument("--products", type=int, default=5_000)
+    parser.add_argument("--customers", type=int, default=2_000)
+    parser.add_argument("--orders", type=int, default=100_000)
+    parser.add_argument("--items", type=int, default=3, help="line items per order")
+    parser.add_argument("--seed", type=int, default=1, help="random seed")
+    parser.add_argument(
+        "--as-of",
+        type=date.fromisoformat,
+        default=date.today(),
+        help="orders are dated in the year before this day (YYYY-MM-DD)",
+    )
+    print(json.dumps(asyncio.run(main(parser.parse_args())), indent=2))
@@ -5,6 +5,7 @@ from src.api.routes import (
     auth,
     components,
     exports,
+    metrics,
     orders,
     products,
     sales,
@@ -20,3 +21,4 @@ api_router.include_router(components.router)
 api_router.include_router(sales.router)
 api_router.include_router(exports.router)
 api_router.include_router(integrations_router)
+api_router.include_router(metrics.router)
@@ -1,9 +1,12 @@
 # src/routes/orders.py
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, Request
+from fastapi.responses import StreamingResponse
 
 from src.api.schemas import ComponentResponse
 from src.core.database import get_conn
+from src.core.streaming import SSE_MEDIA_TYPE
 from src.services import get_components_list
+from src.services.inventory_alerts import stream_low_stock_alerts
 
 router = APIRouter(prefix="/components", tags=["Components"])
 
@@ -19,6 +22,16 @@ async def get_components(
     )
 
 
+@router.get("/alerts/stream")
+async def stream_alerts(request: Request):
+    """Server-sent events: open low-stock alerts, then every change"""
+    return StreamingResponse(
+        stream_low_stock_alerts(request.app.state.conn_pool, request),
+        media_type=SSE_MEDIA_TYPE,
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
 @router.get("/{component_id}", response_model=ComponentResponse)
 async def get_component_by_id(component_id: int, conn=Depends(get_conn)):
     row = await conn.fetchrow("SELECT * FROM component WHERE id = $1", component_id)
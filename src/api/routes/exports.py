@@ -1,87 +1,102 @@
-import io
+from datetime import datetime
 
-import pandas as pd
-from fastapi import APIRouter, Depends
-from fastapi.responses import StreamingResponse
-from loguru import logger
+from fastapi import APIRouter, Depends, Query, Request, status
+from fastapi.responses import FileResponse
 
+from src.api.schemas import (
+    ExportCompression,
+    ExportFormat,
+    ExportJobStatus,
+    ExportKind,
+)
+from src.core.columnar import COLUMNAR_MEDIA_TYPES
 from src.core.database import get_conn
+from src.core.streaming import negotiate_stream_format
+from src.services.export_jobs import export_jobs
+from src.services.exports import (
+    LEDGER_EXPORT_QUERY,
+    ORDERS_EXPORT_QUERY,
+    stream_copy_export,
+    stream_inventory,
+)
 
 router = APIRouter(prefix="/exports", tags=["exports"])
 
 
 @router.get("/inventory")
-async def export_inventory(tenant_id: int = 3, conn=Depends(get_conn)):
-    sql = """
-        SELECT
-            sku                                      AS "Código",
-            name                                     AS "Título",
-            supplier                                 AS "Proveedor",
-            current_stock                            AS "Stock Actual",
-            historical_cost                          AS "Costo Histórico (ARS)",
-            replacement_cost                         AS "Costo Reposición (ARS)",
-            sale_price                               AS "Precio Venta (ARS)"
-        FROM product
-        WHERE tenant_id = $1;
-    """
-    rows = await conn.fetch(sql, tenant_id)
-
-    df = pd.DataFrame([dict(r) for r in rows])
-
-    # Si está vacío, devolvé CSV vacío con headers
-    if df.empty:
-        csv_string = pd.DataFrame(
-            columns=[
-                "Código",
-                "Título",
-                "Proveedor",
-                "Stock Actual",
-                "Costo Histórico (ARS)",
-                "Costo Reposición (ARS)",
-                "Precio Venta (ARS)",
-                "Ganancia (Venta)",
-                "% Ganancia",
-                "% Ganancia Repo",
-            ]
-        ).to_csv(index=False)
-        return StreamingResponse(
-            io.BytesIO(csv_string.encode("utf-8")),
-            media_type="text/csv",
-            headers={"Content-Disposition": 'attachment; filename="inventario.csv"'},
-        )
-
-    # Asegurar numéricos (por si vienen Decimal/str)
-    for col in [
-        "Costo Histórico (ARS)",
-        "Costo Reposición (ARS)",
-        "Precio Venta (ARS)",
-    ]:
-        df[col] = pd.to_numeric(df[col], errors="coerce")
-
-    # Calcular ganancias y márgenes
-    df["Ganancia (Venta)"] = df["Precio Venta (ARS)"] - df["Costo Histórico (ARS)"]
-    df["% Ganancia"] = (
-        ((df["Ganancia (Venta)"] / df["Precio Venta (ARS)"]) * 100)
-        .round()
-        .astype("Int64")
+async def export_inventory(
+    request: Request, tenant_id: int = 3, conn=Depends(get_conn)
+):
+    # CSV by default; Accept: application/vnd.apache.parquet |
+    # application/vnd.apache.arrow.stream for columnar output
+    fmt = negotiate_stream_format(request.headers.get("accept"), COLUMNAR_MEDIA_TYPES)
+    return stream_inventory(conn=conn, fmt=fmt or "csv", tenant_id=tenant_id)
+
+
+@router.get("/orders")
+async def export_orders(
+    tenant_id: int = 3,
+    date_from: datetime | None = Query(None, alias="from"),
+    date_to: datetime | None = Query(None, alias="to"),
+    conn=Depends(get_conn),
+):
+    """Order lines as CSV (COPY TO STDOUT)"""
+    return stream_copy_export(
+        conn, ORDERS_EXPORT_QUERY, "pedidos", tenant_id, date_from, date_to
     )
-    df["% Ganancia Repo"] = (
-        (
-            (
-                (df["Precio Venta (ARS)"] - df["Costo Reposición (ARS)"])
-                / df["Precio Venta (ARS)"]
-            )
-            * 100
-        )
-        .round()
-        .astype("Int64")
+
+
+@router.get("/ledger")
+async def export_ledger(
+    tenant_id: int = 3,
+    date_from: datetime | None = Query(None, alias="from"),
+    date_to: datetime | None = Query(None, alias="to"),
+    conn=Depends(get_conn),
+):
+    """Ledger lines as CSV (COPY TO STDOUT)"""
+    return stream_copy_export(
+        conn, LEDGER_EXPORT_QUERY, "libro_diario", tenant_id, date_from, date_to
     )
 
-    csv_string = df.to_csv(index=False)
-    logger.info("Export inventory CSV generated")
 
-    return StreamingResponse(
-        io.BytesIO(csv_string.encode("utf-8")),
-        media_type="text/csv",
-        headers={"Content-Disposition": 'attachment; filename="inventario.csv"'},
+def _job_response(request: Request, job) -> dict:
+    response = job.model_dump(mode="json")
+    response["download_url"] = (
+        str(request.url_for("download_export_job", job_id=job.id))
+        if job.status == ExportJobStatus.DONE
+        else None
+    )
+    return response
+
+
+@router.get("/jobs/{job_id}")
+async def get_export_job(job_id: str, request: Request):
+    return _job_response(request, export_jobs.get(job_id))
+
+
+@router.get("/jobs/{job_id}/download", name="download_export_job")
+async def download_export_job(job_id: str):
+    path, media_type, filename = export_jobs.artifact(export_jobs.get(job_id))
+    return FileResponse(path, media_type=media_type, filename=filename)
+
+
+@router.post("/{kind}", status_code=status.HTTP_202_ACCEPTED)
+async def create_export_job(
+    kind: ExportKind,
+    request: Request,
+    tenant_id: int = 3,
+    format: ExportFormat = ExportFormat.CSV,
+    compression: ExportCompression = ExportCompression.NONE,
+    date_from: datetime | None = Query(None, alias="from"),
+    date_to: datetime | None = Query(None, alias="to"),
+):
+    """Queue an export; poll GET /exports/jobs/{id} until it is done"""
+    job = await export_jobs.submit(
+        kind=kind,
+        tenant_id=tenant_id,
+        fmt=format,
+        compression=compression,
+        date_from=date_from,
+        date_to=date_to,
     )
+    return _job_response(request, job)
@@ -1,5 +1,4 @@
 # src/api/routes/integrations/tiendanube.py
-import httpx
 from fastapi import APIRouter, Depends, HTTPException
 from fastapi.responses import RedirectResponse
 from loguru import logger
@@ -8,7 +7,8 @@ from src.api.routes.integrations.tiendanube_deps import get_store_credentials
 from src.api.schemas import TiendaNubeProductDB
 from src.core.config import settings
 from src.core.database import get_conn
-from src.services.tiendanube import sync_products_from_tiendanube
+from src.core.http_clients import http_clients
+from src.services.tiendanube import TIENDANUBE_CLIENT, sync_products_from_tiendanube
 
 router = APIRouter(prefix="/tiendanube", tags=["TiendaNube"])
 
@@ -29,28 +29,28 @@ async def get_auth_url():
 async def tiendanube_callback(code: str, conn=Depends(get_conn)):
     # Paso 1: Intercambiar code por token
     try:
-        async with httpx.AsyncClient() as client:
-            response = await client.post(
-                "https://www.tiendanube.com/apps/authorize/token",
-                json={
-                    "client_id": settings.TIENDANUBE_APP_ID,
-                    "client_secret": settings.TIENDANUBE_CLIENT_SECRET,
-                    "grant_type": "authorization_code",
-                    "code": code,
-                },
-            )
+        client = http_clients.get(TIENDANUBE_CLIENT)
+        response = await client.post(
+            "https://www.tiendanube.com/apps/authorize/token",
+            json={
+                "client_id": settings.TIENDANUBE_APP_ID,
+                "client_secret": settings.TIENDANUBE_CLIENT_SECRET,
+                "grant_type": "authorization_code",
+                "code": code,
+            },
+        )
 
-            if response.status_code != 200:
-                logger.error(f"TiendaNube OAuth failed: {response.status_code}")
-                return RedirectResponse(
-                    url=f"{settings.FRONTEND_URL}/dashboard?integration_error=oauth_failed"
-                )
+        if response.status_code != 200:
+            logger.error(f"TiendaNube OAuth failed: {response.status_code}")
+            return RedirectResponse(
+                url=f"{settings.FRONTEND_URL}/dashboard?integration_error=oauth_failed"
+            )
 
-            data = response.json()
-            access_token = data["access_token"]
-            store_id = str(data["user_id"])
-            user_id = data["user_id"]
-            scope = data.get("scope", "")
+        data = response.json()
+        access_token = data["access_token"]
+        store_id = str(data["user_id"])
+        user_id = data["user_id"]
+        scope = data.get("scope", "")
 
     except Exception as e:
         logger.error(f"OAuth exchange error: {type(e).__name__}")
@@ -98,12 +98,18 @@ async def tiendanube_callback(code: str, conn=Depends(get_conn)):
 
 @router.post("/products/sync")
 async def sync_products(
-    conn=Depends(get_conn), credentials=Depends(get_store_credentials)
+    conn=Depends(get_conn),
+    credentials=Depends(get_store_credentials),
+    tenant_id: int = 2,
+    full: bool = False,
 ):
+    """Products changed since the last sync; ``full=true`` re-downloads all"""
     result = await sync_products_from_tiendanube(
         store_id=credentials["store_id"],
         access_token=credentials["access_token"],
         conn=conn,
+        tenant_id=tenant_id,
+        full=full,
     )
 
     return result
@@ -147,29 +153,29 @@ async def get_products(
 async def tiendanube_get_categories(conn=Depends(get_conn)):
     credentials = await get_store_credentials(conn, tenant_id=2)
 
-    async with httpx.AsyncClient() as client:
-        response = await client.get(
-            f"https://api.tiendanube.com/v1/{credentials['store_id']}/products",
-            headers={
-                "Authentication": f"bearer {credentials['access_token']}",
-                "User-Agent": "TALOS ERP (tomasgilamoedo@gmail.com)",
-            },
-        )
+    client = http_clients.get(TIENDANUBE_CLIENT)
+    response = await client.get(
+        f"https://api.tiendanube.com/v1/{credentials['store_id']}/products",
+        headers={
+            "Authentication": f"bearer {credentials['access_token']}",
+            "User-Agent": "TALOS ERP (tomasgilamoedo@gmail.com)",
+        },
+    )
 
-        logger.info(f"Response headers: {response.headers}")
-        logger.info(f"Total products: {response.headers.get('X-Total-Count')}")
-        logger.info(f"Link header: {response.headers.get('Link')}")
+    logger.info(f"Response headers: {response.headers}")
+    logger.info(f"Total products: {response.headers.get('X-Total-Count')}")
+    logger.info(f"Link header: {response.headers.get('Link')}")
 
-        if response.status_code != 200:
-            logger.error(f"TiendaNube API error: {response.status_code}")
-            raise HTTPException(
-                status_code=502, detail="Failed to fetch products from TiendaNube"
-            )
+    if response.status_code != 200:
+        logger.error(f"TiendaNube API error: {response.status_code}")
+        raise HTTPException(
+            status_code=502, detail="Failed to fetch products from TiendaNube"
+        )
 
-        return response.json()
+    return response.json()
 
-        # products = [TiendaNubeProduct(**el) for el in raw_products]
+    # products = [TiendaNubeProduct(**el) for el in raw_products]
 
-        # logger.info(len(products))
+    # logger.info(len(products))
 
-        # return raw_products
+    # return raw_products
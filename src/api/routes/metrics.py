@@ -0,0 +1,28 @@
+# src/api/routes/metrics.py
+from fastapi import APIRouter
+
+from src.core.http_clients import http_clients
+from src.core.statements import statement_registry
+from src.services.export_jobs import export_jobs
+from src.services.inventory_alerts import low_stock_alerts
+from src.services.ledger_posting import ledger_poster
+from src.services.prices import price_cache
+from src.services.product_search import product_search_cache
+from src.services.production import bom_graphs
+
+router = APIRouter(prefix="/metrics", tags=["Metrics"])
+
+
+@router.get("")
+async def get_metrics():
+    """In-process counters (per worker)"""
+    return {
+        "statements": statement_registry.stats(),
+        "ledger_outbox": ledger_poster.stats(),
+        "export_jobs": export_jobs.stats(),
+        "product_search_cache": product_search_cache.stats(),
+        "price_cache": price_cache.stats(),
+        "low_stock_alerts": low_stock_alerts.stats(),
+        "bom_graphs": bom_graphs.stats(),
+        "http_clients": http_clients.stats(),
+    }
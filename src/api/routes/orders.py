@@ -1,35 +1,136 @@
 # src/routes/orders.py
-from fastapi import APIRouter, Depends, status
+from datetime import datetime
 
-from src.api.schemas import ManualOrderRequest, OrderStatus, PaymentMethod
+from fastapi import APIRouter, Depends, Query, Request, status
+
+from src.api.schemas import (
+    ManualOrderRequest,
+    OrderQuote,
+    OrderQuoteRequest,
+    OrderSource,
+    OrderStatus,
+    PaymentMethod,
+)
 from src.core.database import get_conn
-from src.services.orders import create_new_order, fetch_order_detail, fetch_orders
+from src.core.exceptions import InvalidQueryError
+from src.core.pagination import DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE
+from src.core.streaming import negotiate_stream_format
+from src.services.orders import (
+    create_new_order,
+    fetch_order_detail,
+    fetch_order_detail_when_posted,
+    fetch_order_details,
+    fetch_orders,
+    stream_orders,
+)
+from src.services.orders_bulk import bulk_ingest_orders, iter_bulk_payloads
+from src.services.prices import quote_order
 
 router = APIRouter(prefix="/orders", tags=["Orders"])
 
 
 @router.get("")
 async def get_orders(
+    request: Request,
     conn=Depends(get_conn),
     tenant_id: int = 3,
     status: OrderStatus | None = None,
     customer_id: int | None = None,
     payment_method: PaymentMethod | None = None,
+    date_from: datetime | None = Query(None, alias="from"),
+    date_to: datetime | None = Query(None, alias="to"),
+    cursor: str | None = None,
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    fields: str | None = None,
 ):
+    # Accept: application/x-ndjson | text/csv streams every matching row
+    fmt = negotiate_stream_format(request.headers.get("accept"))
+    if fmt is not None:
+        return stream_orders(
+            conn=conn,
+            fmt=fmt,
+            status=status,
+            customer_id=customer_id,
+            payment_method=payment_method,
+            tenant_id=tenant_id,
+            date_from=date_from,
+            date_to=date_to,
+            fields=fields,
+        )
+
     return await fetch_orders(
         conn=conn,
         status=status,
         customer_id=customer_id,
         payment_method=payment_method,
         tenant_id=tenant_id,
+        date_from=date_from,
+        date_to=date_to,
+        cursor=cursor,
+        limit=limit,
+        fields=fields,
     )
 
 
+@router.get("/details")
+async def get_order_details(
+    ids: str = Query(..., description="Comma-separated order ids"),
+    tenant_id: int = 3,
+    conn=Depends(get_conn),
+):
+    try:
+        order_ids = [int(i) for i in ids.split(",") if i.strip()]
+    except ValueError:
+        raise InvalidQueryError("ids", "expected comma-separated integers")
+
+    if not order_ids or len(order_ids) > MAX_PAGE_SIZE:
+        raise InvalidQueryError("ids", f"expected 1 to {MAX_PAGE_SIZE} order ids")
+
+    return await fetch_order_details(order_ids, tenant_id=tenant_id, conn=conn)
+
+
 @router.get("/{order_id}")
-async def get_order(order_id: int, tenant_id: int = 3, conn=Depends(get_conn)):
-    return await fetch_order_detail(order_id, tenant_id=tenant_id, conn=conn)
+async def get_order(
+    order_id: int,
+    request: Request,
+    tenant_id: int = 3,
+    wait_for_accounting: bool = False,
+):
+    # Acquired here rather than through get_conn: the wait holds no connection
+    pool = request.app.state.conn_pool
+    if wait_for_accounting:
+        return await fetch_order_detail_when_posted(order_id, tenant_id, pool)
+
+    async with pool.acquire() as conn:
+        return await fetch_order_detail(order_id, tenant_id=tenant_id, conn=conn)
 
 
 @router.post("", status_code=status.HTTP_201_CREATED)
-async def create_order(order: ManualOrderRequest, conn=Depends(get_conn)):
-    return await create_new_order(order, conn)
+async def create_order(
+    order: ManualOrderRequest, tenant_id: int = 3, conn=Depends(get_conn)
+):
+    return await create_new_order(order, conn, tenant_id=tenant_id)
+
+
+@router.post("/quote", response_model=OrderQuote)
+async def create_order_quote(
+    quote: OrderQuoteRequest, tenant_id: int = 3, conn=Depends(get_conn)
+):
+    """Total at current prices, served from the price cache"""
+    return await quote_order(conn, tenant_id, quote.items)
+
+
+@router.post("/bulk")
+async def create_orders_bulk(
+    request: Request,
+    tenant_id: int = 3,
+    source: OrderSource | None = None,
+    conn=Depends(get_conn),
+):
+    """Body: JSON array or NDJSON (one ManualOrderRequest per line)"""
+    payloads = iter_bulk_payloads(
+        request.stream(), request.headers.get("content-type", "application/json")
+    )
+    return await bulk_ingest_orders(
+        payloads, conn=conn, tenant_id=tenant_id, source=source
+    )
@@ -1,22 +1,66 @@
 # src/routes/products.py
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, Query, Request, Response
 
+from src.api.schemas import (
+    MaxProducibleQuantity,
+    ProductionBatchAvailability,
+    ProductionBatchRequest,
+    ProductPrice,
+)
 from src.core.database import get_conn
+from src.core.exceptions import InvalidQueryError
+from src.core.http_cache import etag_matches, make_etag
+from src.core.pagination import DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE
 from src.services.products import (
     check_production_availability,
+    get_catalog_version,
     get_products_list,
-    search_products,
 )
+from src.services.prices import get_product_prices
+from src.services.product_search import search_products
+from src.services.production import check_production_batch, get_max_producible
 
 router = APIRouter(prefix="/products", tags=["Products"])
 
 
 @router.get("")
 async def get_products(
+    request: Request,
+    response: Response,
+    tenant_id: int = 3,
     is_active: bool | None = None,
+    category: str | None = None,
+    requires_production: bool | None = None,
+    cursor: str | None = None,
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
     conn=Depends(get_conn),
 ):
-    return await get_products_list(conn, is_active)
+    # Version is read before the page: a change committed in between makes
+    # the page newer than its ETag, never older
+    version = await get_catalog_version(conn, tenant_id)
+    etag = make_etag(
+        f"{tenant_id}.{version}",
+        is_active,
+        category,
+        requires_production,
+        cursor,
+        limit,
+    )
+    headers = {"ETag": etag, "Cache-Control": "no-cache"}
+
+    if etag_matches(request.headers.get("if-none-match"), etag):
+        return Response(status_code=304, headers=headers)
+
+    response.headers.update(headers)
+    return await get_products_list(
+        conn,
+        tenant_id=tenant_id,
+        is_active=is_active,
+        category=category,
+        requires_production=requires_production,
+        cursor=cursor,
+        limit=limit,
+    )
 
 
 @router.get("/check-availability")
@@ -24,6 +68,42 @@ async def check_availability(product_name: str, quantity: int, conn=Depends(get_
     return await check_production_availability(product_name, quantity, conn)
 
 
+@router.post("/check-availability/batch", response_model=ProductionBatchAvailability)
+async def check_availability_batch(
+    request: ProductionBatchRequest, tenant_id: int = 3, conn=Depends(get_conn)
+):
+    return await check_production_batch(conn, tenant_id, request.items)
+
+
+@router.get("/max-producible", response_model=list[MaxProducibleQuantity])
+async def max_producible(tenant_id: int = 3, conn=Depends(get_conn)):
+    return await get_max_producible(conn, tenant_id)
+
+
+@router.get("/prices", response_model=list[ProductPrice])
+async def get_prices(
+    ids: str = Query(..., description="Comma-separated product ids"),
+    tenant_id: int = 3,
+    conn=Depends(get_conn),
+):
+    try:
+        product_ids = [int(i) for i in ids.split(",") if i.strip()]
+    except ValueError:
+        raise InvalidQueryError("ids", "expected comma-separated integers")
+
+    if not product_ids or len(product_ids) > MAX_PAGE_SIZE:
+        raise InvalidQueryError("ids", f"expected 1 to {MAX_PAGE_SIZE} product ids")
+
+    return await get_product_prices(conn, tenant_id, product_ids)
+
+
 @router.get("/search")
-async def get_search_products(query: str, tenant_id: int = 3, conn=Depends(get_conn)):
-    return await search_products(query=query, tenant_id=tenant_id, conn=conn)
+async def get_search_products(
+    query: str,
+    tenant_id: int = 3,
+    limit: int = Query(20, ge=1, le=100),
+    conn=Depends(get_conn),
+):
+    return await search_products(
+        query=query, tenant_id=tenant_id, limit=limit, conn=conn
+    )
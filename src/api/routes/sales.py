@@ -1,14 +1,61 @@
-from fastapi import APIRouter, Depends
+from datetime import datetime
 
+from fastapi import APIRouter, Depends, Query, Request
+
+from src.api.schemas import SalesGrouping
+from src.core.columnar import COLUMNAR_MEDIA_TYPES
 from src.core.database import get_conn
-from src.services.sales import fetch_sales_report
+from src.core.pagination import DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE
+from src.core.streaming import STREAM_MEDIA_TYPES, negotiate_stream_format
+from src.services.sales import (
+    fetch_sales_report,
+    fetch_sales_rollup,
+    stream_sales_report,
+)
 
 router = APIRouter(prefix="/sales", tags=["Sales"])
 
 
 @router.get("/reports")
 async def get_sales_report(
+    request: Request,
     tenant_id: int = 3,
+    group_by: SalesGrouping | None = None,
+    date_from: datetime | None = Query(None, alias="from"),
+    date_to: datetime | None = Query(None, alias="to"),
+    cursor: str | None = None,
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
     conn=Depends(get_conn),
 ):
-    return await fetch_sales_report(conn=conn, tenant_id=tenant_id)
+    if group_by is not None:
+        return await fetch_sales_rollup(
+            conn=conn,
+            group_by=group_by,
+            tenant_id=tenant_id,
+            date_from=date_from,
+            date_to=date_to,
+        )
+
+    # Accept: application/x-ndjson | text/csv | application/vnd.apache.parquet |
+    # application/vnd.apache.arrow.stream streams every matching line item
+    fmt = negotiate_stream_format(
+        request.headers.get("accept"),
+        {**STREAM_MEDIA_TYPES, **COLUMNAR_MEDIA_TYPES},
+    )
+    if fmt is not None:
+        return stream_sales_report(
+            conn=conn,
+            fmt=fmt,
+            tenant_id=tenant_id,
+            date_from=date_from,
+            date_to=date_to,
+        )
+
+    return await fetch_sales_report(
+        conn=conn,
+        tenant_id=tenant_id,
+        date_from=date_from,
+        date_to=date_to,
+        cursor=cursor,
+        limit=limit,
+    )
@@ -10,6 +10,13 @@ from src.api.schemas.auth import (
     UserResponse,
 )
 from src.api.schemas.customers import Customer, CustomerBase
+from src.api.schemas.exports import (
+    ExportCompression,
+    ExportFormat,
+    ExportJob,
+    ExportJobStatus,
+    ExportKind,
+)
 from src.api.schemas.invoices import (
     CustomerTaxRegime,
     Factura,
@@ -21,8 +28,11 @@ from src.api.schemas.invoices import (
 from src.api.schemas.orders import (
     DeliveryStatus,
     ManualOrderRequest,
+    Order,
     OrderBase,
     OrderCreate,
+    OrderQuote,
+    OrderQuoteRequest,
     OrderResponse,
     OrderResponseItem,
     OrderSource,
@@ -33,11 +43,18 @@ from src.api.schemas.orders import (
 )
 from src.api.schemas.products import (
     ComponentAvailability,
+    ComponentDemand,
     ComponentResponse,
+    MaxProducibleQuantity,
     Product,
     ProductBase,
+    ProductListItem,
+    ProductPrice,
+    ProductionBatchAvailability,
+    ProductionBatchRequest,
+    ProductionItemAvailability,
 )
-from src.api.schemas.sales import SaleResponse
+from src.api.schemas.sales import SaleResponse, SalesGrouping, SalesRollupResponse
 from src.api.schemas.tiendanube import (
     TiendaNubeProduct,
     TiendaNubeProductDB,
@@ -60,15 +77,25 @@ __all__ = [
     "DeliveryStatus",
     "ProductQty",
     "OrderBase",
+    "Order",
     "ManualOrderRequest",
     "OrderCreate",
     "OrderResponseItem",
     "OrderResponse",
+    "OrderQuoteRequest",
+    "OrderQuote",
     # Products
     "ComponentAvailability",
+    "ComponentDemand",
     "ComponentResponse",
     "Product",
     "ProductBase",
+    "ProductListItem",
+    "ProductPrice",
+    "ProductionBatchRequest",
+    "ProductionItemAvailability",
+    "ProductionBatchAvailability",
+    "MaxProducibleQuantity",
     # Invoices
     "CustomerTaxRegime",
     "IVAItem",
@@ -81,6 +108,14 @@ __all__ = [
     "Customer",
     # Sales
     "SaleResponse",
+    "SalesGrouping",
+    "SalesRollupResponse",
+    # Exports
+    "ExportKind",
+    "ExportFormat",
+    "ExportCompression",
+    "ExportJobStatus",
+    "ExportJob",
     # TiendaNube
     "TiendaNubeProduct",
     "TiendaNubeProductDB",
@@ -0,0 +1,52 @@
+from datetime import datetime
+from enum import Enum
+
+from pydantic import BaseModel
+
+
+class ExportKind(Enum):
+    INVENTORY = "inventory"
+    SALES = "sales"
+
+
+class ExportFormat(Enum):
+    CSV = "csv"
+    NDJSON = "ndjson"
+    PARQUET = "parquet"
+    ARROW = "arrow"
+
+
+class ExportCompression(Enum):
+    NONE = "none"
+    GZIP = "gzip"
+    ZSTD = "zstd"
+
+
+class ExportJobStatus(Enum):
+    QUEUED = "queued"
+    RUNNING = "running"
+    DONE = "done"
+    FAILED = "failed"
+
+
+class ExportJob(BaseModel):
+    id: str
+    kind: ExportKind
+    tenant_id: int
+    format: ExportFormat
+    compression: ExportCompression
+    date_from: datetime | None = None
+    date_to: datetime | None = None
+
+    status: ExportJobStatus = ExportJobStatus.QUEUED
+    # Watermark of the source tables the artifact was built from
+    watermark: str | None = None
+    # Served from an artifact built by an earlier job
+    cached: bool = False
+    filename: str | None = None
+    size_bytes: int | None = None
+    rows: int | None = None
+    error: str | None = None
+
+    created_at: datetime
+    finished_at: datetime | None = None
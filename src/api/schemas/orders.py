@@ -75,6 +75,12 @@ class OrderBase(BaseModel):
     delivery_notes: Optional[str] = None
 
 
+class Order(OrderBase):
+    id: int
+    created_at: Optional[datetime] = None
+    updated_at: Optional[datetime] = None
+
+
 class ManualOrderRequest(BaseModel):
     customer_id: int | None = None
     payment_method: PaymentMethod
@@ -95,6 +101,15 @@ class OrderResponseItem(BaseModel):
     subtotal: Decimal
 
 
+class OrderQuoteRequest(BaseModel):
+    items: list[ProductQty]
+
+
+class OrderQuote(BaseModel):
+    total_price: Decimal
+    items: list[OrderResponseItem]
+
+
 class OrderResponse(BaseModel):
     order_id: int
     customer_name: str
@@ -2,7 +2,9 @@ from datetime import datetime
 from decimal import Decimal
 from typing import Optional
 
-from pydantic import BaseModel
+from pydantic import BaseModel, Field
+
+from src.api.schemas.orders import ProductQty
 
 
 class ComponentAvailability(BaseModel):
@@ -14,6 +16,56 @@ class ComponentAvailability(BaseModel):
     missing_quantity: Decimal
 
 
+class ProductionBatchRequest(BaseModel):
+    items: list[ProductQty] = Field(..., min_length=1)
+
+
+class ProductionItemAvailability(BaseModel):
+    product_id: int
+    product_name: str
+    quantity: int
+    can_produce: bool  # On its own, ignoring the rest of the batch
+    components: list[ComponentAvailability]
+
+
+class ComponentDemand(BaseModel):
+    """One component's demand across a whole batch"""
+
+    component_id: int
+    component_name: str
+    available: Decimal
+    total_needed: Decimal
+    can_produce: bool
+    missing_quantity: Decimal
+    product_ids: list[int]
+    # Needed by several products and short only for their combined demand
+    contended: bool
+
+
+class ProductionBatchAvailability(BaseModel):
+    can_produce_all: bool
+    items: list[ProductionItemAvailability]
+    components: list[ComponentDemand]
+
+
+class MaxProducibleQuantity(BaseModel):
+    product_id: int
+    product_name: str
+    max_quantity: int | None  # None: the product has no bill of materials
+    limiting_component_id: int | None = None
+    limiting_component_name: str | None = None
+
+
+class ProductPrice(BaseModel):
+    product_id: int
+    name: str
+    sku: str | None = None
+    sale_price: Decimal
+    historical_cost: Decimal | None = None
+    iva_rate: Decimal | None = None
+    is_active: bool | None = None
+
+
 class ComponentResponse(BaseModel):
     id: int
     name: str
@@ -50,6 +102,27 @@ class Product(ProductBase):
     concept: int
 
 
+class ProductListItem(BaseModel):
+    """Catalog row as stored: manufactured products have no stock columns"""
+
+    id: int
+    tenant_id: int
+    name: str
+    description: Optional[str] = None
+    sku: Optional[str] = None
+    sale_price: Decimal
+    category: Optional[str] = None
+    current_stock: Optional[Decimal] = None
+    min_stock: Optional[Decimal] = None
+    replacement_cost: Optional[Decimal] = None
+    iva_rate: Optional[Decimal] = None
+    supplier: Optional[str] = None
+    is_active: Optional[bool] = None
+    requires_production: Optional[bool] = None
+    concept: int
+    created_at: Optional[datetime] = None
+
+
 # -- Table: public.product
 
 # -- DROP TABLE IF EXISTS public.product;
@@ -1,4 +1,4 @@
-from datetime import datetime
+from datetime import date, datetime
 from decimal import Decimal
 from enum import Enum
 
@@ -56,3 +56,26 @@ class SaleResponse(BaseModel):
     total_price: Decimal
     total_cost: Decimal
     profit: Decimal
+
+
+class SalesGrouping(Enum):
+    DAY = "day"
+    WEEK = "week"
+    MONTH = "month"
+    PRODUCT = "product"
+    SKU = "sku"
+
+
+class SalesRollupResponse(BaseModel):
+    # Period start for day/week/month groupings
+    period: date | None = None
+    # Product / SKU groupings
+    product_id: int | None = None
+    sku: str | None = None
+    product_name: str | None = None
+
+    quantity: Decimal
+    revenue: Decimal
+    cost: Decimal
+    profit: Decimal
+    line_count: int
@@ -0,0 +1,162 @@
+# src/core/columnar.py
+from enum import Enum
+from typing import AsyncIterator, Sequence
+
+import asyncpg
+from fastapi.responses import StreamingResponse
+
+from src.core.exceptions import UnsupportedFormatError
+
+PARQUET_MEDIA_TYPE = "application/vnd.apache.parquet"
+ARROW_MEDIA_TYPE = "application/vnd.apache.arrow.stream"
+
+COLUMNAR_MEDIA_TYPES = {"parquet": PARQUET_MEDIA_TYPE, "arrow": ARROW_MEDIA_TYPE}
+
+# Rows per record batch / Parquet row group
+COLUMNAR_CHUNK_SIZE = 10_000
+
+# Scale wide enough for NUMERIC(10,2) * NUMERIC(8,2) products
+DECIMAL_PRECISION = 38
+DECIMAL_SCALE = 4
+
+
+def _pyarrow():
+    try:
+        import pyarrow
+        import pyarrow.ipc  # noqa: F401
+        import pyarrow.parquet  # noqa: F401
+    except ImportError:
+        raise UnsupportedFormatError(
+            "parquet/arrow",
+            "pyarrow is not installed on this server (install the 'export' extra)",
+        )
+    return pyarrow
+
+
+def arrow_schema(columns: dict[str, str]):
+    """pyarrow schema from ``{column: kind}``.
+
+    Kinds are plain strings (text, int, decimal, float, bool, date,
+    timestamp) so services can declare columns without importing pyarrow.
+    """
+    pa = _pyarrow()
+    types = {
+        "text": pa.string(),
+        "int": pa.int64(),
+        "decimal": pa.decimal128(DECIMAL_PRECISION, DECIMAL_SCALE),
+        "float": pa.float64(),
+        "bool": pa.bool_(),
+        "date": pa.date32(),
+        "timestamp": pa.timestamp("us", tz="UTC"),
+    }
+    return pa.schema([(name, types[kind]) for name, kind in columns.items()])
+
+
+def _arrow_value(value):
+    if isinstance(value, Enum):
+        return value.value
+    return value
+
+
+def record_batch(rows: Sequence[asyncpg.Record], schema):
+    """Transpose a chunk of records into typed columns"""
+    pa = _pyarrow()
+    columns = zip(*(row.values() for row in rows)) if rows else [()] * len(schema)
+    arrays = []
+    for field, values in zip(schema, columns):
+        if pa.types.is_string(field.type):
+            values = [
+                v if v is None or isinstance(v, str) else str(_arrow_value(v))
+                for v in values
+            ]
+        arrays.append(pa.array(values, type=field.type))
+    return pa.RecordBatch.from_arrays(arrays, schema=schema)
+
+
+class _ChunkSink:
+    """Write-only file object collecting output between yields.
+
+    Writers only append, so ``tell`` reports total bytes written even though
+    the buffer is drained after every batch.
+    """
+
+    def __init__(self):
+        self._chunks: list[bytes] = []
+        self._position = 0
+        self.closed = False
+
+    def write(self, data) -> int:
+        data = bytes(data)
+        self._chunks.append(data)
+        self._position += len(data)
+        return len(data)
+
+    def tell(self) -> int:
+        return self._position
+
+    def flush(self) -> None:
+        pass
+
+    def close(self) -> None:
+        self.closed = True
+
+    def writable(self) -> bool:
+        return True
+
+    def seekable(self) -> bool:
+        return False
+
+    def drain(self) -> bytes:
+        data = b"".join(self._chunks)
+        self._chunks.clear()
+        return data
+
+
+async def columnar_chunks(
+    batches: AsyncIterator[Sequence[asyncpg.Record]], schema, fmt: str
+) -> AsyncIterator[bytes]:
+    """Encode record batches as a Parquet file (one row group per batch) or
+    an Arrow IPC stream, yielding bytes as each batch is written"""
+    pa = _pyarrow()
+    sink = _ChunkSink()
+
+    if fmt == "parquet":
+        writer = pa.parquet.ParquetWriter(sink, schema, compression="zstd")
+    else:
+        writer = pa.ipc.new_stream(sink, schema)
+
+    try:
+        async for rows in batches:
+            batch = record_batch(rows, schema)
+            if fmt == "parquet":
+                writer.write_batch(batch, row_group_size=len(rows))
+            else:
+                writer.write_batch(batch)
+            yield sink.drain()
+    finally:
+        writer.close()
+    yield sink.drain()
+
+
+def stream_columnar(
+    batches: AsyncIterator[Sequence[asyncpg.Record]],
+    columns: dict[str, str],
+    fmt: str,
+    filename: str | None = None,
+) -> StreamingResponse:
+    """StreamingResponse writing record batches as Parquet or Arrow IPC.
+
+    The schema is built before the response starts, so a missing pyarrow is
+    reported as a 406 instead of a truncated body.
+    """
+    schema = arrow_schema(columns)
+    headers = (
+        {"Content-Disposition": f'attachment; filename="{filename}.{fmt}"'}
+        if filename
+        else None
+    )
+    return StreamingResponse(
+        columnar_chunks(batches, schema, fmt),
+        media_type=COLUMNAR_MEDIA_TYPES[fmt],
+        headers=headers,
+    )
@@ -11,10 +11,56 @@ class Settings(BaseSettings):
     TIENDANUBE_CLIENT_SECRET: str
     TIENDANUBE_REDIRECT_URI: str
 
+    # Product sync: page 1 gives the page count, the rest are fetched
+    # concurrently (the API allows up to 200 products per page)
+    TIENDANUBE_PAGE_SIZE: int = 200
+    TIENDANUBE_MAX_CONCURRENCY: int = 4
+    TIENDANUBE_MAX_RETRIES: int = 3
+    # Incremental sync re-requests this many seconds before the watermark
+    TIENDANUBE_SYNC_OVERLAP: float = 300.0
+
+    # Outbound integrations: one pooled client each (src/core/http_clients.py)
+    HTTP_CLIENT_TIMEOUT: float = 30.0
+    HTTP_CLIENT_CONNECT_TIMEOUT: float = 5.0
+    HTTP_CLIENT_MAX_CONNECTIONS: int = 20
+    HTTP_CLIENT_MAX_KEEPALIVE: int = 10
+    HTTP_CLIENT_KEEPALIVE_EXPIRY: float = 30.0
+    HTTP_CLIENT_MAX_PER_HOST: int = 8
+
     FRONTEND_URL: str
 
     CUIT: str
 
+    # AFIP credentials, loaded on first invoicing call
+    AFIP_CERT_PATH: str = "~/afip-certs/certificado.crt"
+    AFIP_KEY_PATH: str = "~/afip-certs/private.key"
+    AFIP_PRODUCTION: bool = False
+
+    # Ledger posting: "sync" (in the order transaction) or "outbox" (background)
+    LEDGER_POSTING_MODE: str = "sync"
+    LEDGER_OUTBOX_BATCH_SIZE: int = 500
+    LEDGER_OUTBOX_POLL_INTERVAL: float = 5.0
+    LEDGER_WAIT_TIMEOUT: float = 5.0
+
+    # Export jobs: artifacts on local disk, reused while the data is unchanged
+    EXPORT_DIR: str = "exports"
+    EXPORT_MAX_CONCURRENT_JOBS: int = 2
+    EXPORT_ARTIFACT_TTL: float = 24 * 3600
+    EXPORT_PRUNE_INTERVAL: float = 3600.0
+
+    # Product search: per-tenant LRU of short (autocomplete) queries
+    PRODUCT_SEARCH_CACHE_SIZE: int = 256
+    PRODUCT_SEARCH_CACHE_MAX_LENGTH: int = 4
+    PRODUCT_SEARCH_CACHE_TTL: float = 30.0
+
+    # Product prices: read-through cache, LRU on tenants
+    PRICE_CACHE_MAX_TENANTS: int = 64
+    PRICE_CACHE_TTL: float = 300.0
+
+    # Low-stock alert stream (GET /components/alerts/stream)
+    ALERT_STREAM_QUEUE_SIZE: int = 100
+    ALERT_STREAM_KEEPALIVE: float = 15.0
+
     class Config:
         env_file = ".env"
 
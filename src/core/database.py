@@ -8,6 +8,12 @@ from fastapi import FastAPI, Request
 from loguru import logger
 
 from src.core import settings
+from src.core.http_clients import http_clients
+from src.core.notifications import pg_listener
+from src.core.statements import statement_registry
+from src.services.export_jobs import export_jobs
+from src.services.inventory_alerts import low_stock_alerts
+from src.services.ledger_posting import ledger_poster
 
 BASE_DIR = Path(__file__).resolve().parent.parent  # Sube 2 niveles desde database.py
 LOGS_DIR = BASE_DIR / "logs"
@@ -43,13 +49,35 @@ async def lifespan(app: FastAPI):
         DATABASE_URL,
         min_size=2,
         max_size=10,
+        # Registered filter-combination statements, prepared per connection
+        init=statement_registry.prepare_all,
     )
 
     logger.info("Database pool created", min_size=2, max_size=10)
 
+    # Cache invalidation (LISTEN/NOTIFY) on its own connection
+    await pg_listener.start(DATABASE_URL)
+
+    # Drains ledger_outbox (deferred ledger posting)
+    await ledger_poster.start(app.state.conn_pool)
+
+    # Background exports (POST /exports/{kind})
+    await export_jobs.start(app.state.conn_pool)
+
+    # Shared, keep-alive HTTP clients for outbound integrations
+    await http_clients.start()
+
+    # SSE streams end on the exit signal, before uvicorn waits on them
+    low_stock_alerts.start()
+
     yield
 
     logger.info("Shutting down application")
+    await low_stock_alerts.stop()
+    await export_jobs.stop()
+    await http_clients.stop()
+    await ledger_poster.stop()
+    await pg_listener.stop()
     await app.state.conn_pool.close()
     logger.info("Database pool closed")
 
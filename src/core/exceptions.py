@@ -20,3 +20,28 @@ class InvalidQuantityError(AppException):
         message = f"Invalid Quantity: {quantity}, (must be > 0)"
         super().__init__(message, status_code=400)
         self.quantity = quantity
+
+
+class InvalidPayloadError(AppException):
+    """Request body could not be decoded"""
+
+    def __init__(self, message: str):
+        super().__init__(message, status_code=400)
+
+
+class InvalidQueryError(AppException):
+    """Invalid query parameter (unknown field, malformed cursor...)"""
+
+    def __init__(self, parameter: str, detail: str):
+        message = f"Invalid {parameter}: {detail}"
+        super().__init__(message, status_code=400)
+        self.parameter = parameter
+
+
+class UnsupportedFormatError(AppException):
+    """Requested output format can't be produced by this server"""
+
+    def __init__(self, fmt: str, detail: str):
+        message = f"Unsupported format {fmt}: {detail}"
+        super().__init__(message, status_code=406)
+        self.format = fmt
@@ -0,0 +1,28 @@
+# src/core/http_cache.py
+import hashlib
+import json
+
+
+def make_etag(version: int | str, *variant) -> str:
+    """Weak ETag for one representation of a versioned resource.
+
+    ``variant`` holds whatever selects the representation (filters, cursor,
+    page size), so two pages of the same version never share a tag.
+    """
+    digest = hashlib.sha1(
+        json.dumps(variant, default=str, separators=(",", ":")).encode()
+    ).hexdigest()[:16]
+    return f'W/"{version}-{digest}"'
+
+
+def etag_matches(if_none_match: str | None, etag: str) -> bool:
+    """Weak comparison of ``etag`` against an If-None-Match header"""
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    opaque = etag.removeprefix("W/")
+    return any(
+        candidate.strip().removeprefix("W/") == opaque
+        for candidate in if_none_match.split(",")
+    )
@@ -0,0 +1,196 @@
+import asyncio
+import importlib.util
+from collections import defaultdict
+from typing import AsyncIterator, Callable
+
+import httpx
+from loguru import logger
+
+from src.core.config import settings
+
+
+class _ReleasingStream(httpx.AsyncByteStream):
+    """Response body that frees its host slot once closed"""
+
+    def __init__(self, stream: httpx.AsyncByteStream, release: Callable[[], None]):
+        self._stream = stream
+        self._release = release
+
+    async def __aiter__(self) -> AsyncIterator[bytes]:
+        async for chunk in self._stream:
+            yield chunk
+
+    async def aclose(self) -> None:
+        try:
+            await self._stream.aclose()
+        finally:
+            if self._release is not None:
+                self._release()
+                self._release = None
+
+
+class _HostLimitedTransport(httpx.AsyncBaseTransport):
+    """Caps requests in flight per host (httpx only limits the whole pool).
+
+    A slot is held until the response body is closed, which is when the
+    connection goes back to the pool.
+    """
+
+    def __init__(self, transport: httpx.AsyncBaseTransport, max_per_host: int):
+        self._transport = transport
+        self._max_per_host = max_per_host
+        self._semaphores: dict[str, asyncio.Semaphore] = {}
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        semaphore = self._semaphores.setdefault(
+            request.url.host, asyncio.Semaphore(self._max_per_host)
+        )
+        await semaphore.acquire()
+        try:
+            response = await self._transport.handle_async_request(request)
+        except BaseException:
+            semaphore.release()
+            raise
+        if isinstance(response.stream, httpx.ByteStream):
+            # Body already in memory: no connection left to hold
+            semaphore.release()
+        else:
+            response.stream = _ReleasingStream(response.stream, semaphore.release)
+        return response
+
+    def in_flight(self) -> dict[str, int]:
+        return {
+            host: self._max_per_host - semaphore._value
+            for host, semaphore in self._semaphores.items()
+            if semaphore._value < self._max_per_host
+        }
+
+    async def aclose(self) -> None:
+        await self._transport.aclose()
+
+
+class IntegrationStats:
+    """Requests vs. connections opened, from httpcore trace events"""
+
+    def __init__(self):
+        self.requests = 0
+        self.connections_opened = 0
+        self.tls_handshakes = 0
+        self.errors = 0
+        self.by_http_version: dict[str, int] = defaultdict(int)
+
+    async def on_request(self, request: httpx.Request) -> None:
+        self.requests += 1
+        request.extensions["trace"] = self.trace
+
+    async def on_response(self, response: httpx.Response) -> None:
+        self.by_http_version[response.http_version] += 1
+
+    async def trace(self, event_name: str, info: dict) -> None:
+        if event_name == "connection.connect_tcp.complete":
+            self.connections_opened += 1
+        elif event_name == "connection.start_tls.complete":
+            self.tls_handshakes += 1
+        elif event_name.endswith(".failed"):
+            self.errors += 1
+
+    def as_dict(self) -> dict:
+        reused = max(self.requests - self.connections_opened, 0)
+        return {
+            "requests": self.requests,
+            "connections_opened": self.connections_opened,
+            "tls_handshakes": self.tls_handshakes,
+            "reused": reused,
+            "reuse_rate": round(reused / self.requests, 4) if self.requests else None,
+            "errors": self.errors,
+            "http_versions": dict(self.by_http_version),
+        }
+
+
+class HTTPClientRegistry:
+    """One pooled ``httpx.AsyncClient`` per outbound integration.
+
+    Integrations register their name at import time; the clients are
+    created when the app starts and closed on shutdown, so connections
+    (and TLS sessions) are kept alive across requests. HTTP/2 is used when
+    the ``h2`` package is installed (the ``http2`` extra).
+    """
+
+    def __init__(self):
+        self._names: set[str] = set()
+        self._clients: dict[str, httpx.AsyncClient] = {}
+        self._transports: dict[str, _HostLimitedTransport] = {}
+        self._stats: dict[str, IntegrationStats] = {}
+        self.http2 = importlib.util.find_spec("h2") is not None
+
+    def register(self, name: str) -> None:
+        self._names.add(name)
+
+    def _create(self, name: str) -> httpx.AsyncClient:
+        stats = self._stats.setdefault(name, IntegrationStats())
+        transport = _HostLimitedTransport(
+            httpx.AsyncHTTPTransport(
+                http2=self.http2,
+                limits=httpx.Limits(
+                    max_connections=settings.HTTP_CLIENT_MAX_CONNECTIONS,
+                    max_keepalive_connections=settings.HTTP_CLIENT_MAX_KEEPALIVE,
+                    keepalive_expiry=settings.HTTP_CLIENT_KEEPALIVE_EXPIRY,
+                ),
+            ),
+            max_per_host=settings.HTTP_CLIENT_MAX_PER_HOST,
+        )
+        self._transports[name] = transport
+        return httpx.AsyncClient(
+            transport=transport,
+            timeout=httpx.Timeout(
+                settings.HTTP_CLIENT_TIMEOUT,
+                connect=settings.HTTP_CLIENT_CONNECT_TIMEOUT,
+            ),
+            event_hooks={
+                "request": [stats.on_request],
+                "response": [stats.on_response],
+            },
+        )
+
+    async def start(self) -> None:
+        for name in sorted(self._names):
+            if name not in self._clients:
+                self._clients[name] = self._create(name)
+        logger.info(
+            "HTTP clients created", integrations=sorted(self._clients), http2=self.http2
+        )
+        if not self.http2:
+            logger.info("HTTP/2 disabled: h2 is not installed (the 'http2' extra)")
+
+    def get(self, name: str) -> httpx.AsyncClient:
+        """The integration's shared client (created here outside the app)"""
+        client = self._clients.get(name)
+        if client is None or client.is_closed:
+            self._names.add(name)
+            client = self._clients[name] = self._create(name)
+        return client
+
+    async def stop(self) -> None:
+        for client in self._clients.values():
+            await client.aclose()
+        self._clients.clear()
+        self._transports.clear()
+
+    def stats(self) -> dict:
+        return {
+            "http2": self.http2,
+            "integrations": {
+                name: {
+                    **stats.as_dict(),
+                    "in_flight": (
+                        self._transports[name].in_flight()
+                        if name in self._transports
+                        else {}
+                    ),
+                }
+                for name, stats in self._stats.items()
+            },
+        }
+
+
+http_clients = HTTPClientRegistry()
@@ -0,0 +1,83 @@
+# src/core/notifications.py
+import asyncio
+from collections import defaultdict
+from typing import Callable
+
+import asyncpg
+from loguru import logger
+
+# Callback receives the NOTIFY payload, or None when notifications may have
+# been missed (listener connection lost) and every cached entry is suspect.
+NotificationHandler = Callable[[str | None], None]
+
+
+class PgListener:
+    """Dedicated LISTEN connection that fans out NOTIFY payloads to handlers"""
+
+    def __init__(self, reconnect_delay: float = 1.0):
+        self._handlers: dict[str, list[NotificationHandler]] = defaultdict(list)
+        self._conn: asyncpg.Connection | None = None
+        self._dsn: str | None = None
+        self._reconnect_delay = reconnect_delay
+        self._reconnect_task: asyncio.Task | None = None
+        self._closing = False
+
+    def subscribe(self, channel: str, handler: NotificationHandler) -> None:
+        """Register handler for channel (before or after start)"""
+        self._handlers[channel].append(handler)
+        if self._conn is not None and not self._conn.is_closed():
+            asyncio.get_running_loop().create_task(
+                self._conn.add_listener(channel, self._dispatch)
+            )
+
+    async def start(self, dsn: str) -> None:
+        self._dsn = dsn
+        self._closing = False
+        await self._connect()
+
+    async def stop(self) -> None:
+        self._closing = True
+        if self._reconnect_task is not None:
+            self._reconnect_task.cancel()
+        if self._conn is not None:
+            await self._conn.close()
+            self._conn = None
+
+    async def _connect(self) -> None:
+        self._conn = await asyncpg.connect(self._dsn)
+        self._conn.add_termination_listener(self._on_terminated)
+        for channel in self._handlers:
+            await self._conn.add_listener(channel, self._dispatch)
+        logger.info("Listening for notifications", channels=list(self._handlers))
+
+    def _dispatch(self, conn, pid: int, channel: str, payload: str) -> None:
+        for handler in self._handlers.get(channel, []):
+            try:
+                handler(payload)
+            except Exception as e:
+                logger.error(
+                    "Notification handler failed", channel=channel, error=str(e)
+                )
+
+    def _on_terminated(self, conn) -> None:
+        if self._closing:
+            return
+        logger.warning("Notification listener connection lost, reconnecting")
+        self._reconnect_task = asyncio.get_running_loop().create_task(self._reconnect())
+
+    async def _reconnect(self) -> None:
+        while not self._closing:
+            try:
+                await self._connect()
+            except (OSError, asyncpg.PostgresError) as e:
+                logger.warning("Listener reconnect failed", error=str(e))
+                await asyncio.sleep(self._reconnect_delay)
+                continue
+            # Anything could have changed while we were disconnected
+            for handlers in self._handlers.values():
+                for handler in handlers:
+                    handler(None)
+            return
+
+
+pg_listener = PgListener()
@@ -0,0 +1,50 @@
+# src/core/pagination.py
+import base64
+import json
+from datetime import datetime
+
+from src.core.exceptions import InvalidQueryError
+
+DEFAULT_PAGE_SIZE = 50
+MAX_PAGE_SIZE = 500
+
+
+def encode_cursor(*values) -> str:
+    """Opaque keyset cursor from the sort key of the last row of a page"""
+    raw = json.dumps(
+        [v.isoformat() if isinstance(v, datetime) else v for v in values],
+        separators=(",", ":"),
+    )
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str, *types: type) -> tuple:
+    """Inverse of encode_cursor; ``types`` converts each value back"""
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        values = json.loads(base64.urlsafe_b64decode(padded))
+        if len(values) != len(types):
+            raise ValueError("wrong number of values")
+        return tuple(
+            datetime.fromisoformat(v) if t is datetime else t(v)
+            for t, v in zip(types, values)
+        )
+    except (ValueError, TypeError) as e:
+        raise InvalidQueryError("cursor", str(e))
+
+
+def parse_fields(
+    fields: str | None, allowed: tuple[str, ...], required: tuple[str, ...]
+) -> tuple[str, ...]:
+    """Validate a ``fields=a,b,c`` projection (always includes ``required``)"""
+    if not fields:
+        return allowed
+
+    requested = [f.strip() for f in fields.split(",") if f.strip()]
+    unknown = [f for f in requested if f not in allowed]
+    if unknown:
+        raise InvalidQueryError("fields", f"unknown field(s) {', '.join(unknown)}")
+
+    # Keep table order so equal projections share one statement
+    wanted = set(requested) | set(required)
+    return tuple(f for f in allowed if f in wanted)
@@ -0,0 +1,100 @@
+# src/core/statements.py
+import re
+from collections import Counter
+from typing import Hashable
+
+import asyncpg
+from asyncpg.prepared_stmt import PreparedStatement
+from loguru import logger
+
+# "SELECT *" / "t.*": a prepared statement caches its result columns, so a
+# column added or dropped later fails it with InvalidCachedStatementError
+_STAR_SELECT = re.compile(r"(?:\bSELECT|,)\s*(?:\w+\.)?\*", re.IGNORECASE)
+
+
+class StatementRegistry:
+    """Finite set of per-service statements prepared on every pool connection.
+
+    Services register every variant their dynamic queries can take (one per
+    filter combination) at import time; ``prepare_all`` is the pool ``init``
+    hook, so each connection has them all prepared before its first use.
+    Statements are kept per connection object (a backend pid can be reused
+    by a later connection) and dropped when it closes.
+    """
+
+    def __init__(self):
+        self._statements: dict[str, dict[Hashable, str]] = {}
+        self._prepared: dict[
+            asyncpg.Connection, dict[tuple[str, Hashable], PreparedStatement]
+        ] = {}
+        self._hits: Counter[str] = Counter()
+        self._misses: Counter[str] = Counter()
+
+    def register(self, service: str, statements: dict[Hashable, str]) -> None:
+        for key, query in statements.items():
+            if _STAR_SELECT.search(query):
+                raise ValueError(
+                    f"Statement {service}/{key!r} selects '*': list its columns"
+                )
+        self._statements.setdefault(service, {}).update(statements)
+
+    async def prepare_all(self, conn: asyncpg.Connection) -> None:
+        """Pool ``init`` hook"""
+        prepared = self._connection_statements(conn)
+
+        for service, statements in self._statements.items():
+            for key, query in statements.items():
+                prepared[(service, key)] = await conn.prepare(query)
+
+        logger.debug(
+            "Statements prepared", pid=conn.get_server_pid(), count=len(prepared)
+        )
+
+    async def fetch(
+        self, conn: asyncpg.Connection, service: str, key: Hashable, *args
+    ) -> list[asyncpg.Record]:
+        statement = await self._get(conn, service, key)
+        return await statement.fetch(*args)
+
+    def _connection_statements(
+        self, conn: asyncpg.Connection
+    ) -> dict[tuple[str, Hashable], PreparedStatement]:
+        # Pool connections come wrapped in a proxy; key by the connection
+        # underneath, which is what prepare_all receives
+        conn = getattr(conn, "_con", None) or conn
+        prepared = self._prepared.get(conn)
+        if prepared is None:
+            prepared = self._prepared[conn] = {}
+            conn.add_termination_listener(lambda _: self._prepared.pop(conn, None))
+        return prepared
+
+    async def _get(
+        self, conn: asyncpg.Connection, service: str, key: Hashable
+    ) -> PreparedStatement:
+        prepared = self._connection_statements(conn)
+        statement = prepared.get((service, key))
+        if statement is not None:
+            self._hits[service] += 1
+            return statement
+
+        # Connection created before registration, or outside the pool
+        self._misses[service] += 1
+        statement = await conn.prepare(self._statements[service][key])
+        prepared[(service, key)] = statement
+        return statement
+
+    def stats(self) -> dict:
+        return {
+            "connections": len(self._prepared),
+            "services": {
+                service: {
+                    "statements": len(statements),
+                    "hits": self._hits[service],
+                    "misses": self._misses[service],
+                }
+                for service, statements in self._statements.items()
+            },
+        }
+
+
+statement_registry = StatementRegistry()
@@ -0,0 +1,205 @@
+# src/core/streaming.py
+import asyncio
+import csv
+import io
+import json
+import signal
+import threading
+from datetime import date, datetime
+from decimal import Decimal
+from enum import Enum
+from typing import AsyncIterator, Callable, Sequence
+
+import asyncpg
+from fastapi.responses import StreamingResponse
+
+NDJSON_MEDIA_TYPE = "application/x-ndjson"
+CSV_MEDIA_TYPE = "text/csv"
+SSE_MEDIA_TYPE = "text/event-stream"
+
+STREAM_MEDIA_TYPES = {"ndjson": NDJSON_MEDIA_TYPE, "csv": CSV_MEDIA_TYPE}
+
+DEFAULT_CHUNK_SIZE = 1000
+
+
+def negotiate_stream_format(
+    accept: str | None, media_types: dict[str, str] = STREAM_MEDIA_TYPES
+) -> str | None:
+    """Format key of ``media_types`` ('ndjson' / 'csv' by default) when the
+    Accept header asks for a stream, else None"""
+    if not accept:
+        return None
+    for part in accept.split(","):
+        media_type = part.split(";")[0].strip().lower()
+        for fmt, stream_media_type in media_types.items():
+            if media_type == stream_media_type:
+                return fmt
+    return None
+
+
+async def iter_record_batches(
+    conn: asyncpg.Connection,
+    query: str,
+    *params,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+) -> AsyncIterator[list[asyncpg.Record]]:
+    """Read query results through a server-side cursor, chunk_size rows at a time.
+
+    ``conn`` must stay acquired until the stream is exhausted (request-scoped
+    ``get_conn`` is released only after the response has been sent).
+    """
+    async with conn.transaction(readonly=True):
+        cursor = await conn.cursor(query, *params)
+        while rows := await cursor.fetch(chunk_size):
+            yield rows
+
+
+async def copy_csv_chunks(
+    conn: asyncpg.Connection, query: str, *params, queue_size: int = 16
+) -> AsyncIterator[bytes]:
+    """CSV rendered by Postgres (``COPY (query) TO STDOUT``), yielded as the
+    server sends it.
+
+    COPY runs in a task feeding a bounded queue, so a slow client applies
+    backpressure to the server instead of buffering the export in memory.
+    """
+    queue: asyncio.Queue[bytes | None] = asyncio.Queue(maxsize=queue_size)
+
+    async def copy():
+        try:
+            await conn.copy_from_query(
+                query, *params, output=queue.put, format="csv", header=True
+            )
+        except asyncio.CancelledError:
+            raise
+        except Exception:
+            await queue.put(None)
+            raise
+        await queue.put(None)
+
+    task = asyncio.create_task(copy())
+    try:
+        while (chunk := await queue.get()) is not None:
+            yield chunk
+        await task  # Surface COPY errors
+    finally:
+        if not task.done():
+            task.cancel()
+            await asyncio.gather(task, return_exceptions=True)
+
+
+def _json_default(value):
+    if isinstance(value, Decimal):
+        return float(value)
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    if isinstance(value, Enum):
+        return value.value
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+def sse_event(event: str, data, event_id: int | None = None) -> str:
+    """One server-sent event; ``data`` is sent as is if it is a string, as
+    JSON otherwise"""
+    if not isinstance(data, str):
+        data = json.dumps(data, default=_json_default, ensure_ascii=False)
+    lines = [f"id: {event_id}"] if event_id is not None else []
+    lines.append(f"event: {event}")
+    lines.extend(f"data: {line}" for line in data.splitlines() or [""])
+    return "\n".join(lines) + "\n\n"
+
+
+def _csv_value(value):
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    if isinstance(value, Enum):
+        return value.value
+    return value
+
+
+async def ndjson_chunks(
+    batches: AsyncIterator[Sequence[asyncpg.Record]],
+) -> AsyncIterator[bytes]:
+    async for rows in batches:
+        yield "".join(
+            json.dumps(dict(row), default=_json_default, ensure_ascii=False) + "\n"
+            for row in rows
+        ).encode("utf-8")
+
+
+async def csv_chunks(
+    batches: AsyncIterator[Sequence[asyncpg.Record]], columns: Sequence[str]
+) -> AsyncIterator[bytes]:
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+
+    writer.writerow(columns)
+    yield buffer.getvalue().encode("utf-8")
+
+    async for rows in batches:
+        buffer.seek(0)
+        buffer.truncate()
+        writer.writerows([_csv_value(v) for v in row.values()] for row in rows)
+        yield buffer.getvalue().encode("utf-8")
+
+
+def stream_records(
+    batches: AsyncIterator[Sequence[asyncpg.Record]],
+    columns: Sequence[str],
+    fmt: str,
+    filename: str | None = None,
+) -> StreamingResponse:
+    """StreamingResponse writing record batches as NDJSON or CSV"""
+    body = ndjson_chunks(batches) if fmt == "ndjson" else csv_chunks(batches, columns)
+    headers = (
+        {"Content-Disposition": f'attachment; filename="{filename}.{fmt}"'}
+        if filename
+        else None
+    )
+    return StreamingResponse(body, media_type=STREAM_MEDIA_TYPES[fmt], headers=headers)
+
+
+class ExitSignalHook:
+    """Runs ``callback`` on the event loop as soon as SIGINT/SIGTERM arrives.
+
+    uvicorn waits for open responses before running the lifespan shutdown,
+    so an endless stream (SSE) that only ends there holds the exit until the
+    graceful timeout. The hook chains to the handler installed before it
+    (uvicorn installs its own with ``signal.signal`` so that handlers can be
+    restored), and ``uninstall`` puts that handler back.
+    """
+
+    SIGNALS = (signal.SIGINT, signal.SIGTERM)
+
+    def __init__(self, callback: Callable[[], None]):
+        self._callback = callback
+        self._previous: dict[int, Callable] = {}
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self.active = False
+
+    def install(self) -> None:
+        """Call from the event loop; a no-op outside the main thread"""
+        if self.active or threading.current_thread() is not threading.main_thread():
+            return
+
+        self._loop = asyncio.get_running_loop()
+        for sig in self.SIGNALS:
+            previous = signal.getsignal(sig)
+            if callable(previous):  # Nothing to chain to otherwise
+                self._previous[sig] = previous
+                signal.signal(sig, self._handle)
+        self.active = bool(self._previous)
+
+    def uninstall(self) -> None:
+        for sig, previous in self._previous.items():
+            # Leave a handler installed on top of ours alone; it still chains
+            # through _handle, which is inert once inactive
+            if signal.getsignal(sig) == self._handle:
+                signal.signal(sig, previous)
+        self.active = False
+
+    def _handle(self, signum: int, frame) -> None:
+        # Signal handler context: hand the callback over to the loop
+        if self.active and not self._loop.is_closed():
+            self._loop.call_soon_threadsafe(self._callback)
+        self._previous[signum](signum, frame)
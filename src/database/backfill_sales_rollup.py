@@ -0,0 +1,44 @@
+# src/database/backfill_sales_rollup.py
+"""
+Rebuild sales_daily_rollup from order_product.
+
+Usage:
+    uv run python -m src.database.backfill_sales_rollup [--tenant-id 3]
+
+The rollup is kept up to date by triggers; run this after loading data with
+the triggers disabled, or to repair drift. Without --tenant-id every tenant
+is rebuilt.
+"""
+
+import argparse
+import asyncio
+import time
+
+import asyncpg
+
+from src.services.sales import rebuild_sales_rollup
+
+
+async def main(args: argparse.Namespace) -> None:
+    if args.dsn is None:
+        from src.core.config import settings
+
+        args.dsn = settings.DATABASE_URL
+
+    conn = await asyncpg.connect(args.dsn)
+    try:
+        start = time.perf_counter()
+        rows = await rebuild_sales_rollup(conn, args.tenant_id)
+        print(
+            f"Rebuilt {rows} rollup rows "
+            f"(tenant {args.tenant_id or 'all'}) in {time.perf_counter() - start:.2f}s"
+        )
+    finally:
+        await conn.close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--dsn", default=None, help="defaults to settings.DATABASE_URL")
+    parser.add_argument("--tenant-id", type=int, default=None)
+    asyncio.run(main(parser.parse_args()))
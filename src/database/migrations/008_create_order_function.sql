@@ -0,0 +1,120 @@
+-- ============================================
+-- Migration: 008_create_order_function.sql
+-- Description: Server-side order write pipeline (order, items, total and
+--              ledger entries in a single round trip)
+-- ============================================
+
+CREATE OR REPLACE FUNCTION create_order(
+    p_tenant_id BIGINT,
+    p_customer_id INTEGER,
+    p_payment_method TEXT,
+    p_notes TEXT,
+    p_items JSONB  -- [{"product_id": 1, "quantity": 2}, ...]
+)
+RETURNS TABLE (
+    order_id INTEGER,
+    total_price NUMERIC,
+    created_at TIMESTAMP WITH TIME ZONE,
+    items JSONB
+)
+LANGUAGE plpgsql
+AS $$
+#variable_conflict use_column
+DECLARE
+    v_order_id INTEGER;
+    v_order_date TIMESTAMP WITH TIME ZONE;
+    v_created_at TIMESTAMP WITH TIME ZONE;
+    v_items JSONB;
+    v_found INTEGER;
+    v_total NUMERIC;
+    v_cost NUMERIC;
+    v_sale_entry_id INTEGER;
+    v_cogs_entry_id INTEGER;
+    v_cash_or_bank_id INTEGER;
+    v_sales_id INTEGER;
+    v_cogs_id INTEGER;
+    v_inventory_id INTEGER;
+BEGIN
+    -- 1. Customer must belong to the tenant (NULL = anonymous sale)
+    IF p_customer_id IS NOT NULL AND NOT EXISTS (
+        SELECT 1 FROM customer WHERE id = p_customer_id AND tenant_id = p_tenant_id
+    ) THEN
+        RAISE EXCEPTION 'Customer not found: %', p_customer_id
+            USING ERRCODE = 'no_data_found', DETAIL = 'Customer', HINT = p_customer_id::TEXT;
+    END IF;
+
+    -- 2. Price the items (snapshot name, price and cost)
+    SELECT
+        jsonb_agg(
+            jsonb_build_object(
+                'product_id', p.id,
+                'product_name', p.name,
+                'quantity', i.quantity,
+                'unit_price', p.sale_price,
+                'unit_cost', COALESCE(p.historical_cost, 0),
+                'subtotal', p.sale_price * i.quantity
+            )
+            ORDER BY i.ord
+        ),
+        COUNT(p.id),
+        SUM(p.sale_price * i.quantity),
+        SUM(COALESCE(p.historical_cost, 0) * i.quantity)
+    INTO v_items, v_found, v_total, v_cost
+    FROM jsonb_to_recordset(p_items) WITH ORDINALITY AS i(product_id INTEGER, quantity INTEGER, ord BIGINT)
+    LEFT JOIN product AS p ON p.id = i.product_id AND p.tenant_id = p_tenant_id;
+
+    IF v_found IS DISTINCT FROM jsonb_array_length(p_items) THEN
+        RAISE EXCEPTION 'Product not found in order items'
+            USING ERRCODE = 'no_data_found', DETAIL = 'Product', HINT = (
+                SELECT string_agg(i.product_id::TEXT, ',')
+                FROM jsonb_to_recordset(p_items) AS i(product_id INTEGER)
+                WHERE NOT EXISTS (
+                    SELECT 1 FROM product
+                    WHERE id = i.product_id AND tenant_id = p_tenant_id
+                )
+            );
+    END IF;
+
+    -- 3. Insert order with its final total
+    INSERT INTO "order" (customer_id, payment_method, notes, total_price, tenant_id)
+    VALUES (p_customer_id, p_payment_method::payment_method, p_notes, v_total, p_tenant_id)
+    RETURNING id, "order".order_date, "order".created_at
+    INTO v_order_id, v_order_date, v_created_at;
+
+    -- 4. Insert order items
+    INSERT INTO order_product (order_id, product_name, product_id, quantity, unit_price, iva_rate, tenant_id)
+    SELECT v_order_id, i.product_name, i.product_id, i.quantity, i.unit_price, 21.00, p_tenant_id
+    FROM jsonb_to_recordset(v_items) AS i(product_id INTEGER, product_name TEXT, quantity INTEGER, unit_price NUMERIC);
+
+    -- 5. Ledger accounts
+    SELECT
+        MAX(id) FILTER (WHERE code = CASE WHEN p_payment_method = 'cash' THEN '1.1' ELSE '1.2' END),
+        MAX(id) FILTER (WHERE code = '4.1'),  -- Ventas
+        MAX(id) FILTER (WHERE code = '5.1'),  -- CMV
+        MAX(id) FILTER (WHERE code = '1.4')   -- Inventario
+    INTO v_cash_or_bank_id, v_sales_id, v_cogs_id, v_inventory_id
+    FROM ledger_account
+    WHERE tenant_id = p_tenant_id AND code IN ('1.1', '1.2', '4.1', '5.1', '1.4');
+
+    -- 6. Ledger entries: sale + cost of goods sold
+    INSERT INTO ledger_entry (tenant_id, entry_date, order_id)
+    VALUES (p_tenant_id, v_order_date, v_order_id)
+    RETURNING id INTO v_sale_entry_id;
+
+    INSERT INTO ledger_entry (tenant_id, entry_date, order_id)
+    VALUES (p_tenant_id, v_order_date, v_order_id)
+    RETURNING id INTO v_cogs_entry_id;
+
+    INSERT INTO ledger_line (tenant_id, entry_id, account_id, debit, credit)
+    VALUES
+        (p_tenant_id, v_sale_entry_id, v_cash_or_bank_id, v_total, 0),  -- Caja/Banco DEBE
+        (p_tenant_id, v_sale_entry_id, v_sales_id, 0, v_total),         -- Ventas HABER
+        (p_tenant_id, v_cogs_entry_id, v_cogs_id, v_cost, 0),           -- CMV DEBE
+        (p_tenant_id, v_cogs_entry_id, v_inventory_id, 0, v_cost);      -- Inventario HABER
+
+    RETURN QUERY SELECT v_order_id, v_total, v_created_at, v_items;
+END;
+$$;
+
+COMMENT ON FUNCTION create_order(BIGINT, INTEGER, TEXT, TEXT, JSONB) IS
+    'Creates an order with items, total and ledger entries in one call. Raises no_data_found (DETAIL = resource) for unknown customer/products';
@@ -0,0 +1,179 @@
+-- ============================================
+-- Migration: 009_ledger_account_notify.sql
+-- Description: Ledger tables, NOTIFY on chart-of-accounts changes and take
+--              ledger account ids as create_order arguments (resolved in-process)
+-- ============================================
+
+-- Databases created before the numbered migrations already have the ledger
+-- tables and these product columns; create_order (008, 011, 018), the sales
+-- rollup (012) and the trigger below need them
+ALTER TABLE product
+    ADD COLUMN IF NOT EXISTS replacement_cost NUMERIC(8,2),
+    ADD COLUMN IF NOT EXISTS historical_cost NUMERIC(8,2),
+    ADD COLUMN IF NOT EXISTS supplier VARCHAR(50),
+    ADD COLUMN IF NOT EXISTS concept INTEGER NOT NULL DEFAULT 1 CHECK (concept IN (1, 2, 3));
+
+CREATE TABLE IF NOT EXISTS ledger_account (
+    id SERIAL PRIMARY KEY,
+    code VARCHAR(20) NOT NULL,
+    name VARCHAR(100) NOT NULL,
+    created_at TIMESTAMP WITH TIME ZONE DEFAULT CURRENT_TIMESTAMP NOT NULL,
+    tenant_id BIGINT NOT NULL REFERENCES tenant(id) ON DELETE RESTRICT,
+    UNIQUE (tenant_id, code)
+);
+
+CREATE TABLE IF NOT EXISTS ledger_entry (
+    id SERIAL PRIMARY KEY,
+    entry_date TIMESTAMP WITH TIME ZONE NOT NULL,
+    order_id INTEGER REFERENCES "order"(id) ON DELETE RESTRICT,
+    created_at TIMESTAMP WITH TIME ZONE DEFAULT CURRENT_TIMESTAMP NOT NULL,
+    tenant_id BIGINT NOT NULL REFERENCES tenant(id) ON DELETE RESTRICT
+);
+
+CREATE TABLE IF NOT EXISTS ledger_line (
+    id SERIAL PRIMARY KEY,
+    entry_id INTEGER NOT NULL REFERENCES ledger_entry(id) ON DELETE CASCADE,
+    account_id INTEGER NOT NULL REFERENCES ledger_account(id) ON DELETE RESTRICT,
+    debit NUMERIC(12,2) NOT NULL DEFAULT 0 CHECK (debit >= 0),
+    credit NUMERIC(12,2) NOT NULL DEFAULT 0 CHECK (credit >= 0),
+    tenant_id BIGINT NOT NULL REFERENCES tenant(id) ON DELETE RESTRICT
+);
+
+CREATE INDEX IF NOT EXISTS idx_ledger_entry_order ON ledger_entry(order_id);
+CREATE INDEX IF NOT EXISTS idx_ledger_entry_tenant_date ON ledger_entry(tenant_id, entry_date);
+CREATE INDEX IF NOT EXISTS idx_ledger_line_entry ON ledger_line(entry_id);
+
+COMMENT ON TABLE ledger_account IS 'Chart of accounts, per tenant (code e.g. 1.1 Caja, 4.1 Ventas)';
+COMMENT ON TABLE ledger_entry IS 'Journal entries; sale and COGS entries reference their order';
+COMMENT ON TABLE ledger_line IS 'Debit/credit lines of a journal entry';
+
+-- Notify the tenant id whenever its chart of accounts changes
+CREATE OR REPLACE FUNCTION notify_ledger_account_changed()
+RETURNS TRIGGER
+LANGUAGE plpgsql
+AS $$
+BEGIN
+    IF TG_OP = 'DELETE' THEN
+        PERFORM pg_notify('ledger_account_changed', OLD.tenant_id::TEXT);
+    ELSE
+        PERFORM pg_notify('ledger_account_changed', NEW.tenant_id::TEXT);
+        IF TG_OP = 'UPDATE' AND OLD.tenant_id <> NEW.tenant_id THEN
+            PERFORM pg_notify('ledger_account_changed', OLD.tenant_id::TEXT);
+        END IF;
+    END IF;
+    RETURN NULL;
+END;
+$$;
+
+DROP TRIGGER IF EXISTS trg_ledger_account_notify ON ledger_account;
+CREATE TRIGGER trg_ledger_account_notify
+    AFTER INSERT OR UPDATE OR DELETE ON ledger_account
+    FOR EACH ROW EXECUTE FUNCTION notify_ledger_account_changed();
+
+-- Replace create_order: account lookups move to the application cache
+DROP FUNCTION IF EXISTS create_order(BIGINT, INTEGER, TEXT, TEXT, JSONB);
+
+CREATE OR REPLACE FUNCTION create_order(
+    p_tenant_id BIGINT,
+    p_customer_id INTEGER,
+    p_payment_method TEXT,
+    p_notes TEXT,
+    p_items JSONB,  -- [{"product_id": 1, "quantity": 2}, ...]
+    p_cash_or_bank_account_id INTEGER,
+    p_sales_account_id INTEGER,
+    p_cogs_account_id INTEGER,
+    p_inventory_account_id INTEGER
+)
+RETURNS TABLE (
+    order_id INTEGER,
+    total_price NUMERIC,
+    created_at TIMESTAMP WITH TIME ZONE,
+    items JSONB
+)
+LANGUAGE plpgsql
+AS $$
+#variable_conflict use_column
+DECLARE
+    v_order_id INTEGER;
+    v_order_date TIMESTAMP WITH TIME ZONE;
+    v_created_at TIMESTAMP WITH TIME ZONE;
+    v_items JSONB;
+    v_found INTEGER;
+    v_total NUMERIC;
+    v_cost NUMERIC;
+    v_sale_entry_id INTEGER;
+    v_cogs_entry_id INTEGER;
+BEGIN
+    -- 1. Customer must belong to the tenant (NULL = anonymous sale)
+    IF p_customer_id IS NOT NULL AND NOT EXISTS (
+        SELECT 1 FROM customer WHERE id = p_customer_id AND tenant_id = p_tenant_id
+    ) THEN
+        RAISE EXCEPTION 'Customer not found: %', p_customer_id
+            USING ERRCODE = 'no_data_found', DETAIL = 'Customer', HINT = p_customer_id::TEXT;
+    END IF;
+
+    -- 2. Price the items (snapshot name, price and cost)
+    SELECT
+        jsonb_agg(
+            jsonb_build_object(
+                'product_id', p.id,
+                'product_name', p.name,
+                'quantity', i.quantity,
+                'unit_price', p.sale_price,
+                'unit_cost', COALESCE(p.historical_cost, 0),
+                'subtotal', p.sale_price * i.quantity
+            )
+            ORDER BY i.ord
+        ),
+        COUNT(p.id),
+        SUM(p.sale_price * i.quantity),
+        SUM(COALESCE(p.historical_cost, 0) * i.quantity)
+    INTO v_items, v_found, v_total, v_cost
+    FROM jsonb_to_recordset(p_items) WITH ORDINALITY AS i(product_id INTEGER, quantity INTEGER, ord BIGINT)
+    LEFT JOIN product AS p ON p.id = i.product_id AND p.tenant_id = p_tenant_id;
+
+    IF v_found IS DISTINCT FROM jsonb_array_length(p_items) THEN
+        RAISE EXCEPTION 'Product not found in order items'
+            USING ERRCODE = 'no_data_found', DETAIL = 'Product', HINT = (
+                SELECT string_agg(i.product_id::TEXT, ',')
+                FROM jsonb_to_recordset(p_items) AS i(product_id INTEGER)
+                WHERE NOT EXISTS (
+                    SELECT 1 FROM product
+                    WHERE id = i.product_id AND tenant_id = p_tenant_id
+                )
+            );
+    END IF;
+
+    -- 3. Insert order with its final total
+    INSERT INTO "order" (customer_id, payment_method, notes, total_price, tenant_id)
+    VALUES (p_customer_id, p_payment_method::payment_method, p_notes, v_total, p_tenant_id)
+    RETURNING id, "order".order_date, "order".created_at
+    INTO v_order_id, v_order_date, v_created_at;
+
+    -- 4. Insert order items
+    INSERT INTO order_product (order_id, product_name, product_id, quantity, unit_price, iva_rate, tenant_id)
+    SELECT v_order_id, i.product_name, i.product_id, i.quantity, i.unit_price, 21.00, p_tenant_id
+    FROM jsonb_to_recordset(v_items) AS i(product_id INTEGER, product_name TEXT, quantity INTEGER, unit_price NUMERIC);
+
+    -- 5. Ledger entries (account ids resolved by the application): sale + cost of goods sold
+    INSERT INTO ledger_entry (tenant_id, entry_date, order_id)
+    VALUES (p_tenant_id, v_order_date, v_order_id)
+    RETURNING id INTO v_sale_entry_id;
+
+    INSERT INTO ledger_entry (tenant_id, entry_date, order_id)
+    VALUES (p_tenant_id, v_order_date, v_order_id)
+    RETURNING id INTO v_cogs_entry_id;
+
+    INSERT INTO ledger_line (tenant_id, entry_id, account_id, debit, credit)
+    VALUES
+        (p_tenant_id, v_sale_entry_id, p_cash_or_bank_account_id, v_total, 0),  -- Caja/Banco DEBE
+        (p_tenant_id, v_sale_entry_id, p_sales_account_id, 0, v_total),         -- Ventas HABER
+        (p_tenant_id, v_cogs_entry_id, p_cogs_account_id, v_cost, 0),           -- CMV DEBE
+        (p_tenant_id, v_cogs_entry_id, p_inventory_account_id, 0, v_cost);      -- Inventario HABER
+
+    RETURN QUERY SELECT v_order_id, v_total, v_created_at, v_items;
+END;
+$$;
+
+COMMENT ON FUNCTION create_order(BIGINT, INTEGER, TEXT, TEXT, JSONB, INTEGER, INTEGER, INTEGER, INTEGER) IS
+    'Creates an order with items, total and ledger entries in one call. Raises no_data_found (DETAIL = resource) for unknown customer/products';
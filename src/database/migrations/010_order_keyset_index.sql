@@ -0,0 +1,12 @@
+-- ============================================
+-- Migration: 010_order_keyset_index.sql
+-- Description: Index backing keyset pagination of orders on (order_date, id)
+-- ============================================
+
+-- Serves "WHERE tenant_id = $1 [AND (order_date, id) < (...)]
+-- ORDER BY order_date DESC, id DESC LIMIT n" as an index range scan, so a
+-- page costs the same whatever the tenant's order count
+CREATE INDEX IF NOT EXISTS idx_order_tenant_date_id ON "order"(tenant_id, order_date DESC, id DESC);
+
+-- Superseded by idx_order_tenant_date_id
+DROP INDEX IF EXISTS idx_order_date;
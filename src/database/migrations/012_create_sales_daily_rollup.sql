@@ -0,0 +1,200 @@
+-- ============================================
+-- Migration: 012_create_sales_daily_rollup.sql
+-- Description: Incrementally maintained (tenant, day, product) sales rollup
+-- ============================================
+
+-- Cost snapshot per line item (the sales report and the rollup read it)
+ALTER TABLE order_product ADD COLUMN IF NOT EXISTS unit_cost NUMERIC(8,2);
+
+UPDATE order_product AS op
+SET unit_cost = COALESCE(p.historical_cost, 0)
+FROM product AS p
+WHERE p.id = op.product_id AND op.unit_cost IS NULL;
+
+CREATE OR REPLACE FUNCTION order_product_snapshot_cost()
+RETURNS TRIGGER
+LANGUAGE plpgsql
+AS $$
+BEGIN
+    IF NEW.unit_cost IS NULL THEN
+        SELECT COALESCE(historical_cost, 0) INTO NEW.unit_cost
+        FROM product WHERE id = NEW.product_id;
+    END IF;
+    RETURN NEW;
+END;
+$$;
+
+DROP TRIGGER IF EXISTS trg_order_product_snapshot_cost ON order_product;
+CREATE TRIGGER trg_order_product_snapshot_cost
+    BEFORE INSERT ON order_product
+    FOR EACH ROW EXECUTE FUNCTION order_product_snapshot_cost();
+
+-- Business day of a timestamp (orders are bucketed in local time)
+CREATE OR REPLACE FUNCTION sales_day(p_ts TIMESTAMP WITH TIME ZONE)
+RETURNS DATE
+LANGUAGE sql
+IMMUTABLE PARALLEL SAFE
+AS $$
+    SELECT (p_ts AT TIME ZONE 'America/Argentina/Buenos_Aires')::DATE;
+$$;
+
+-- One row per tenant, day and product; cancelled orders are excluded
+CREATE TABLE sales_daily_rollup (
+    tenant_id BIGINT NOT NULL REFERENCES tenant(id) ON DELETE RESTRICT,
+    day DATE NOT NULL,
+    product_id INTEGER NOT NULL REFERENCES product(id) ON DELETE RESTRICT,
+
+    -- Totals
+    quantity NUMERIC NOT NULL DEFAULT 0,
+    revenue NUMERIC NOT NULL DEFAULT 0,
+    cost NUMERIC NOT NULL DEFAULT 0,
+    profit NUMERIC GENERATED ALWAYS AS (revenue - cost) STORED,
+    line_count INTEGER NOT NULL DEFAULT 0,
+
+    -- Timestamps
+    updated_at TIMESTAMP WITH TIME ZONE DEFAULT CURRENT_TIMESTAMP NOT NULL,
+
+    PRIMARY KEY (tenant_id, day, product_id)
+);
+
+CREATE INDEX idx_sales_daily_rollup_product ON sales_daily_rollup(tenant_id, product_id, day);
+
+COMMENT ON TABLE sales_daily_rollup IS 'Sales per tenant/day/product, maintained by triggers on order_product and order. Rebuild with rebuild_sales_daily_rollup()';
+COMMENT ON COLUMN sales_daily_rollup.day IS 'sales_day(order.order_date)';
+
+-- Add (p_sign = 1) or remove (p_sign = -1) line items of non-cancelled orders
+CREATE OR REPLACE FUNCTION sales_rollup_apply_lines(p_lines order_product[], p_sign INTEGER)
+RETURNS VOID
+LANGUAGE sql
+AS $$
+    INSERT INTO sales_daily_rollup AS r (tenant_id, day, product_id, quantity, revenue, cost, line_count)
+    SELECT
+        l.tenant_id,
+        sales_day(o.order_date),
+        l.product_id,
+        p_sign * SUM(l.quantity),
+        p_sign * SUM(l.quantity * l.unit_price),
+        p_sign * SUM(l.quantity * COALESCE(l.unit_cost, 0)),
+        p_sign * COUNT(*)
+    FROM unnest(p_lines) AS l
+    JOIN "order" AS o ON o.id = l.order_id AND o.status <> 'cancelled'
+    GROUP BY l.tenant_id, sales_day(o.order_date), l.product_id
+    ON CONFLICT (tenant_id, day, product_id) DO UPDATE SET
+        quantity = r.quantity + EXCLUDED.quantity,
+        revenue = r.revenue + EXCLUDED.revenue,
+        cost = r.cost + EXCLUDED.cost,
+        line_count = r.line_count + EXCLUDED.line_count,
+        updated_at = NOW();
+$$;
+
+-- Statement-level, so a bulk insert upserts each rollup row once
+CREATE OR REPLACE FUNCTION sales_rollup_order_product()
+RETURNS TRIGGER
+LANGUAGE plpgsql
+AS $$
+BEGIN
+    IF TG_OP IN ('UPDATE', 'DELETE') THEN
+        PERFORM sales_rollup_apply_lines(ARRAY(SELECT o FROM old_lines AS o), -1);
+    END IF;
+    IF TG_OP IN ('INSERT', 'UPDATE') THEN
+        PERFORM sales_rollup_apply_lines(ARRAY(SELECT n FROM new_lines AS n), 1);
+    END IF;
+    RETURN NULL;
+END;
+$$;
+
+CREATE TRIGGER trg_sales_rollup_insert
+    AFTER INSERT ON order_product
+    REFERENCING NEW TABLE AS new_lines
+    FOR EACH STATEMENT EXECUTE FUNCTION sales_rollup_order_product();
+
+CREATE TRIGGER trg_sales_rollup_update
+    AFTER UPDATE ON order_product
+    REFERENCING OLD TABLE AS old_lines NEW TABLE AS new_lines
+    FOR EACH STATEMENT EXECUTE FUNCTION sales_rollup_order_product();
+
+CREATE TRIGGER trg_sales_rollup_delete
+    AFTER DELETE ON order_product
+    REFERENCING OLD TABLE AS old_lines
+    FOR EACH STATEMENT EXECUTE FUNCTION sales_rollup_order_product();
+
+-- Order cancelled / un-cancelled or moved to another day
+CREATE OR REPLACE FUNCTION sales_rollup_order()
+RETURNS TRIGGER
+LANGUAGE plpgsql
+AS $$
+BEGIN
+    INSERT INTO sales_daily_rollup AS r (tenant_id, day, product_id, quantity, revenue, cost, line_count)
+    SELECT
+        l.tenant_id,
+        d.day,
+        l.product_id,
+        SUM(d.sign * l.quantity),
+        SUM(d.sign * l.quantity * l.unit_price),
+        SUM(d.sign * l.quantity * COALESCE(l.unit_cost, 0)),
+        SUM(d.sign)
+    FROM order_product AS l
+    CROSS JOIN (
+        VALUES
+            (-1, sales_day(OLD.order_date), OLD.status <> 'cancelled'),
+            (1, sales_day(NEW.order_date), NEW.status <> 'cancelled')
+    ) AS d(sign, day, counted)
+    WHERE l.order_id = NEW.id AND d.counted
+    GROUP BY l.tenant_id, d.day, l.product_id
+    ON CONFLICT (tenant_id, day, product_id) DO UPDATE SET
+        quantity = r.quantity + EXCLUDED.quantity,
+        revenue = r.revenue + EXCLUDED.revenue,
+        cost = r.cost + EXCLUDED.cost,
+        line_count = r.line_count + EXCLUDED.line_count,
+        updated_at = NOW();
+    RETURN NULL;
+END;
+$$;
+
+CREATE TRIGGER trg_sales_rollup_order
+    AFTER UPDATE OF status, order_date ON "order"
+    FOR EACH ROW
+    WHEN (
+        (OLD.status = 'cancelled') IS DISTINCT FROM (NEW.status = 'cancelled')
+        OR sales_day(OLD.order_date) IS DISTINCT FROM sales_day(NEW.order_date)
+    )
+    EXECUTE FUNCTION sales_rollup_order();
+
+-- Backfill: recompute one tenant (or all with NULL) from order_product.
+-- Blocks concurrent rollup writers until the calling transaction ends.
+CREATE OR REPLACE FUNCTION rebuild_sales_daily_rollup(p_tenant_id BIGINT DEFAULT NULL)
+RETURNS BIGINT
+LANGUAGE plpgsql
+AS $$
+DECLARE
+    v_rows BIGINT;
+BEGIN
+    LOCK TABLE sales_daily_rollup IN SHARE ROW EXCLUSIVE MODE;
+
+    DELETE FROM sales_daily_rollup
+    WHERE p_tenant_id IS NULL OR tenant_id = p_tenant_id;
+
+    INSERT INTO sales_daily_rollup (tenant_id, day, product_id, quantity, revenue, cost, line_count)
+    SELECT
+        l.tenant_id,
+        sales_day(o.order_date),
+        l.product_id,
+        SUM(l.quantity),
+        SUM(l.quantity * l.unit_price),
+        SUM(l.quantity * COALESCE(l.unit_cost, 0)),
+        COUNT(*)
+    FROM order_product AS l
+    JOIN "order" AS o ON o.id = l.order_id AND o.status <> 'cancelled'
+    WHERE p_tenant_id IS NULL OR l.tenant_id = p_tenant_id
+    GROUP BY l.tenant_id, sales_day(o.order_date), l.product_id;
+
+    GET DIAGNOSTICS v_rows = ROW_COUNT;
+    RETURN v_rows;
+END;
+$$;
+
+COMMENT ON FUNCTION rebuild_sales_daily_rollup(BIGINT) IS
+    'Recomputes sales_daily_rollup for a tenant (NULL = all tenants); returns the number of rollup rows';
+
+-- Initial backfill
+SELECT rebuild_sales_daily_rollup(NULL);
@@ -0,0 +1,73 @@
+-- ============================================
+-- Migration: 013_product_search.sql
+-- Description: Trigram and prefix indexes for product search, and NOTIFY on
+--              catalog changes (drops in-process search caches)
+-- ============================================
+
+CREATE EXTENSION IF NOT EXISTS pg_trgm;
+
+-- Substring (ILIKE '%q%') and fuzzy (q <% name) matches, ranked by
+-- word_similarity
+CREATE INDEX IF NOT EXISTS idx_product_name_trgm ON product USING gin (name gin_trgm_ops);
+CREATE INDEX IF NOT EXISTS idx_product_sku_trgm ON product USING gin (sku gin_trgm_ops);
+
+-- Prefix matches on short queries: in the "C" collation LIKE 'q%' is an index
+-- range scan and ORDER BY lower(name) COLLATE "C" reads the index in order,
+-- so the first page stops after LIMIT rows
+CREATE INDEX IF NOT EXISTS idx_product_name_prefix ON product(tenant_id, (lower(name) COLLATE "C"));
+CREATE INDEX IF NOT EXISTS idx_product_sku_prefix ON product(tenant_id, (lower(sku) COLLATE "C"));
+
+-- Notify the tenant ids whose catalog changed. Stock movements are left out:
+-- every order updates current_stock and caches tolerate a stale stock figure
+CREATE OR REPLACE FUNCTION notify_product_changed()
+RETURNS TRIGGER
+LANGUAGE plpgsql
+AS $$
+DECLARE
+    v_tenant_id BIGINT;
+BEGIN
+    IF TG_OP = 'INSERT' THEN
+        FOR v_tenant_id IN SELECT DISTINCT tenant_id FROM new_products LOOP
+            PERFORM pg_notify('product_changed', v_tenant_id::TEXT);
+        END LOOP;
+    ELSIF TG_OP = 'DELETE' THEN
+        FOR v_tenant_id IN SELECT DISTINCT tenant_id FROM old_products LOOP
+            PERFORM pg_notify('product_changed', v_tenant_id::TEXT);
+        END LOOP;
+    ELSE
+        FOR v_tenant_id IN
+            SELECT n.tenant_id
+            FROM new_products AS n
+            JOIN old_products AS o USING (id)
+            WHERE to_jsonb(n) - 'current_stock' IS DISTINCT FROM to_jsonb(o) - 'current_stock'
+            UNION
+            SELECT o.tenant_id
+            FROM new_products AS n
+            JOIN old_products AS o USING (id)
+            WHERE n.tenant_id <> o.tenant_id
+        LOOP
+            PERFORM pg_notify('product_changed', v_tenant_id::TEXT);
+        END LOOP;
+    END IF;
+    RETURN NULL;
+END;
+$$;
+
+-- Statement level: a bulk import sends one notification per tenant
+DROP TRIGGER IF EXISTS trg_product_notify_insert ON product;
+CREATE TRIGGER trg_product_notify_insert
+    AFTER INSERT ON product
+    REFERENCING NEW TABLE AS new_products
+    FOR EACH STATEMENT EXECUTE FUNCTION notify_product_changed();
+
+DROP TRIGGER IF EXISTS trg_product_notify_update ON product;
+CREATE TRIGGER trg_product_notify_update
+    AFTER UPDATE ON product
+    REFERENCING OLD TABLE AS old_products NEW TABLE AS new_products
+    FOR EACH STATEMENT EXECUTE FUNCTION notify_product_changed();
+
+DROP TRIGGER IF EXISTS trg_product_notify_delete ON product;
+CREATE TRIGGER trg_product_notify_delete
+    AFTER DELETE ON product
+    REFERENCING OLD TABLE AS old_products
+    FOR EACH STATEMENT EXECUTE FUNCTION notify_product_changed();
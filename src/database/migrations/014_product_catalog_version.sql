@@ -0,0 +1,80 @@
+-- ============================================
+-- Migration: 014_product_catalog_version.sql
+-- Description: Per-tenant catalog version (product listing ETags) and
+--              keyset indexes for the product listing
+-- ============================================
+
+CREATE TABLE IF NOT EXISTS product_catalog_version (
+    tenant_id BIGINT PRIMARY KEY REFERENCES tenant(id) ON DELETE CASCADE,
+    version BIGINT NOT NULL DEFAULT 1,
+    updated_at TIMESTAMP WITH TIME ZONE NOT NULL DEFAULT CURRENT_TIMESTAMP
+);
+
+INSERT INTO product_catalog_version (tenant_id)
+SELECT id FROM tenant
+ON CONFLICT (tenant_id) DO NOTHING;
+
+-- Bumped once per statement and tenant, stock changes included: the listing
+-- returns current_stock, so a 304 must never hide a stock movement
+CREATE OR REPLACE FUNCTION bump_product_catalog_version()
+RETURNS TRIGGER
+LANGUAGE plpgsql
+AS $$
+BEGIN
+    IF TG_OP = 'INSERT' THEN
+        INSERT INTO product_catalog_version AS v (tenant_id)
+        SELECT DISTINCT tenant_id FROM new_products ORDER BY tenant_id
+        ON CONFLICT (tenant_id) DO UPDATE
+            SET version = v.version + 1, updated_at = CURRENT_TIMESTAMP;
+    ELSIF TG_OP = 'DELETE' THEN
+        INSERT INTO product_catalog_version AS v (tenant_id)
+        SELECT DISTINCT tenant_id FROM old_products ORDER BY tenant_id
+        ON CONFLICT (tenant_id) DO UPDATE
+            SET version = v.version + 1, updated_at = CURRENT_TIMESTAMP;
+    ELSE
+        INSERT INTO product_catalog_version AS v (tenant_id)
+        SELECT tenant_id FROM (
+            SELECT n.tenant_id
+            FROM new_products AS n
+            JOIN old_products AS o USING (id)
+            WHERE n IS DISTINCT FROM o
+            UNION
+            SELECT o.tenant_id
+            FROM new_products AS n
+            JOIN old_products AS o USING (id)
+            WHERE n.tenant_id <> o.tenant_id
+        ) AS changed
+        ORDER BY tenant_id
+        ON CONFLICT (tenant_id) DO UPDATE
+            SET version = v.version + 1, updated_at = CURRENT_TIMESTAMP;
+    END IF;
+    RETURN NULL;
+END;
+$$;
+
+DROP TRIGGER IF EXISTS trg_product_catalog_version_insert ON product;
+CREATE TRIGGER trg_product_catalog_version_insert
+    AFTER INSERT ON product
+    REFERENCING NEW TABLE AS new_products
+    FOR EACH STATEMENT EXECUTE FUNCTION bump_product_catalog_version();
+
+DROP TRIGGER IF EXISTS trg_product_catalog_version_update ON product;
+CREATE TRIGGER trg_product_catalog_version_update
+    AFTER UPDATE ON product
+    REFERENCING OLD TABLE AS old_products NEW TABLE AS new_products
+    FOR EACH STATEMENT EXECUTE FUNCTION bump_product_catalog_version();
+
+DROP TRIGGER IF EXISTS trg_product_catalog_version_delete ON product;
+CREATE TRIGGER trg_product_catalog_version_delete
+    AFTER DELETE ON product
+    REFERENCING OLD TABLE AS old_products
+    FOR EACH STATEMENT EXECUTE FUNCTION bump_product_catalog_version();
+
+-- Serve "WHERE tenant_id = $1 [AND is_active = $2] AND id > $n ORDER BY id
+-- LIMIT n" as index range scans
+CREATE INDEX IF NOT EXISTS idx_product_tenant_id ON product(tenant_id, id);
+CREATE INDEX IF NOT EXISTS idx_product_tenant_active_id ON product(tenant_id, is_active, id);
+
+-- Superseded by the two above
+DROP INDEX IF EXISTS idx_product_tenant;
+DROP INDEX IF EXISTS idx_product_active;
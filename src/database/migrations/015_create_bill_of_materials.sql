@@ -0,0 +1,121 @@
+-- ============================================
+-- Migration: 015_create_bill_of_materials.sql
+-- Description: Components and bill of materials for manufactured products,
+--              with NOTIFY when a tenant's BOM graph or component stock changes
+-- ============================================
+
+-- Databases created before the numbered migrations already have component
+CREATE TABLE IF NOT EXISTS component (
+    id SERIAL PRIMARY KEY,
+    name VARCHAR(100) NOT NULL,
+    description TEXT,
+    category VARCHAR(50),
+    unit_measure VARCHAR(20) NOT NULL,
+    current_stock NUMERIC(10,3) NOT NULL DEFAULT 0,
+    min_stock NUMERIC(10,3) NOT NULL DEFAULT 0,
+    last_cost_price NUMERIC(10,2),
+    is_active BOOLEAN NOT NULL DEFAULT true,
+    created_at TIMESTAMP WITH TIME ZONE DEFAULT CURRENT_TIMESTAMP,
+    updated_at TIMESTAMP WITH TIME ZONE
+);
+
+-- Quantity of each component used to build one unit of a product
+CREATE TABLE IF NOT EXISTS bill_of_materials (
+    product_id INTEGER NOT NULL REFERENCES product(id) ON DELETE CASCADE,
+    component_id INTEGER NOT NULL REFERENCES component(id) ON DELETE RESTRICT,
+    quantity NUMERIC(10,3) NOT NULL CHECK (quantity > 0),
+    PRIMARY KEY (product_id, component_id)
+);
+
+CREATE INDEX IF NOT EXISTS idx_bom_component ON bill_of_materials(component_id);
+
+COMMENT ON TABLE bill_of_materials IS 'Bill of materials: components per unit of a manufactured product';
+
+-- Notify the tenants whose BOM graph changed (payload: tenant id)
+CREATE OR REPLACE FUNCTION notify_bom_changed()
+RETURNS TRIGGER
+LANGUAGE plpgsql
+AS $$
+DECLARE
+    v_product_ids INTEGER[];
+    v_tenant_id BIGINT;
+BEGIN
+    IF TG_OP = 'INSERT' THEN
+        SELECT array_agg(product_id) INTO v_product_ids FROM new_lines;
+    ELSIF TG_OP = 'DELETE' THEN
+        SELECT array_agg(product_id) INTO v_product_ids FROM old_lines;
+    ELSE
+        SELECT array_agg(product_id) INTO v_product_ids
+        FROM (SELECT product_id FROM new_lines UNION SELECT product_id FROM old_lines) AS changed;
+    END IF;
+
+    FOR v_tenant_id IN
+        SELECT DISTINCT tenant_id FROM product WHERE id = ANY(v_product_ids)
+    LOOP
+        PERFORM pg_notify('production_changed', v_tenant_id::TEXT);
+    END LOOP;
+    RETURN NULL;
+END;
+$$;
+
+-- Notify the tenants whose products use a changed component (stock included)
+CREATE OR REPLACE FUNCTION notify_component_changed()
+RETURNS TRIGGER
+LANGUAGE plpgsql
+AS $$
+DECLARE
+    v_component_ids INTEGER[];
+    v_tenant_id BIGINT;
+BEGIN
+    IF TG_OP = 'DELETE' THEN
+        SELECT array_agg(id) INTO v_component_ids FROM old_components;
+    ELSE
+        SELECT array_agg(n.id) INTO v_component_ids
+        FROM new_components AS n
+        JOIN old_components AS o USING (id)
+        WHERE n IS DISTINCT FROM o;
+    END IF;
+
+    FOR v_tenant_id IN
+        SELECT DISTINCT p.tenant_id
+        FROM bill_of_materials AS b
+        JOIN product AS p ON p.id = b.product_id
+        WHERE b.component_id = ANY(v_component_ids)
+    LOOP
+        PERFORM pg_notify('production_changed', v_tenant_id::TEXT);
+    END LOOP;
+    RETURN NULL;
+END;
+$$;
+
+-- Statement level: one notification per tenant however many rows changed.
+-- A new component is in no BOM yet, so component INSERT needs no trigger
+DROP TRIGGER IF EXISTS trg_bom_notify_insert ON bill_of_materials;
+CREATE TRIGGER trg_bom_notify_insert
+    AFTER INSERT ON bill_of_materials
+    REFERENCING NEW TABLE AS new_lines
+    FOR EACH STATEMENT EXECUTE FUNCTION notify_bom_changed();
+
+DROP TRIGGER IF EXISTS trg_bom_notify_update ON bill_of_materials;
+CREATE TRIGGER trg_bom_notify_update
+    AFTER UPDATE ON bill_of_materials
+    REFERENCING OLD TABLE AS old_lines NEW TABLE AS new_lines
+    FOR EACH STATEMENT EXECUTE FUNCTION notify_bom_changed();
+
+DROP TRIGGER IF EXISTS trg_bom_notify_delete ON bill_of_materials;
+CREATE TRIGGER trg_bom_notify_delete
+    AFTER DELETE ON bill_of_materials
+    REFERENCING OLD TABLE AS old_lines
+    FOR EACH STATEMENT EXECUTE FUNCTION notify_bom_changed();
+
+DROP TRIGGER IF EXISTS trg_component_notify_update ON component;
+CREATE TRIGGER trg_component_notify_update
+    AFTER UPDATE ON component
+    REFERENCING OLD TABLE AS old_components NEW TABLE AS new_components
+    FOR EACH STATEMENT EXECUTE FUNCTION notify_component_changed();
+
+DROP TRIGGER IF EXISTS trg_component_notify_delete ON component;
+CREATE TRIGGER trg_component_notify_delete
+    AFTER DELETE ON component
+    REFERENCING OLD TABLE AS old_components
+    FOR EACH STATEMENT EXECUTE FUNCTION notify_component_changed();
@@ -0,0 +1,131 @@
+-- ============================================
+-- Migration: 016_inventory_alert_engine.sql
+-- Description: Low-stock alerts for components, maintained incrementally from
+--              the components each statement touches, with NOTIFY per change
+-- ============================================
+
+-- Databases created before the numbered migrations already have inventory_alert
+CREATE TABLE IF NOT EXISTS inventory_alert (
+    id SERIAL PRIMARY KEY,
+    component_id INTEGER NOT NULL REFERENCES component(id) ON DELETE CASCADE,
+    is_active BOOLEAN NOT NULL DEFAULT true,
+    created_at TIMESTAMP WITH TIME ZONE DEFAULT CURRENT_TIMESTAMP
+);
+
+ALTER TABLE inventory_alert ADD COLUMN IF NOT EXISTS resolved_at TIMESTAMP WITH TIME ZONE;
+
+-- At most one open alert per component
+UPDATE inventory_alert AS ia
+SET is_active = false, resolved_at = CURRENT_TIMESTAMP
+WHERE ia.is_active AND EXISTS (
+    SELECT 1 FROM inventory_alert AS newer
+    WHERE newer.component_id = ia.component_id AND newer.is_active AND newer.id > ia.id
+);
+
+CREATE UNIQUE INDEX IF NOT EXISTS idx_inventory_alert_active
+    ON inventory_alert(component_id) WHERE is_active;
+
+-- Open or resolve the alerts of the given components only. Every change is
+-- notified on inventory_alert_changed as JSON (payload well under 8000 bytes)
+CREATE OR REPLACE FUNCTION sync_inventory_alerts(p_component_ids INTEGER[])
+RETURNS INTEGER
+LANGUAGE plpgsql
+AS $$
+DECLARE
+    v_changed INTEGER;
+BEGIN
+    WITH resolved AS (
+        UPDATE inventory_alert AS ia
+        SET is_active = false, resolved_at = CURRENT_TIMESTAMP
+        FROM component AS c
+        WHERE ia.component_id = c.id
+          AND ia.is_active
+          AND c.id = ANY(p_component_ids)
+          AND NOT (c.is_active AND c.current_stock < c.min_stock)
+        RETURNING ia.id AS alert_id, ia.component_id, false AS is_active
+    ),
+    opened AS (
+        INSERT INTO inventory_alert (component_id)
+        SELECT c.id
+        FROM component AS c
+        WHERE c.id = ANY(p_component_ids)
+          AND c.is_active
+          AND c.current_stock < c.min_stock
+          AND NOT EXISTS (
+              SELECT 1 FROM inventory_alert AS ia
+              WHERE ia.component_id = c.id AND ia.is_active
+          )
+        ON CONFLICT (component_id) WHERE is_active DO NOTHING
+        RETURNING id AS alert_id, component_id, true AS is_active
+    )
+    SELECT COUNT(pg_notify(
+        'inventory_alert_changed',
+        json_build_object(
+            'alert_id', changed.alert_id,
+            'component_id', c.id,
+            'component_name', c.name,
+            'current_stock', c.current_stock,
+            'min_stock', c.min_stock,
+            'is_active', changed.is_active
+        )::TEXT
+    ))
+    INTO v_changed
+    FROM (SELECT * FROM resolved UNION ALL SELECT * FROM opened) AS changed
+    JOIN component AS c ON c.id = changed.component_id;
+
+    RETURN v_changed;
+END;
+$$;
+
+CREATE OR REPLACE FUNCTION component_stock_changed()
+RETURNS TRIGGER
+LANGUAGE plpgsql
+AS $$
+DECLARE
+    v_component_ids INTEGER[];
+BEGIN
+    IF TG_OP = 'INSERT' THEN
+        SELECT array_agg(id) INTO v_component_ids FROM new_components;
+    ELSIF TG_OP = 'DELETE' THEN
+        -- Alerts went with the rows (ON DELETE CASCADE): just tell listeners
+        PERFORM pg_notify(
+            'inventory_alert_changed',
+            json_build_object('component_id', id, 'is_active', false)::TEXT
+        )
+        FROM old_components;
+        RETURN NULL;
+    ELSE
+        SELECT array_agg(n.id) INTO v_component_ids
+        FROM new_components AS n
+        JOIN old_components AS o USING (id)
+        WHERE (n.current_stock, n.min_stock, n.is_active)
+              IS DISTINCT FROM (o.current_stock, o.min_stock, o.is_active);
+    END IF;
+
+    IF v_component_ids IS NOT NULL THEN
+        PERFORM sync_inventory_alerts(v_component_ids);
+    END IF;
+    RETURN NULL;
+END;
+$$;
+
+DROP TRIGGER IF EXISTS trg_component_alerts_insert ON component;
+CREATE TRIGGER trg_component_alerts_insert
+    AFTER INSERT ON component
+    REFERENCING NEW TABLE AS new_components
+    FOR EACH STATEMENT EXECUTE FUNCTION component_stock_changed();
+
+DROP TRIGGER IF EXISTS trg_component_alerts_update ON component;
+CREATE TRIGGER trg_component_alerts_update
+    AFTER UPDATE ON component
+    REFERENCING OLD TABLE AS old_components NEW TABLE AS new_components
+    FOR EACH STATEMENT EXECUTE FUNCTION component_stock_changed();
+
+DROP TRIGGER IF EXISTS trg_component_alerts_delete ON component;
+CREATE TRIGGER trg_component_alerts_delete
+    AFTER DELETE ON component
+    REFERENCING OLD TABLE AS old_components
+    FOR EACH STATEMENT EXECUTE FUNCTION component_stock_changed();
+
+-- Bring existing alerts in line with current stock
+SELECT sync_inventory_alerts(array_agg(id)) FROM component;
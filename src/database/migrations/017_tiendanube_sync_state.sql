@@ -0,0 +1,15 @@
+-- ============================================
+-- Migration: 017_tiendanube_sync_state.sql
+-- Description: Per-tenant watermark for incremental TiendaNube product sync
+-- ============================================
+
+CREATE TABLE IF NOT EXISTS tiendanube_sync_state (
+    tenant_id BIGINT PRIMARY KEY REFERENCES tenant(id) ON DELETE CASCADE,
+    -- Start of the last successful sync: the next one asks for products
+    -- updated since then (updated_at_min)
+    last_synced_at TIMESTAMP WITH TIME ZONE NOT NULL,
+    last_full_sync_at TIMESTAMP WITH TIME ZONE,
+    updated_at TIMESTAMP WITH TIME ZONE NOT NULL DEFAULT CURRENT_TIMESTAMP
+);
+
+COMMENT ON TABLE tiendanube_sync_state IS 'Watermark of the last successful TiendaNube product sync, per tenant';
@@ -0,0 +1,81 @@
+-- ============================================
+-- Migration: 019_sales_change_log.sql
+-- Description: Insert-only per-tenant log of sales writes (export job
+--              watermarks)
+-- ============================================
+
+-- One row per statement and tenant that wrote "order" or order_product.
+-- Insert-only, so concurrent order writes never wait on each other; a
+-- tenant's row count changes with every committed write (unlike MAX(xmin) or
+-- MAX(id), which miss a write that commits after a newer one)
+CREATE TABLE IF NOT EXISTS sales_change_log (
+    id BIGSERIAL PRIMARY KEY,
+    tenant_id BIGINT NOT NULL REFERENCES tenant(id) ON DELETE CASCADE,
+    changed_at TIMESTAMP WITH TIME ZONE NOT NULL DEFAULT CURRENT_TIMESTAMP
+);
+
+-- COUNT(*) per tenant as an index-only scan
+CREATE INDEX IF NOT EXISTS idx_sales_change_log_tenant ON sales_change_log(tenant_id);
+
+CREATE OR REPLACE FUNCTION log_sales_change()
+RETURNS TRIGGER
+LANGUAGE plpgsql
+AS $$
+BEGIN
+    IF TG_OP = 'INSERT' THEN
+        INSERT INTO sales_change_log (tenant_id)
+        SELECT DISTINCT tenant_id FROM new_rows;
+    ELSIF TG_OP = 'DELETE' THEN
+        INSERT INTO sales_change_log (tenant_id)
+        SELECT DISTINCT tenant_id FROM old_rows;
+    ELSE
+        INSERT INTO sales_change_log (tenant_id)
+        SELECT n.tenant_id
+        FROM new_rows AS n
+        JOIN old_rows AS o USING (id)
+        WHERE n IS DISTINCT FROM o
+        UNION
+        SELECT o.tenant_id
+        FROM new_rows AS n
+        JOIN old_rows AS o USING (id)
+        WHERE n.tenant_id <> o.tenant_id;
+    END IF;
+    RETURN NULL;
+END;
+$$;
+
+DROP TRIGGER IF EXISTS trg_sales_change_log_order_insert ON "order";
+CREATE TRIGGER trg_sales_change_log_order_insert
+    AFTER INSERT ON "order"
+    REFERENCING NEW TABLE AS new_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION log_sales_change();
+
+DROP TRIGGER IF EXISTS trg_sales_change_log_order_update ON "order";
+CREATE TRIGGER trg_sales_change_log_order_update
+    AFTER UPDATE ON "order"
+    REFERENCING OLD TABLE AS old_rows NEW TABLE AS new_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION log_sales_change();
+
+DROP TRIGGER IF EXISTS trg_sales_change_log_order_delete ON "order";
+CREATE TRIGGER trg_sales_change_log_order_delete
+    AFTER DELETE ON "order"
+    REFERENCING OLD TABLE AS old_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION log_sales_change();
+
+DROP TRIGGER IF EXISTS trg_sales_change_log_item_insert ON order_product;
+CREATE TRIGGER trg_sales_change_log_item_insert
+    AFTER INSERT ON order_product
+    REFERENCING NEW TABLE AS new_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION log_sales_change();
+
+DROP TRIGGER IF EXISTS trg_sales_change_log_item_update ON order_product;
+CREATE TRIGGER trg_sales_change_log_item_update
+    AFTER UPDATE ON order_product
+    REFERENCING OLD TABLE AS old_rows NEW TABLE AS new_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION log_sales_change();
+
+DROP TRIGGER IF EXISTS trg_sales_change_log_item_delete ON order_product;
+CREATE TRIGGER trg_sales_change_log_item_delete
+    AFTER DELETE ON order_product
+    REFERENCING OLD TABLE AS old_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION log_sales_change();
@@ -11,10 +11,107 @@
 \echo 'Press Ctrl+C to cancel, or press Enter to continue...'
 \prompt 'Continue? (yes/no): ' confirm
 
+-- Drop functions
+\echo ''
+\echo 'Dropping functions...'
+
+DROP FUNCTION IF EXISTS create_order(BIGINT, INTEGER, TEXT, TEXT, JSONB, INTEGER, INTEGER, INTEGER, INTEGER, BOOLEAN);
+DROP FUNCTION IF EXISTS create_order(BIGINT, INTEGER, TEXT, TEXT, JSONB, INTEGER, INTEGER, INTEGER, INTEGER);
+DROP FUNCTION IF EXISTS create_order(BIGINT, INTEGER, TEXT, TEXT, JSONB);
+\echo '✓ Dropped create_order'
+
+DROP FUNCTION IF EXISTS rebuild_sales_daily_rollup(BIGINT);
+DROP TRIGGER IF EXISTS trg_sales_rollup_order ON "order";
+DROP TRIGGER IF EXISTS trg_sales_rollup_insert ON order_product;
+DROP TRIGGER IF EXISTS trg_sales_rollup_update ON order_product;
+DROP TRIGGER IF EXISTS trg_sales_rollup_delete ON order_product;
+DROP TRIGGER IF EXISTS trg_order_product_snapshot_cost ON order_product;
+DROP FUNCTION IF EXISTS sales_rollup_order();
+DROP FUNCTION IF EXISTS sales_rollup_order_product();
+DROP FUNCTION IF EXISTS sales_rollup_apply_lines(order_product[], INTEGER);
+DROP FUNCTION IF EXISTS order_product_snapshot_cost();
+\echo '✓ Dropped sales rollup functions'
+
+DROP TRIGGER IF EXISTS trg_component_alerts_insert ON component;
+DROP TRIGGER IF EXISTS trg_component_alerts_update ON component;
+DROP TRIGGER IF EXISTS trg_component_alerts_delete ON component;
+DROP FUNCTION IF EXISTS component_stock_changed();
+DROP FUNCTION IF EXISTS sync_inventory_alerts(INTEGER[]);
+\echo '✓ Dropped inventory alert engine'
+
+DROP TRIGGER IF EXISTS trg_bom_notify_insert ON bill_of_materials;
+DROP TRIGGER IF EXISTS trg_bom_notify_update ON bill_of_materials;
+DROP TRIGGER IF EXISTS trg_bom_notify_delete ON bill_of_materials;
+DROP TRIGGER IF EXISTS trg_component_notify_update ON component;
+DROP TRIGGER IF EXISTS trg_component_notify_delete ON component;
+DROP FUNCTION IF EXISTS notify_bom_changed();
+DROP FUNCTION IF EXISTS notify_component_changed();
+\echo '✓ Dropped bill of materials notifications'
+
+DROP TRIGGER IF EXISTS trg_sales_change_log_order_insert ON "order";
+DROP TRIGGER IF EXISTS trg_sales_change_log_order_update ON "order";
+DROP TRIGGER IF EXISTS trg_sales_change_log_order_delete ON "order";
+DROP TRIGGER IF EXISTS trg_sales_change_log_item_insert ON order_product;
+DROP TRIGGER IF EXISTS trg_sales_change_log_item_update ON order_product;
+DROP TRIGGER IF EXISTS trg_sales_change_log_item_delete ON order_product;
+DROP FUNCTION IF EXISTS log_sales_change();
+\echo '✓ Dropped sales change log triggers'
+
+DROP TRIGGER IF EXISTS trg_product_catalog_version_insert ON product;
+DROP TRIGGER IF EXISTS trg_product_catalog_version_update ON product;
+DROP TRIGGER IF EXISTS trg_product_catalog_version_delete ON product;
+DROP FUNCTION IF EXISTS bump_product_catalog_version();
+\echo '✓ Dropped product catalog version triggers'
+
+DROP TRIGGER IF EXISTS trg_product_notify_insert ON product;
+DROP TRIGGER IF EXISTS trg_product_notify_update ON product;
+DROP TRIGGER IF EXISTS trg_product_notify_delete ON product;
+DROP FUNCTION IF EXISTS notify_product_changed();
+\echo '✓ Dropped product notifications'
+
+DROP TRIGGER IF EXISTS trg_ledger_account_notify ON ledger_account;
+DROP FUNCTION IF EXISTS notify_ledger_account_changed();
+\echo '✓ Dropped ledger_account notifications'
+
 -- Drop tables in reverse order (respecting foreign key dependencies)
 \echo ''
 \echo 'Dropping tables...'
 
+DROP TABLE IF EXISTS sales_change_log CASCADE;
+\echo '✓ Dropped sales_change_log'
+
+DROP TABLE IF EXISTS tiendanube_sync_state CASCADE;
+\echo '✓ Dropped tiendanube_sync_state'
+
+DROP TABLE IF EXISTS inventory_alert CASCADE;
+\echo '✓ Dropped inventory_alert'
+
+DROP TABLE IF EXISTS bill_of_materials CASCADE;
+\echo '✓ Dropped bill_of_materials'
+
+DROP TABLE IF EXISTS component CASCADE;
+\echo '✓ Dropped component'
+
+DROP TABLE IF EXISTS product_catalog_version CASCADE;
+\echo '✓ Dropped product_catalog_version'
+
+DROP TABLE IF EXISTS sales_daily_rollup CASCADE;
+\echo '✓ Dropped sales_daily_rollup'
+
+DROP FUNCTION IF EXISTS sales_day(TIMESTAMP WITH TIME ZONE);
+
+DROP TABLE IF EXISTS ledger_outbox CASCADE;
+\echo '✓ Dropped ledger_outbox'
+
+DROP TABLE IF EXISTS ledger_line CASCADE;
+\echo '✓ Dropped ledger_line'
+
+DROP TABLE IF EXISTS ledger_entry CASCADE;
+\echo '✓ Dropped ledger_entry'
+
+DROP TABLE IF EXISTS ledger_account CASCADE;
+\echo '✓ Dropped ledger_account'
+
 DROP TABLE IF EXISTS invoice CASCADE;
 \echo '✓ Dropped invoice'
 
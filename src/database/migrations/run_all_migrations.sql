@@ -9,33 +9,81 @@
 \echo '=========================================='
 
 \echo ''
-\echo '[1/7] Creating ENUM types...'
+\echo '[1/19] Creating ENUM types...'
 \i 001_create_enums.sql
 
 \echo ''
-\echo '[2/7] Creating tenant table...'
+\echo '[2/19] Creating tenant table...'
 \i 002_create_tenant.sql
 
 \echo ''
-\echo '[3/7] Creating customer table...'
+\echo '[3/19] Creating customer table...'
 \i 003_create_customer.sql
 
 \echo ''
-\echo '[4/7] Creating product table...'
+\echo '[4/19] Creating product table...'
 \i 004_create_product.sql
 
 \echo ''
-\echo '[5/7] Creating order table...'
+\echo '[5/19] Creating order table...'
 \i 005_create_order.sql
 
 \echo ''
-\echo '[6/7] Creating order_product table...'
+\echo '[6/19] Creating order_product table...'
 \i 006_create_order_product.sql
 
 \echo ''
-\echo '[7/7] Creating invoice table...'
+\echo '[7/19] Creating invoice table...'
 \i 007_create_invoice.sql
 
+\echo ''
+\echo '[8/19] Creating order write function...'
+\i 008_create_order_function.sql
+
+\echo ''
+\echo '[9/19] Creating ledger account notifications...'
+\i 009_ledger_account_notify.sql
+
+\echo ''
+\echo '[10/19] Creating order keyset index...'
+\i 010_order_keyset_index.sql
+
+\echo ''
+\echo '[11/19] Creating ledger outbox...'
+\i 011_create_ledger_outbox.sql
+
+\echo ''
+\echo '[12/19] Creating sales daily rollup...'
+\i 012_create_sales_daily_rollup.sql
+
+\echo ''
+\echo '[13/19] Creating product search indexes...'
+\i 013_product_search.sql
+
+\echo ''
+\echo '[14/19] Creating product catalog version...'
+\i 014_product_catalog_version.sql
+
+\echo ''
+\echo '[15/19] Creating bill of materials...'
+\i 015_create_bill_of_materials.sql
+
+\echo ''
+\echo '[16/19] Creating inventory alert engine...'
+\i 016_inventory_alert_engine.sql
+
+\echo ''
+\echo '[17/19] Creating TiendaNube sync state...'
+\i 017_tiendanube_sync_state.sql
+
+\echo ''
+\echo '[18/19] Updating create_order for priced items...'
+\i 018_create_order_priced_items.sql
+
+\echo ''
+\echo '[19/19] Creating sales change log...'
+\i 019_sales_change_log.sql
+
 \echo ''
 \echo '=========================================='
 \echo 'Schema creation completed successfully!'
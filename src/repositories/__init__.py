@@ -1 +1,6 @@
-from src.repositories.tiendanube_repo import save_products_batch, save_variant_batch
+from src.repositories.tiendanube_repo import (
+    get_sync_watermark,
+    save_products_batch,
+    save_sync_watermark,
+    save_variant_batch,
+)
@@ -1,3 +1,5 @@
+from datetime import datetime
+
 from asyncpg import (
     Connection,
     ForeignKeyViolationError,
@@ -159,3 +161,32 @@ async def save_variant_batch(variants: list[TiendaNubeVariantDB], conn: Connecti
     except PostgresError as e:
         logger.error("Unexpected PostgresError", error=str(e))
         raise
+
+
+async def get_sync_watermark(tenant_id: int, conn: Connection) -> datetime | None:
+    """Start of the tenant's last successful product sync (None: never synced)"""
+    return await conn.fetchval(
+        "SELECT last_synced_at FROM tiendanube_sync_state WHERE tenant_id = $1",
+        tenant_id,
+    )
+
+
+async def save_sync_watermark(
+    tenant_id: int, synced_at: datetime, full: bool, conn: Connection
+):
+    await conn.execute(
+        """
+            INSERT INTO tiendanube_sync_state (tenant_id, last_synced_at, last_full_sync_at)
+            VALUES ($1, $2, CASE WHEN $3 THEN $2 END)
+            ON CONFLICT (tenant_id)
+            DO UPDATE SET
+                last_synced_at = EXCLUDED.last_synced_at,
+                last_full_sync_at = COALESCE(
+                    EXCLUDED.last_full_sync_at, tiendanube_sync_state.last_full_sync_at
+                ),
+                updated_at = NOW()
+        """,
+        tenant_id,
+        synced_at,
+        full,
+    )
@@ -6,7 +6,12 @@ from src.services.auth import (
     verify_password,
 )
 from src.services.components import get_components_list
-from src.services.orders import create_new_order, fetch_order_detail, fetch_orders
+from src.services.orders import (
+    create_new_order,
+    fetch_order_detail,
+    fetch_order_details,
+    fetch_orders,
+)
 from src.services.products import check_production_availability, get_products_list
 
 __all__ = [
@@ -19,6 +24,7 @@ __all__ = [
     # Orders
     "fetch_orders",
     "fetch_order_detail",
+    "fetch_order_details",
     "create_new_order",
     # Products
     "get_products_list",
@@ -1,38 +1,38 @@
 import os
 from datetime import datetime
-
-from afip import Afip
+from functools import lru_cache
 
 from src.api.schemas import FacturaB, FacturaC
 from src.core.config import settings
 
-cert_path = os.path.expanduser("~/afip-certs/certificado.crt")
-cert: str
-key_path = os.path.expanduser("~/afip-certs/private.key")
-key: str
+DATE = datetime.now().strftime("%Y%m%d")
+POINT_OF_SALE = 1
+INVOICE_TYPE = 6  # B
 
-with open(cert_path) as f:
-    cert = f.read()
 
-with open(key_path) as f:
-    key = f.read()
+@lru_cache(maxsize=1)
+def get_afip_config() -> dict:
+    """AFIP credentials, read from disk on first use (not at import)"""
+    with open(os.path.expanduser(settings.AFIP_CERT_PATH)) as f:
+        cert = f.read()
 
+    with open(os.path.expanduser(settings.AFIP_KEY_PATH)) as f:
+        key = f.read()
 
-config = {
-    "CUIT": settings.CUIT,
-    "production": False,  # Testing
-    "cert": cert,
-    "key": key,
-}
-
-DATE = datetime.now().strftime("%Y%m%d")
-POINT_OF_SALE = 1
-INVOICE_TYPE = 6  # B
+    return {
+        "CUIT": settings.CUIT,
+        "production": settings.AFIP_PRODUCTION,
+        "cert": cert,
+        "key": key,
+    }
 
 
 def get_afip_client():
+    # Imported here: the SDK is slow to import and only needed for invoicing
+    from afip import Afip
+
     try:
-        return Afip(config)
+        return Afip(get_afip_config())
     except Exception as e:
         print(e)
         raise
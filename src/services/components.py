@@ -1,6 +1,49 @@
 import asyncpg
 
 from src.api.schemas import ComponentResponse
+from src.core.statements import statement_registry
+
+# Optional filters, in placeholder order
+COMPONENT_FILTERS = ("is_active", "has_low_stock")
+
+# Listed explicitly: prepared statements must not change shape with the table
+COMPONENT_COLUMNS = """
+    c.id, c.name, c.description, c.category, c.unit_measure, c.current_stock,
+    c.min_stock, c.last_cost_price, c.is_active, c.created_at, c.updated_at
+"""
+
+
+def build_components_query(filters: frozenset[str]) -> str:
+    query = f"SELECT {COMPONENT_COLUMNS} FROM component AS c"
+    conditions = []
+    params_count = 0
+
+    if "has_low_stock" in filters:
+        query += " JOIN inventory_alert AS ia ON ia.component_id = c.id"
+        conditions.append("ia.is_active = TRUE")
+
+    if "is_active" in filters:
+        params_count += 1
+        conditions.append(f"c.is_active = ${params_count}")
+
+    if conditions:
+        query += " WHERE " + " AND ".join(conditions)
+
+    return query
+
+
+statement_registry.register(
+    "components",
+    {
+        filters: build_components_query(filters)
+        for filters in (
+            frozenset(),
+            frozenset({"is_active"}),
+            frozenset({"has_low_stock"}),
+            frozenset(COMPONENT_FILTERS),
+        )
+    },
+)
 
 
 async def get_components_list(
@@ -8,25 +51,18 @@ async def get_components_list(
     is_active: bool | None = None,
     has_low_stock: bool | None = None,
 ) -> list[ComponentResponse]:
-    query = "SELECT c.* FROM component AS c"
-    conditions = []
+    filters = set()
     params = []
-    param_count = 1
 
-    if has_low_stock is not None and has_low_stock:
-        query += " JOIN inventory_alert AS ia ON ia.component_id = c.id"
-        conditions.append("ia.is_active = TRUE")
-
-    print(query)
+    if has_low_stock:
+        filters.add("has_low_stock")
 
     if is_active is not None:
-        conditions.append(f"c.is_active = ${param_count}")
+        filters.add("is_active")
         params.append(is_active)
-        param_count += 1
-
-    if conditions:
-        query += " WHERE " + " AND ".join(conditions)
 
-    rows = await conn.fetch(query, *params)
+    rows = await statement_registry.fetch(
+        conn, "components", frozenset(filters), *params
+    )
 
     return [ComponentResponse(**row) for row in rows]
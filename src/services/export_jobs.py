@@ -0,0 +1,382 @@
+import asyncio
+import gzip
+import hashlib
+import json
+import os
+import re
+import time
+import uuid
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import AsyncIterator, Callable
+
+import asyncpg
+from loguru import logger
+
+from src.api.schemas import (
+    ExportCompression,
+    ExportFormat,
+    ExportJob,
+    ExportJobStatus,
+    ExportKind,
+)
+from src.core.columnar import (
+    COLUMNAR_CHUNK_SIZE,
+    COLUMNAR_MEDIA_TYPES,
+    arrow_schema,
+    columnar_chunks,
+)
+from src.core.config import settings
+from src.core.exceptions import NotFoundError, UnsupportedFormatError
+from src.core.streaming import (
+    STREAM_MEDIA_TYPES,
+    csv_chunks,
+    iter_record_batches,
+    ndjson_chunks,
+)
+from src.services.exports import INVENTORY_COLUMNS, INVENTORY_QUERY
+from src.services.sales import SALES_REPORT_KINDS, sales_report_source
+
+JOB_ID_PATTERN = re.compile(r"[0-9a-f]{32}")
+
+COMPRESSION_SUFFIXES = {
+    ExportCompression.NONE: "",
+    ExportCompression.GZIP: ".gz",
+    ExportCompression.ZSTD: ".zst",
+}
+
+MEDIA_TYPES = {**STREAM_MEDIA_TYPES, **COLUMNAR_MEDIA_TYPES}
+COMPRESSED_MEDIA_TYPES = {
+    ExportCompression.GZIP: "application/gzip",
+    ExportCompression.ZSTD: "application/zstd",
+}
+
+
+@dataclass(frozen=True)
+class ExportSource:
+    # (tenant_id, date_from, date_to) -> (query, params)
+    query: Callable[[int, datetime | None, datetime | None], tuple[str, list]]
+    # Column name -> kind (see src.core.columnar.arrow_schema)
+    columns: dict[str, str]
+    # Single-row query ($1 = tenant_id) that changes whenever the data does
+    watermark: str
+    filename: str
+
+
+# Change with every committed write, deletes included: the catalog version
+# (migration 014) and the tenant's row count in the insert-only
+# sales_change_log (migration 019)
+EXPORT_SOURCES = {
+    ExportKind.INVENTORY: ExportSource(
+        query=lambda tenant_id, date_from, date_to: (INVENTORY_QUERY, [tenant_id]),
+        columns=INVENTORY_COLUMNS,
+        watermark="""
+            SELECT COALESCE(
+                (SELECT version FROM product_catalog_version WHERE tenant_id = $1), 0
+            )::TEXT
+        """,
+        filename="inventario",
+    ),
+    ExportKind.SALES: ExportSource(
+        query=sales_report_source,
+        columns=SALES_REPORT_KINDS,
+        watermark="""
+            SELECT concat_ws(
+                '/',
+                (SELECT COUNT(*) FROM sales_change_log WHERE tenant_id = $1),
+                COALESCE(
+                    (SELECT version FROM product_catalog_version WHERE tenant_id = $1),
+                    0
+                )
+            )
+        """,
+        filename="ventas",
+    ),
+}
+
+
+def _zstandard():
+    try:
+        import zstandard
+    except ImportError:
+        raise UnsupportedFormatError(
+            "zstd",
+            "zstandard is not installed on this server (install the 'export' extra)",
+        )
+    return zstandard
+
+
+class ExportJobManager:
+    """Background export jobs writing artifacts to ``settings.EXPORT_DIR``.
+
+    Job state is kept as a JSON file next to the artifacts, so any worker can
+    report status and serve downloads. Artifacts are named after a hash of
+    the request and the source watermark, which makes an unchanged export a
+    cache hit: the job completes without reading the data again.
+    """
+
+    def __init__(self):
+        self._pool: asyncpg.Pool | None = None
+        self._semaphore: asyncio.Semaphore | None = None
+        self._tasks: set[asyncio.Task] = set()
+        self.directory = Path(settings.EXPORT_DIR)
+        self.submitted = 0
+        self.cache_hits = 0
+        self.completed = 0
+        self.failed = 0
+        self.cancelled = 0
+        self.bytes_written = 0
+        self.pruned = 0
+        self._last_prune = 0.0
+
+    async def start(self, pool: asyncpg.Pool) -> None:
+        self._pool = pool
+        self._semaphore = asyncio.Semaphore(settings.EXPORT_MAX_CONCURRENT_JOBS)
+        (self.directory / "jobs").mkdir(parents=True, exist_ok=True)
+        await self._prune_if_due(force=True)
+
+    async def stop(self) -> None:
+        for task in list(self._tasks):
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+
+    async def _prune_if_due(self, force: bool = False) -> None:
+        """Prune on start and then at most every EXPORT_PRUNE_INTERVAL, after
+        a job finishes"""
+        now = time.monotonic()
+        if not force and now - self._last_prune < settings.EXPORT_PRUNE_INTERVAL:
+            return
+        self._last_prune = now
+        try:
+            self.pruned += await asyncio.to_thread(self._prune)
+        except OSError:
+            logger.exception("Export directory prune failed")
+
+    def _prune(self) -> int:
+        """Remove artifacts and job files older than EXPORT_ARTIFACT_TTL"""
+        cutoff = time.time() - settings.EXPORT_ARTIFACT_TTL
+        removed = 0
+        for path in [*self.directory.glob("*.*"), *self.directory.glob("jobs/*")]:
+            if path.is_file() and path.stat().st_mtime < cutoff:
+                path.unlink(missing_ok=True)
+                removed += 1
+        return removed
+
+    def _job_path(self, job_id: str) -> Path:
+        return self.directory / "jobs" / f"{job_id}.json"
+
+    def _save(self, job: ExportJob) -> None:
+        path = self._job_path(job.id)
+        tmp = path.with_suffix(".tmp")
+        tmp.write_text(job.model_dump_json())
+        os.replace(tmp, path)
+
+    def get(self, job_id: str) -> ExportJob:
+        if not JOB_ID_PATTERN.fullmatch(job_id):
+            raise NotFoundError(resource="Export job", identifier=job_id)
+        try:
+            return ExportJob.model_validate_json(self._job_path(job_id).read_text())
+        except (FileNotFoundError, ValueError):
+            raise NotFoundError(resource="Export job", identifier=job_id)
+
+    def artifact(self, job: ExportJob) -> tuple[Path, str, str]:
+        """Path, media type and download name of a finished job's artifact"""
+        path = self.directory / job.filename if job.filename else None
+        if job.status != ExportJobStatus.DONE or path is None or not path.exists():
+            raise NotFoundError(resource="Export artifact", identifier=job.id)
+        media_type = COMPRESSED_MEDIA_TYPES.get(
+            job.compression, MEDIA_TYPES[job.format.value]
+        )
+        download_name = (
+            f"{EXPORT_SOURCES[job.kind].filename}.{job.format.value}"
+            f"{COMPRESSION_SUFFIXES[job.compression]}"
+        )
+        return path, media_type, download_name
+
+    async def submit(
+        self,
+        kind: ExportKind,
+        tenant_id: int,
+        fmt: ExportFormat,
+        compression: ExportCompression,
+        date_from: datetime | None = None,
+        date_to: datetime | None = None,
+    ) -> ExportJob:
+        source = EXPORT_SOURCES[kind]
+
+        # Fail before queueing when an optional encoder is missing
+        if fmt in (ExportFormat.PARQUET, ExportFormat.ARROW):
+            arrow_schema(source.columns)
+        if compression is ExportCompression.ZSTD:
+            _zstandard()
+
+        job = ExportJob(
+            id=uuid.uuid4().hex,
+            kind=kind,
+            tenant_id=tenant_id,
+            format=fmt,
+            compression=compression,
+            date_from=date_from,
+            date_to=date_to,
+            created_at=datetime.now(timezone.utc),
+        )
+        self._save(job)
+        self.submitted += 1
+
+        task = asyncio.create_task(self._run(job))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+        logger.info(
+            "Export job queued",
+            job_id=job.id,
+            kind=kind.value,
+            tenant_id=tenant_id,
+            format=fmt.value,
+        )
+        return job
+
+    def _artifact_name(self, job: ExportJob, watermark: str) -> str:
+        key = hashlib.sha256(
+            json.dumps(
+                [
+                    job.kind.value,
+                    job.tenant_id,
+                    job.format.value,
+                    job.compression.value,
+                    job.date_from.isoformat() if job.date_from else None,
+                    job.date_to.isoformat() if job.date_to else None,
+                    watermark,
+                ]
+            ).encode()
+        ).hexdigest()[:32]
+        source = EXPORT_SOURCES[job.kind]
+        return (
+            f"{source.filename}-{job.tenant_id}-{key}.{job.format.value}"
+            f"{COMPRESSION_SUFFIXES[job.compression]}"
+        )
+
+    async def _run(self, job: ExportJob) -> None:
+        source = EXPORT_SOURCES[job.kind]
+        log = logger.bind(job_id=job.id, kind=job.kind.value, tenant_id=job.tenant_id)
+
+        try:
+            async with self._semaphore:
+                job.status = ExportJobStatus.RUNNING
+                self._save(job)
+
+                async with self._pool.acquire() as conn:
+                    job.watermark = await conn.fetchval(source.watermark, job.tenant_id)
+                    job.filename = self._artifact_name(job, job.watermark)
+                    path = self.directory / job.filename
+
+                    if path.exists():
+                        job.cached = True
+                        self.cache_hits += 1
+                        path.touch()  # Keep it from being pruned
+                    else:
+                        query, params = source.query(
+                            job.tenant_id, job.date_from, job.date_to
+                        )
+                        job.rows = await self._write(conn, job, query, params, path)
+                        self.bytes_written += path.stat().st_size
+
+            job.size_bytes = path.stat().st_size
+            job.status = ExportJobStatus.DONE
+            self.completed += 1
+            log.info(
+                "Export job done",
+                cached=job.cached,
+                rows=job.rows,
+                size_bytes=job.size_bytes,
+            )
+        except asyncio.CancelledError:
+            job.status = ExportJobStatus.FAILED
+            job.error = "Cancelled on shutdown"
+            self.failed += 1
+            self.cancelled += 1
+            raise
+        except Exception as e:
+            job.status = ExportJobStatus.FAILED
+            job.error = str(e)
+            self.failed += 1
+            log.exception("Export job failed")
+        finally:
+            job.finished_at = datetime.now(timezone.utc)
+            self._save(job)
+
+        await self._prune_if_due()
+
+    async def _write(
+        self,
+        conn: asyncpg.Connection,
+        job: ExportJob,
+        query: str,
+        params: list,
+        path: Path,
+    ) -> int:
+        """Encode the query result into ``path`` (atomically); returns row count"""
+        source = EXPORT_SOURCES[job.kind]
+        rows = 0
+
+        async def counted(batches) -> AsyncIterator:
+            nonlocal rows
+            async for batch in batches:
+                rows += len(batch)
+                yield batch
+
+        if job.format in (ExportFormat.PARQUET, ExportFormat.ARROW):
+            batches = iter_record_batches(
+                conn, query, *params, chunk_size=COLUMNAR_CHUNK_SIZE
+            )
+            chunks = columnar_chunks(
+                counted(batches), arrow_schema(source.columns), job.format.value
+            )
+        else:
+            batches = counted(iter_record_batches(conn, query, *params))
+            chunks = (
+                csv_chunks(batches, tuple(source.columns))
+                if job.format is ExportFormat.CSV
+                else ndjson_chunks(batches)
+            )
+
+        tmp = path.with_name(f".{path.name}.{job.id}.tmp")
+        fh = await asyncio.to_thread(self._open, tmp, job.compression)
+        try:
+            async for chunk in chunks:
+                await asyncio.to_thread(fh.write, chunk)
+            await asyncio.to_thread(fh.close)
+            os.replace(tmp, path)
+        except BaseException:
+            fh.close()
+            tmp.unlink(missing_ok=True)
+            raise
+        return rows
+
+    @staticmethod
+    def _open(path: Path, compression: ExportCompression):
+        if compression is ExportCompression.GZIP:
+            return gzip.open(path, "wb", compresslevel=6)
+        if compression is ExportCompression.ZSTD:
+            return (
+                _zstandard()
+                .ZstdCompressor(level=3)
+                .stream_writer(open(path, "wb"), closefd=True)
+            )
+        return open(path, "wb")
+
+    def stats(self) -> dict:
+        return {
+            "submitted": self.submitted,
+            "cache_hits": self.cache_hits,
+            "completed": self.completed,
+            "failed": self.failed,
+            "cancelled": self.cancelled,
+            "running": len(self._tasks),
+            "bytes_written": self.bytes_written,
+            "pruned": self.pruned,
+        }
+
+
+export_jobs = ExportJobManager()
@@ -0,0 +1,142 @@
+from datetime import datetime
+
+import asyncpg
+from fastapi.responses import StreamingResponse
+from loguru import logger
+
+from src.core.columnar import (
+    COLUMNAR_CHUNK_SIZE,
+    COLUMNAR_MEDIA_TYPES,
+    stream_columnar,
+)
+from src.core.streaming import (
+    CSV_MEDIA_TYPE,
+    copy_csv_chunks,
+    iter_record_batches,
+    stream_records,
+)
+
+# Inventory sheet columns (Spanish headers are what the spreadsheet expects)
+# and their kind for columnar exports
+INVENTORY_COLUMNS = {
+    "Código": "text",
+    "Título": "text",
+    "Proveedor": "text",
+    "Stock Actual": "decimal",
+    "Costo Histórico (ARS)": "decimal",
+    "Costo Reposición (ARS)": "decimal",
+    "Precio Venta (ARS)": "decimal",
+    "Ganancia (Venta)": "decimal",
+    "% Ganancia": "int",
+    "% Ganancia Repo": "int",
+}
+
+INVENTORY_QUERY = """
+    SELECT
+        sku                                      AS "Código",
+        name                                     AS "Título",
+        supplier                                 AS "Proveedor",
+        current_stock                            AS "Stock Actual",
+        historical_cost                          AS "Costo Histórico (ARS)",
+        replacement_cost                         AS "Costo Reposición (ARS)",
+        sale_price                               AS "Precio Venta (ARS)",
+        sale_price - historical_cost             AS "Ganancia (Venta)",
+        round((sale_price - historical_cost) / NULLIF(sale_price, 0) * 100)::INTEGER
+                                                 AS "% Ganancia",
+        round((sale_price - replacement_cost) / NULLIF(sale_price, 0) * 100)::INTEGER
+                                                 AS "% Ganancia Repo"
+    FROM product
+    WHERE tenant_id = $1
+    ORDER BY id
+"""
+
+
+def stream_inventory(
+    conn: asyncpg.Connection, fmt: str = "csv", tenant_id: int = 3
+) -> StreamingResponse:
+    """Inventory sheet read through a server-side cursor and written chunk by
+    chunk as CSV, Parquet or Arrow IPC (margins are computed by the query)"""
+    logger.bind(tenant_id=tenant_id).info("Streaming inventory export", format=fmt)
+
+    if fmt in COLUMNAR_MEDIA_TYPES:
+        batches = iter_record_batches(
+            conn, INVENTORY_QUERY, tenant_id, chunk_size=COLUMNAR_CHUNK_SIZE
+        )
+        return stream_columnar(batches, INVENTORY_COLUMNS, fmt, filename="inventario")
+
+    batches = iter_record_batches(conn, INVENTORY_QUERY, tenant_id)
+    return stream_records(batches, tuple(INVENTORY_COLUMNS), fmt, filename="inventario")
+
+
+# Order lines for accountants; NULL date bounds are inlined by COPY and
+# folded away by the planner
+ORDERS_EXPORT_QUERY = """
+    SELECT
+        o.id AS order_id,
+        o.order_date,
+        o.status,
+        o.source,
+        o.payment_method,
+        o.payment_status,
+        o.customer_id,
+        c.name AS customer_name,
+        c.tax_id_number AS customer_tax_id,
+        op.product_id,
+        p.sku,
+        op.product_name,
+        op.quantity,
+        op.unit_price,
+        op.unit_cost,
+        op.iva_rate,
+        op.discount_amount,
+        op.quantity * op.unit_price AS subtotal,
+        o.total_price AS order_total
+    FROM "order" AS o
+    JOIN order_product AS op ON op.order_id = o.id
+    LEFT JOIN product AS p ON p.id = op.product_id
+    LEFT JOIN customer AS c ON c.id = o.customer_id
+    WHERE o.tenant_id = $1
+      AND ($2::TIMESTAMPTZ IS NULL OR o.order_date >= $2)
+      AND ($3::TIMESTAMPTZ IS NULL OR o.order_date < $3)
+    ORDER BY o.order_date, o.id, op.id
+"""
+
+# Journal: one row per ledger line
+LEDGER_EXPORT_QUERY = """
+    SELECT
+        le.id AS entry_id,
+        le.entry_date,
+        le.order_id,
+        la.code AS account_code,
+        la.name AS account_name,
+        ll.debit,
+        ll.credit
+    FROM ledger_entry AS le
+    JOIN ledger_line AS ll ON ll.entry_id = le.id
+    JOIN ledger_account AS la ON la.id = ll.account_id
+    WHERE le.tenant_id = $1
+      AND ($2::TIMESTAMPTZ IS NULL OR le.entry_date >= $2)
+      AND ($3::TIMESTAMPTZ IS NULL OR le.entry_date < $3)
+    ORDER BY le.entry_date, le.id, ll.id
+"""
+
+
+def stream_copy_export(
+    conn: asyncpg.Connection,
+    query: str,
+    filename: str,
+    tenant_id: int = 3,
+    date_from: datetime | None = None,
+    date_to: datetime | None = None,
+) -> StreamingResponse:
+    """CSV produced by COPY TO STDOUT and forwarded untouched (``date_to``
+    is exclusive)"""
+    logger.bind(tenant_id=tenant_id).info(
+        "Streaming COPY export", export=filename, date_from=date_from, date_to=date_to
+    )
+
+    return StreamingResponse(
+        copy_csv_chunks(conn, query, tenant_id, date_from, date_to),
+        media_type=CSV_MEDIA_TYPE,
+        headers={"Content-Disposition": f'attachment; filename="{filename}.csv"'},
+    )
@@ -0,0 +1,152 @@
+import asyncio
+from typing import AsyncIterator
+
+import asyncpg
+from fastapi import Request
+from loguru import logger
+
+from src.core.config import settings
+from src.core.notifications import pg_listener
+from src.core.streaming import ExitSignalHook, sse_event
+
+INVENTORY_ALERT_CHANNEL = "inventory_alert_changed"
+
+ACTIVE_ALERTS_QUERY = """
+    SELECT
+        ia.id AS alert_id,
+        c.id AS component_id,
+        c.name AS component_name,
+        c.current_stock,
+        c.min_stock,
+        ia.is_active,
+        ia.created_at
+    FROM inventory_alert AS ia
+    JOIN component AS c ON c.id = ia.component_id
+    WHERE ia.is_active
+    ORDER BY ia.created_at, ia.id
+"""
+
+# Queue markers: reload the snapshot (notifications were lost) / end the stream
+RESYNC = None
+CLOSE = object()
+
+
+class LowStockAlertHub:
+    """Fans ``inventory_alert_changed`` notifications out to SSE clients.
+
+    The alerts themselves are kept by triggers on ``component`` (migration
+    016), which re-evaluate only the rows a statement changed. Each client
+    has a bounded queue; one that falls behind has it cleared and gets a
+    fresh snapshot instead of the backlog. Streams end on the server's exit
+    signal, before uvicorn starts waiting for open responses.
+    """
+
+    def __init__(self):
+        self._subscribers: set[asyncio.Queue] = set()
+        self._closed = False
+        self._exit_hook = ExitSignalHook(self.close)
+        self._sequence = 0
+        self.published = 0
+        self.resyncs = 0
+
+    def subscribe(self) -> asyncio.Queue:
+        queue = asyncio.Queue(maxsize=settings.ALERT_STREAM_QUEUE_SIZE)
+        if self._closed:
+            queue.put_nowait(CLOSE)
+        self._subscribers.add(queue)
+        return queue
+
+    def unsubscribe(self, queue: asyncio.Queue) -> None:
+        self._subscribers.discard(queue)
+
+    def publish(self, payload: str | None = None) -> None:
+        """NOTIFY handler: payload is the alert JSON, None after a reconnect"""
+        if self._closed:
+            return  # A full queue would be cleared, CLOSE marker included
+        if payload is not None:
+            self._sequence += 1
+            self.published += 1
+        message = RESYNC if payload is None else (self._sequence, payload)
+
+        for queue in self._subscribers:
+            try:
+                queue.put_nowait(message)
+            except asyncio.QueueFull:
+                while not queue.empty():
+                    queue.get_nowait()
+                queue.put_nowait(RESYNC)
+                self.resyncs += 1
+
+    def close(self) -> None:
+        """End every open stream, and any opened later (server exiting)"""
+        self._closed = True
+        for queue in self._subscribers:
+            while not queue.empty():
+                queue.get_nowait()
+            queue.put_nowait(CLOSE)
+
+    def start(self) -> None:
+        """Lifespan startup"""
+        self._closed = False
+        self._exit_hook.install()
+
+    async def stop(self) -> None:
+        """Lifespan shutdown: normally already closed by the exit signal"""
+        self._exit_hook.uninstall()
+        self.close()
+
+    def stats(self) -> dict:
+        return {
+            "subscribers": len(self._subscribers),
+            "published": self.published,
+            "resyncs": self.resyncs,
+        }
+
+
+low_stock_alerts = LowStockAlertHub()
+pg_listener.subscribe(INVENTORY_ALERT_CHANNEL, low_stock_alerts.publish)
+
+
+async def _snapshot(pool: asyncpg.Pool) -> str:
+    async with pool.acquire() as conn:
+        rows = await conn.fetch(ACTIVE_ALERTS_QUERY)
+    return sse_event("snapshot", [dict(row) for row in rows])
+
+
+async def stream_low_stock_alerts(
+    pool: asyncpg.Pool, request: Request
+) -> AsyncIterator[str]:
+    """Server-sent events: a ``snapshot`` of the open alerts, then one
+    ``alert`` event per opened or resolved alert.
+
+    The queue is subscribed before the snapshot is read, so nothing that
+    changes in between is missed (it may be sent twice; events carry the
+    full state, so that is harmless). No pool connection is held between
+    events. The stream ends on shutdown, and a client that went away is
+    noticed at the next keepalive at the latest.
+    """
+    queue = low_stock_alerts.subscribe()
+    try:
+        yield await _snapshot(pool)
+        while True:
+            try:
+                message = await asyncio.wait_for(
+                    queue.get(), timeout=settings.ALERT_STREAM_KEEPALIVE
+                )
+            except asyncio.TimeoutError:
+                if await request.is_disconnected():
+                    return
+                yield ": keepalive\n\n"
+                continue
+
+            if message is CLOSE:
+                return
+            if message is RESYNC:
+                yield await _snapshot(pool)
+                continue
+
+            event_id, payload = message
+            yield sse_event("alert", payload, event_id)
+    finally:
+        low_stock_alerts.unsubscribe(queue)
+        logger.debug("Low-stock alert stream closed")
@@ -0,0 +1,94 @@
+import asyncio
+
+import asyncpg
+from loguru import logger
+
+from src.api.schemas import PaymentMethod
+from src.core.exceptions import NotFoundError
+from src.core.notifications import pg_listener
+
+LEDGER_ACCOUNT_CHANNEL = "ledger_account_changed"
+
+CASH_ACCOUNT = "1.1"  # Caja
+BANK_ACCOUNT = "1.2"  # Banco
+INVENTORY_ACCOUNT = "1.4"  # Inventario
+SALES_ACCOUNT = "4.1"  # Ventas
+COGS_ACCOUNT = "5.1"  # CMV
+
+
+class LedgerAccountResolver:
+    """In-process (tenant, account code) -> ledger_account.id map.
+
+    Each tenant's chart of accounts is loaded on first use and dropped when
+    ``ledger_account_changed`` is notified for that tenant.
+    """
+
+    def __init__(self):
+        self._accounts: dict[int, dict[str, int]] = {}
+        self._generation: dict[int, int] = {}
+        self._locks: dict[int, asyncio.Lock] = {}
+
+    async def get_chart(
+        self, conn: asyncpg.Connection, tenant_id: int
+    ) -> dict[str, int]:
+        chart = self._accounts.get(tenant_id)
+        if chart is not None:
+            return chart
+
+        lock = self._locks.setdefault(tenant_id, asyncio.Lock())
+        async with lock:
+            chart = self._accounts.get(tenant_id)
+            if chart is not None:
+                return chart
+
+            generation = self._generation.get(tenant_id, 0)
+            rows = await conn.fetch(
+                "SELECT code, id FROM ledger_account WHERE tenant_id = $1", tenant_id
+            )
+            chart = {row["code"]: row["id"] for row in rows}
+
+            # An invalidation raced the load: serve it but don't cache it
+            if self._generation.get(tenant_id, 0) == generation:
+                self._accounts[tenant_id] = chart
+
+            logger.bind(tenant_id=tenant_id).debug(
+                "Chart of accounts loaded", accounts=len(chart)
+            )
+            return chart
+
+    async def resolve(self, conn: asyncpg.Connection, tenant_id: int, code: str) -> int:
+        chart = await self.get_chart(conn, tenant_id)
+        if code not in chart:
+            raise NotFoundError(resource="Ledger account", identifier=code)
+        return chart[code]
+
+    async def order_accounts(
+        self, conn: asyncpg.Connection, tenant_id: int, payment_method: PaymentMethod
+    ) -> dict[str, int]:
+        """Account ids used to post an order's sale and COGS entries"""
+        cash_or_bank = (
+            CASH_ACCOUNT if payment_method == PaymentMethod.CASH else BANK_ACCOUNT
+        )
+        return {
+            "cash_or_bank": await self.resolve(conn, tenant_id, cash_or_bank),
+            "sales": await self.resolve(conn, tenant_id, SALES_ACCOUNT),
+            "cogs": await self.resolve(conn, tenant_id, COGS_ACCOUNT),
+            "inventory": await self.resolve(conn, tenant_id, INVENTORY_ACCOUNT),
+        }
+
+    def invalidate(self, payload: str | None = None) -> None:
+        """NOTIFY handler: payload is the tenant id, None drops every tenant"""
+        if payload is None:
+            tenants = set(self._accounts) | set(self._generation)
+        else:
+            tenants = {int(payload)}
+
+        for tenant_id in tenants:
+            self._accounts.pop(tenant_id, None)
+            self._generation[tenant_id] = self._generation.get(tenant_id, 0) + 1
+
+        logger.debug("Chart of accounts invalidated", tenants=sorted(tenants))
+
+
+account_resolver = LedgerAccountResolver()
+pg_listener.subscribe(LEDGER_ACCOUNT_CHANNEL, account_resolver.invalidate)
@@ -0,0 +1,288 @@
+import asyncio
+import time
+
+import asyncpg
+from loguru import logger
+
+from src.core.config import settings
+from src.core.notifications import pg_listener
+
+LEDGER_OUTBOX_CHANNEL = "ledger_outbox_pending"
+# Sent (on commit) by every batch that posted something, from any worker
+LEDGER_POSTED_CHANNEL = "ledger_outbox_posted"
+# Ceiling (seconds) for the retry delay after consecutive failed batches
+LEDGER_OUTBOX_MAX_BACKOFF = 60
+
+# Columns a relation needs for post_ledger_entries
+LEDGER_POST_COLUMNS = """
+    tenant_id BIGINT NOT NULL,
+    order_id INTEGER NOT NULL,
+    entry_date TIMESTAMP WITH TIME ZONE NOT NULL,
+    total NUMERIC NOT NULL,
+    cost NUMERIC NOT NULL,
+    sale_entry_id INTEGER NOT NULL,
+    cogs_entry_id INTEGER NOT NULL,
+    cash_or_bank_account_id INTEGER NOT NULL,
+    sales_account_id INTEGER NOT NULL,
+    cogs_account_id INTEGER NOT NULL,
+    inventory_account_id INTEGER NOT NULL
+"""
+
+
+async def post_ledger_entries(conn: asyncpg.Connection, source_table: str) -> None:
+    """Set-based sale + COGS posting for every order in ``source_table``.
+
+    ``source_table`` has LEDGER_POST_COLUMNS, with entry ids pre-allocated
+    from the ledger_entry sequence.
+    """
+    await conn.execute(
+        f"""
+        INSERT INTO ledger_entry (id, tenant_id, entry_date, order_id)
+        SELECT e.entry_id, r.tenant_id, r.entry_date, r.order_id
+        FROM {source_table} AS r
+        CROSS JOIN LATERAL (VALUES (r.sale_entry_id), (r.cogs_entry_id)) AS e(entry_id)
+        """
+    )
+
+    await conn.execute(
+        f"""
+        INSERT INTO ledger_line (tenant_id, entry_id, account_id, debit, credit)
+        SELECT r.tenant_id, l.entry_id, l.account_id, l.debit, l.credit
+        FROM {source_table} AS r
+        CROSS JOIN LATERAL (
+            VALUES
+                (r.sale_entry_id, r.cash_or_bank_account_id, r.total, 0),  -- Caja/Banco DEBE
+                (r.sale_entry_id, r.sales_account_id, 0, r.total),         -- Ventas HABER
+                (r.cogs_entry_id, r.cogs_account_id, r.cost, 0),           -- CMV DEBE
+                (r.cogs_entry_id, r.inventory_account_id, 0, r.cost)       -- Inventario HABER
+        ) AS l(entry_id, account_id, debit, credit)
+        """
+    )
+
+
+class LedgerOutboxPoster:
+    """Background task draining ledger_outbox in batches.
+
+    Each batch claims pending rows with FOR UPDATE SKIP LOCKED (so several
+    workers can drain concurrently), inserts their ledger rows set-wise and
+    marks them posted, all in one transaction. Wakes up on
+    ``ledger_outbox_pending`` notifications, polling as a fallback. A
+    failing batch is logged and retried after the poll interval; the task
+    itself only ends on ``stop``.
+    """
+
+    def __init__(self):
+        self._pool: asyncpg.Pool | None = None
+        self._task: asyncio.Task | None = None
+        self._wakeup = asyncio.Event()
+        self._posted = asyncio.Event()
+        self.posted = 0
+        self.batches = 0
+        self.failures = 0
+        self.last_batch_size = 0
+        self.last_lag_seconds = 0.0  # created_at -> posted, oldest in last batch
+        self.pending = 0
+        self.oldest_pending_seconds = 0.0
+        self.last_run_at: float | None = None
+
+    def notify(self, payload: str | None = None) -> None:
+        self._wakeup.set()
+
+    def posted_signal(self) -> asyncio.Event:
+        """Set by the next ``ledger_outbox_posted`` notification"""
+        return self._posted
+
+    def on_posted(self, payload: str | None = None) -> None:
+        """NOTIFY handler: wake every wait_for_ledger (None: listener reconnected)"""
+        posted, self._posted = self._posted, asyncio.Event()
+        posted.set()
+
+    async def start(self, pool: asyncpg.Pool) -> None:
+        self._pool = pool
+        self._task = asyncio.create_task(self._run())
+        logger.info("Ledger outbox poster started", mode=settings.LEDGER_POSTING_MODE)
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    async def _run(self) -> None:
+        consecutive_failures = 0
+        while True:
+            try:
+                posted = await self.drain_batch()
+                consecutive_failures = 0
+                if posted >= settings.LEDGER_OUTBOX_BATCH_SIZE:
+                    continue  # Backlog: keep draining
+                await self._refresh_backlog()
+            except asyncio.CancelledError:
+                raise
+            except Exception:
+                # The poster must outlive a bad batch: back off and retry
+                self.failures += 1
+                consecutive_failures += 1
+                logger.exception("Ledger outbox batch failed")
+                await asyncio.sleep(
+                    min(
+                        settings.LEDGER_OUTBOX_POLL_INTERVAL
+                        * 2 ** (consecutive_failures - 1),
+                        LEDGER_OUTBOX_MAX_BACKOFF,
+                    )
+                )
+                continue
+
+            self._wakeup.clear()
+            try:
+                await asyncio.wait_for(
+                    self._wakeup.wait(), timeout=settings.LEDGER_OUTBOX_POLL_INTERVAL
+                )
+            except asyncio.TimeoutError:
+                pass
+
+    async def drain_batch(self) -> int:
+        """Post one batch; returns the number of orders posted"""
+        async with self._pool.acquire() as conn:
+            async with conn.transaction():
+                await conn.execute(
+                    f"""
+                    CREATE TEMP TABLE ledger_post_batch (
+                        {LEDGER_POST_COLUMNS},
+                        queued_at TIMESTAMP WITH TIME ZONE NOT NULL
+                    ) ON COMMIT DROP
+                    """
+                )
+
+                await conn.execute(
+                    """
+                    WITH claimed AS (
+                        UPDATE ledger_outbox
+                        SET posted_at = NOW()
+                        WHERE id IN (
+                            SELECT id FROM ledger_outbox
+                            WHERE posted_at IS NULL
+                            ORDER BY id
+                            LIMIT $1
+                            FOR UPDATE SKIP LOCKED
+                        )
+                        RETURNING *
+                    )
+                    INSERT INTO ledger_post_batch
+                    SELECT
+                        c.tenant_id,
+                        c.order_id,
+                        o.order_date,
+                        c.total,
+                        c.cost,
+                        nextval(pg_get_serial_sequence('ledger_entry', 'id')),
+                        nextval(pg_get_serial_sequence('ledger_entry', 'id')),
+                        c.cash_or_bank_account_id,
+                        c.sales_account_id,
+                        c.cogs_account_id,
+                        c.inventory_account_id,
+                        c.created_at
+                    FROM claimed AS c
+                    JOIN "order" AS o ON o.id = c.order_id
+                    """,
+                    settings.LEDGER_OUTBOX_BATCH_SIZE,
+                )
+
+                await post_ledger_entries(conn, "ledger_post_batch")
+
+                batch = await conn.fetchrow(
+                    """
+                    SELECT
+                        COUNT(*) AS posted,
+                        COALESCE(EXTRACT(EPOCH FROM NOW() - MIN(queued_at)), 0) AS lag
+                    FROM ledger_post_batch
+                    """
+                )
+                if batch["posted"]:
+                    await conn.execute(
+                        "SELECT pg_notify($1, $2)",
+                        LEDGER_POSTED_CHANNEL,
+                        str(batch["posted"]),
+                    )
+
+        posted = batch["posted"]
+        self.last_run_at = time.time()
+        if posted:
+            self.posted += posted
+            self.batches += 1
+            self.last_batch_size = posted
+            self.last_lag_seconds = float(batch["lag"])
+            logger.debug(
+                "Ledger outbox batch posted",
+                posted=posted,
+                lag_seconds=self.last_lag_seconds,
+            )
+        return posted
+
+    async def _refresh_backlog(self) -> None:
+        async with self._pool.acquire() as conn:
+            row = await conn.fetchrow(
+                """
+                SELECT
+                    COUNT(*) AS pending,
+                    COALESCE(EXTRACT(EPOCH FROM NOW() - MIN(created_at)), 0) AS oldest
+                FROM ledger_outbox
+                WHERE posted_at IS NULL
+                """
+            )
+        self.pending = row["pending"]
+        self.oldest_pending_seconds = float(row["oldest"])
+
+    def stats(self) -> dict:
+        return {
+            "mode": settings.LEDGER_POSTING_MODE,
+            "posted": self.posted,
+            "batches": self.batches,
+            "failures": self.failures,
+            "last_batch_size": self.last_batch_size,
+            "last_lag_seconds": round(self.last_lag_seconds, 3),
+            "pending": self.pending,
+            "oldest_pending_seconds": round(self.oldest_pending_seconds, 3),
+            "last_run_at": self.last_run_at,
+        }
+
+
+async def wait_for_ledger(pool: asyncpg.Pool, order_id: int, timeout: float) -> bool:
+    """Wait until the order's accounting is posted (True) or timeout (False).
+
+    Sleeps on ``ledger_outbox_posted`` between checks, holding no pool
+    connection; LEDGER_OUTBOX_POLL_INTERVAL bounds each sleep in case a
+    notification is missed.
+    """
+    deadline = time.monotonic() + timeout
+
+    while True:
+        # Taken before the check, so a batch posted in between still wakes us
+        posted = ledger_poster.posted_signal()
+        async with pool.acquire() as conn:
+            pending = await conn.fetchval(
+                "SELECT posted_at IS NULL FROM ledger_outbox WHERE order_id = $1",
+                order_id,
+            )
+        if not pending:  # Posted, or never deferred
+            return True
+
+        remaining = deadline - time.monotonic()
+        if remaining <= 0:
+            return False
+        ledger_poster.notify()
+        try:
+            await asyncio.wait_for(
+                posted.wait(),
+                timeout=min(remaining, settings.LEDGER_OUTBOX_POLL_INTERVAL),
+            )
+        except asyncio.TimeoutError:
+            pass
+
+
+ledger_poster = LedgerOutboxPoster()
+pg_listener.subscribe(LEDGER_OUTBOX_CHANNEL, ledger_poster.notify)
+pg_listener.subscribe(LEDGER_POSTED_CHANNEL, ledger_poster.on_posted)
@@ -1,15 +1,118 @@
+import json
+import re
+from datetime import datetime
+from itertools import chain, combinations
+
 import asyncpg
+from fastapi.responses import StreamingResponse
 from loguru import logger
 
 from src.api.schemas import (
-    Customer,
     ManualOrderRequest,
-    OrderBase,
+    Order,
     OrderStatus,
     PaymentMethod,
 )
 from src.api.schemas.orders import OrderResponseItem
+from src.core.config import settings
 from src.core.exceptions import NotFoundError
+from src.core.pagination import (
+    DEFAULT_PAGE_SIZE,
+    decode_cursor,
+    encode_cursor,
+    parse_fields,
+)
+from src.core.statements import statement_registry
+from src.core.streaming import iter_record_batches, stream_records
+from src.services.ledger_accounts import account_resolver
+from src.services.ledger_posting import wait_for_ledger
+from src.services.prices import price_cache
+
+
+ORDER_COLUMNS = tuple(Order.model_fields)
+
+# Optional filters in placeholder order ($1 is always tenant_id, LIMIT last)
+ORDER_FILTERS = {
+    "status": "status = ${}",
+    "payment_method": "payment_method = ${}",
+    "customer_id": "customer_id = ${}",
+    "date_from": "order_date >= ${}",
+    "date_to": "order_date < ${}",
+    "cursor": "(order_date, id) < (${}, ${})",
+}
+
+
+def build_orders_query(
+    columns: tuple[str, ...], filters: frozenset[str], paginate: bool = True
+) -> str:
+    """Order listing for a given projection and filter set.
+
+    Paginated queries take the page size as their last parameter.
+    """
+    conditions = ["tenant_id = $1"]
+    param_count = 1
+
+    for name, template in ORDER_FILTERS.items():
+        if name in filters:
+            placeholders = range(
+                param_count + 1, param_count + 1 + template.count("{}")
+            )
+            conditions.append(template.format(*placeholders))
+            param_count += len(placeholders)
+
+    query = (
+        f'SELECT {", ".join(columns)} FROM "order"'
+        f" WHERE {' AND '.join(conditions)}"
+        f" ORDER BY order_date DESC, id DESC"
+    )
+    if paginate:
+        query += f" LIMIT ${param_count + 1}"
+    return query
+
+
+# Every filter combination of the full-row listing is prepared up front
+statement_registry.register(
+    "orders",
+    {
+        filters: build_orders_query(ORDER_COLUMNS, filters)
+        for filters in map(
+            frozenset,
+            chain.from_iterable(
+                combinations(ORDER_FILTERS, n) for n in range(len(ORDER_FILTERS) + 1)
+            ),
+        )
+    },
+)
+
+
+def _order_filter_params(
+    tenant_id: int,
+    status: OrderStatus | None,
+    payment_method: PaymentMethod | None,
+    customer_id: int | None,
+    date_from: datetime | None,
+    date_to: datetime | None,
+    cursor: str | None,
+) -> tuple[frozenset[str], list]:
+    """Filters present and their parameters, in ORDER_FILTERS order"""
+    values = {
+        "status": status.value if status else None,
+        "payment_method": payment_method.value if payment_method else None,
+        "customer_id": customer_id,
+        "date_from": date_from,
+        "date_to": date_to,
+        "cursor": decode_cursor(cursor, datetime, int) if cursor else None,
+    }
+    filters = frozenset(name for name, value in values.items() if value is not None)
+
+    params: list = [tenant_id]
+    for name in ORDER_FILTERS:
+        if name == "cursor" and "cursor" in filters:
+            params.extend(values["cursor"])
+        elif name in filters:
+            params.append(values[name])
+
+    return filters, params
 
 
 async def fetch_orders(
@@ -17,299 +120,339 @@ async def fetch_orders(
     status: OrderStatus | None,
     payment_method: PaymentMethod | None,
     customer_id: int | None,
-    tenant_id,
-) -> list[OrderBase]:
+    tenant_id: int,
+    date_from: datetime | None = None,
+    date_to: datetime | None = None,
+    cursor: str | None = None,
+    limit: int = DEFAULT_PAGE_SIZE,
+    fields: str | None = None,
+) -> dict:
+    """Newest-first page of orders, keyset-paginated on (order_date, id).
+
+    ``fields`` narrows the SELECT list (``id`` and ``order_date`` are always
+    included since the cursor is built from them). ``date_to`` is exclusive.
+    """
     log = logger.bind(
         tenant_id=tenant_id,
         filters={
             "status": status.value if status else None,
             "payment_method": payment_method.value if payment_method else None,
             "customer_id": customer_id,
+            "date_from": date_from,
+            "date_to": date_to,
         },
     )
 
     log.info("Fetching orders with filters")
-    # vars
-    query = 'SELECT * FROM "order"'
-    conditions = []
-    params = []
-    params_count = 1
 
-    if tenant_id:
-        params.append(tenant_id)
-        conditions.append(f"tenant_id = ${params_count}")
+    columns = parse_fields(fields, ORDER_COLUMNS, required=("id", "order_date"))
+    filters, params = _order_filter_params(
+        tenant_id, status, payment_method, customer_id, date_from, date_to, cursor
+    )
 
-    if status is not None:
-        params.append(status.value)
-        params_count += 1
-        conditions.append(f"status = ${params_count}")
+    if columns == ORDER_COLUMNS:
+        rows = await statement_registry.fetch(
+            conn, "orders", filters, *params, limit + 1
+        )
+    else:
+        rows = await conn.fetch(
+            build_orders_query(columns, filters), *params, limit + 1
+        )
 
-    if payment_method is not None:
-        params.append(payment_method.value)
-        params_count += 1
-        conditions.append(f"payment_method = ${params_count}")
+    page = rows[:limit]
+    next_cursor = (
+        encode_cursor(page[-1]["order_date"], page[-1]["id"])
+        if len(rows) > limit
+        else None
+    )
 
-    if customer_id is not None:
-        params.append(customer_id)
-        params_count += 1
-        conditions.append(f"customer_id = ${params_count}")
+    log.info("Orders retrieved", count=len(page), has_more=next_cursor is not None)
 
-    if conditions:
-        query += " WHERE " + " AND ".join(conditions)
+    data = (
+        [Order(**row) for row in page]
+        if columns == ORDER_COLUMNS
+        else [dict(row) for row in page]
+    )
 
-    rows = await conn.fetch(query, *params)
+    return {"data": data, "next_cursor": next_cursor, "limit": limit}
 
-    log.info("Orders retrieved", count=len(rows))
 
-    return [OrderBase(**row) for row in rows]
+def stream_orders(
+    conn: asyncpg.Connection,
+    fmt: str,
+    status: OrderStatus | None,
+    payment_method: PaymentMethod | None,
+    customer_id: int | None,
+    tenant_id: int,
+    date_from: datetime | None = None,
+    date_to: datetime | None = None,
+    fields: str | None = None,
+) -> StreamingResponse:
+    """Every matching order as NDJSON/CSV, read through a server-side cursor"""
+    logger.bind(tenant_id=tenant_id).info("Streaming orders", format=fmt)
+
+    columns = parse_fields(fields, ORDER_COLUMNS, required=("id", "order_date"))
+    filters, params = _order_filter_params(
+        tenant_id, status, payment_method, customer_id, date_from, date_to, None
+    )
+
+    batches = iter_record_batches(
+        conn, build_orders_query(columns, filters, paginate=False), *params
+    )
+    return stream_records(batches, columns, fmt, filename="orders")
+
+
+# Order, items and ledger entries (with their lines) as one JSON document
+# per order, for every id in $1
+ORDER_DETAIL_QUERY = """
+    SELECT
+        o.id,
+        jsonb_build_object(
+            'order', to_jsonb(o),
+            'order_items', COALESCE(
+                (
+                    SELECT jsonb_agg(
+                        jsonb_build_object(
+                            'product_id', op.product_id,
+                            'product_name', op.product_name,
+                            'quantity', op.quantity,
+                            'unit_price', op.unit_price,
+                            'subtotal', op.quantity * op.unit_price
+                        )
+                        ORDER BY op.id
+                    )
+                    FROM order_product AS op
+                    WHERE op.order_id = o.id AND op.tenant_id = o.tenant_id
+                ),
+                '[]'::jsonb
+            ),
+            'accounting_pending', EXISTS (
+                SELECT 1 FROM ledger_outbox AS lo
+                WHERE lo.order_id = o.id AND lo.posted_at IS NULL
+            ),
+            'accounting', COALESCE(
+                (
+                    SELECT jsonb_agg(
+                        to_jsonb(le) || jsonb_build_object(
+                            'lines',
+                            (
+                                SELECT COALESCE(jsonb_agg(to_jsonb(ll) ORDER BY ll.id), '[]'::jsonb)
+                                FROM ledger_line AS ll
+                                WHERE ll.entry_id = le.id
+                            )
+                        )
+                        ORDER BY le.id
+                    )
+                    FROM ledger_entry AS le
+                    WHERE le.order_id = o.id AND le.tenant_id = o.tenant_id
+                ),
+                '[]'::jsonb
+            )
+        ) AS detail
+    FROM "order" AS o
+    WHERE o.id = ANY($1::INTEGER[]) AND o.tenant_id = $2
+"""
 
 
-async def fetch_order_detail(order_id: int, tenant_id: int, conn: asyncpg.Connection):
-    """Get order details with items"""
+def _parse_order_detail(raw: str) -> dict:
+    detail = json.loads(raw)
+    detail["order_items"] = [
+        OrderResponseItem(**item) for item in detail["order_items"]
+    ]
+    return detail
+
+
+async def fetch_order_detail(
+    order_id: int,
+    tenant_id: int,
+    conn: asyncpg.Connection,
+):
+    """Get order details with items and ledger entries (single query)"""
     log = logger.bind(order_id=order_id, tenant_id=tenant_id)
 
     log.info("Fetching order details")
 
-    order = await conn.fetchrow(
-        'SELECT * FROM "order" WHERE id = $1 AND tenant_id = $2', order_id, tenant_id
-    )
+    row = await conn.fetchrow(ORDER_DETAIL_QUERY, [order_id], tenant_id)
 
-    if order is None:
+    if row is None:
         log.warning("Order not found")
         raise NotFoundError(resource="Order", identifier=order_id)
 
-    log.info("Order retrieved successfully")
-
-    items = await conn.fetch(
-        "SELECT * FROM order_product WHERE order_id = $1 AND tenant_id = $2",
-        order_id,
-        tenant_id,
-    )
+    detail = _parse_order_detail(row["detail"])
 
-    if not items:
+    if not detail["order_items"]:
         log.warning("Items not found")
         raise NotFoundError(resource="Order_items", identifier=order_id)
 
-    order_items = [
-        OrderResponseItem(
-            product_id=row["product_id"],
-            product_name=row["product_name"],
-            quantity=row["quantity"],
-            unit_price=row["unit_price"],
-            subtotal=row["quantity"] * row["unit_price"],
-        )
-        for row in items
-    ]
-
-    # Query 3: Ledger entries con lines agrupadas
-    entries = await conn.fetch(
-        """
-        SELECT le.*, COALESCE(json_agg(ll.*), '[]'::json) as lines
-        FROM ledger_entry le
-        JOIN ledger_line ll ON le.id = ll.entry_id
-        WHERE le.order_id = $1 AND le.tenant_id = $2
-        GROUP BY le.id
-    """,
-        order_id,
-        tenant_id,
-    )
-
-    if not entries:
+    if not detail["accounting"] and not detail["accounting_pending"]:
         log.warning("Entries not found")
         raise NotFoundError(resource="Ledger entries", identifier=order_id)
 
-    return {"order": order, "order_items": order_items, "accounting": entries}
+    log.info("Order retrieved successfully")
 
+    return detail
 
-async def create_new_order(order: ManualOrderRequest, conn: asyncpg.Connection) -> dict:
-    """Create order with transaction"""
-    logger.info(
-        "Creating order",
-        customer=order.customer_id,
-        items_count=len(order.items),
-        product_ids=[item.product_id for item in order.items],
-    )
-    # Handle delivery date
-    # delivery_date = order.delivery_date
-    # if delivery_date:
-    #     if delivery_date.tzinfo is None:
-    #         delivery_date = delivery_date.replace(tzinfo=timezone.utc)
-    # else:
-    #     delivery_date = datetime.now(timezone.utc) + timedelta(days=7)
-
-    async with conn.transaction():
-        logger.debug("Transaction started for order creation")
-
-        customer: Customer | None = None
-
-        if order.customer_id:
-            customer = await conn.fetchrow(
-                "SELECT * FROM customer WHERE id = $1 AND tenant_id = $2",
-                order.customer_id,
-                3,
-            )
 
-            if customer is None:
-                logger.warning("Customer not found")
-                raise NotFoundError(resource="Customer", identifier=order.customer_id)
-            else:
-                customer = Customer(**customer)
-        # 1. Insert order
-        order_row = await conn.fetchrow(
-            """
-            INSERT INTO "order"(customer_id, payment_method, notes, total_price, tenant_id) 
-            VALUES ($1, $2, $3, $4, $5)
-            RETURNING id, created_at, order_date
-            """,
-            order.customer_id,
-            order.payment_method.value,
-            order.notes,
-            1,
-            3,
+async def fetch_order_detail_when_posted(
+    order_id: int, tenant_id: int, pool: asyncpg.Pool
+):
+    """fetch_order_detail once the order's outbox ledger posting is done.
+
+    After LEDGER_WAIT_TIMEOUT the order is read anyway, with
+    ``accounting_pending`` still true. No pool connection is held while
+    waiting.
+    """
+    if not await wait_for_ledger(pool, order_id, timeout=settings.LEDGER_WAIT_TIMEOUT):
+        logger.bind(order_id=order_id, tenant_id=tenant_id).warning(
+            "Timed out waiting for ledger posting"
         )
 
-        order_id = order_row["id"]
-        order_date = order_row["order_date"]
+    async with pool.acquire() as conn:
+        return await fetch_order_detail(order_id, tenant_id=tenant_id, conn=conn)
 
-        log = logger.bind(order_id=order_id)
-        log.debug("Order record inserted")
 
-        # 2. Get product prices
-        products_id = [item.product_id for item in order.items]
-        rows = await conn.fetch(
-            """
-            SELECT id, name, sale_price, historical_cost 
-            FROM product
-            WHERE id = ANY($1)
-            """,
-            products_id,
-        )
-        products_dict = {row["id"]: dict(row) for row in rows}
-
-        log.debug("Products fetched", items_count=len(products_dict))
-
-        # 3. Bulk insert order_product
-        order_items_data = [
-            (
-                order_id,
-                products_dict[item.product_id]["name"],
-                item.product_id,
-                item.quantity,
-                products_dict[item.product_id]["sale_price"],
-                21.00,
-                3,
-                # products_dict[item.product_id]["historical_cost"],
-            )
-            for item in order.items
-        ]
-
-        await conn.executemany(
-            """
-            INSERT INTO order_product (order_id, product_name, product_id, quantity, unit_price, iva_rate, tenant_id)
-            VALUES ($1, $2, $3, $4, $5, $6, $7)
-            """,
-            order_items_data,
-        )
+async def fetch_order_details(
+    order_ids: list[int], tenant_id: int, conn: asyncpg.Connection
+) -> dict:
+    """Batch variant of fetch_order_detail: many orders, one query.
 
-        log.debug("Order items inserted", items_count=len(order_items_data))
+    Details come back in the requested order; unknown ids are listed in
+    ``missing`` instead of failing the whole batch.
+    """
+    log = logger.bind(tenant_id=tenant_id)
+    log.info("Fetching order details batch", requested=len(order_ids))
 
-        # 4. Calculate total
-        total_price = sum(
-            products_dict[item.product_id]["sale_price"] * item.quantity
-            for item in order.items
-        )
+    rows = await conn.fetch(ORDER_DETAIL_QUERY, order_ids, tenant_id)
+    details = {row["id"]: _parse_order_detail(row["detail"]) for row in rows}
 
-        log.debug("Total calculated", total_price=total_price)
-
-        # 5. Update order total
-        await conn.execute(
-            'UPDATE "order" SET total_price = $1 WHERE id = $2', total_price, order_id
-        )
+    missing = [order_id for order_id in order_ids if order_id not in details]
+    if missing:
+        log.warning("Orders not found", missing=missing)
 
-        log.info(
-            "Order created successfully",
-            total_price=float(total_price),
-            items_count=len(order.items),
-        )
+    return {
+        "data": [
+            details[order_id]
+            for order_id in dict.fromkeys(order_ids)
+            if order_id in details
+        ],
+        "missing": missing,
+    }
 
-        # MVC COST
-        mvc_cost = sum(
-            products_dict[item.product_id]["historical_cost"] * item.quantity
-            for item in order.items
-        )
 
-        entry_row = await conn.fetchrow(
-            "INSERT INTO ledger_entry(tenant_id, entry_date, order_id) VALUES($1, $2, $3) RETURNING id",
-            3,
-            order_date,
-            order_id,
-        )
+# Foreign keys that fail when a cached id was deleted under create_order
+PRODUCT_FK = "order_product_product_id_fkey"
+LEDGER_ACCOUNT_FK = "ledger_line_account_id_fkey"
+FOREIGN_KEY_DETAIL = re.compile(r"Key \((?P<column>[^)]+)\)=\((?P<value>[^)]*)\)")
 
-        entry_id = entry_row["id"]
 
-        # 1. Obtener account_ids
-        cash_or_bank_id = await conn.fetchval(
-            "SELECT id FROM ledger_account WHERE code = $1 AND tenant_id = $2",
-            "1.1" if order.payment_method == PaymentMethod.CASH.value else "1.2",
-            3,
-        )
+def _foreign_key_value(detail: str | None) -> str | None:
+    """The missing key from 'Key (product_id)=(12) is not present in ...'"""
+    match = FOREIGN_KEY_DETAIL.search(detail or "")
+    return match["value"] if match else None
 
-        sales_account_id = await conn.fetchval(
-            "SELECT id FROM ledger_account WHERE code = $1 AND tenant_id = $2",
-            "4.1",  # Ventas
-            3,
-        )
 
-        # Crear entry #2
-        entry2_row = await conn.fetchrow(
-            "INSERT INTO ledger_entry(tenant_id, entry_date, order_id) VALUES($1, $2, $3) RETURNING id",
-            3,
-            order_date,
-            order_id,
-        )
-        entry2_id = entry2_row["id"]
+async def create_new_order(
+    order: ManualOrderRequest,
+    conn: asyncpg.Connection,
+    tenant_id: int = 3,
+    defer_ledger: bool | None = None,
+) -> dict:
+    """Create order, items and ledger entries in a single round trip.
+
+    The whole write pipeline runs server-side in the ``create_order`` SQL
+    function (see migrations 008/009/011/018), which is atomic on its own.
+    Items go in already priced from the price cache.
+    Ledger account ids come from the in-process chart-of-accounts resolver.
+    With ``defer_ledger`` (default: LEDGER_POSTING_MODE == "outbox") only a
+    ledger_outbox row is written and the background poster posts it.
+    """
+    if defer_ledger is None:
+        defer_ledger = settings.LEDGER_POSTING_MODE == "outbox"
+
+    log = logger.bind(tenant_id=tenant_id)
+    log.info(
+        "Creating order",
+        customer=order.customer_id,
+        items_count=len(order.items),
+        product_ids=[item.product_id for item in order.items],
+    )
 
-        # Obtener account_ids
-        cogs_id = await conn.fetchval(
-            "SELECT id FROM ledger_account WHERE code = '5.1' AND tenant_id = $1", 3
-        )
-        inventory_id = await conn.fetchval(
-            "SELECT id FROM ledger_account WHERE code = '1.4' AND tenant_id = $1", 3
-        )
+    # Priced from the cache: create_order then skips the product lookup.
+    # Unknown products are rejected here, before the write
+    prices = await price_cache.get_many(
+        conn, tenant_id, [item.product_id for item in order.items]
+    )
+    priced_items = [
+        {
+            "product_id": item.product_id,
+            "quantity": item.quantity,
+            "product_name": prices[item.product_id].name,
+            "unit_price": str(prices[item.product_id].sale_price),
+            "unit_cost": str(prices[item.product_id].historical_cost or 0),
+        }
+        for item in order.items
+    ]
 
-        # Insertar líneas
-        await conn.executemany(
-            "INSERT INTO ledger_line(tenant_id, entry_id, account_id, debit, credit) VALUES ($1, $2, $3, $4, $5)",
-            [
-                (3, entry2_id, cogs_id, mvc_cost, 0),  # CMV DEBE
-                (3, entry2_id, inventory_id, 0, mvc_cost),  # Inventario HABER
-            ],
-        )
+    accounts = await account_resolver.order_accounts(
+        conn, tenant_id, order.payment_method
+    )
 
-        # 2. Insertar 2 líneas
-        await conn.executemany(
-            "INSERT INTO ledger_line(tenant_id, entry_id, account_id, debit, credit) VALUES ($1, $2, $3, $4, $5)",
-            [
-                (3, entry_id, cash_or_bank_id, total_price, 0),  # DEBE
-                (3, entry_id, sales_account_id, 0, total_price),  # HABER
-            ],
+    try:
+        row = await conn.fetchrow(
+            "SELECT * FROM create_order($1, $2, $3, $4, $5::jsonb, $6, $7, $8, $9, $10)",
+            tenant_id,
+            order.customer_id,
+            order.payment_method.value,
+            order.notes,
+            json.dumps(priced_items),
+            accounts["cash_or_bank"],
+            accounts["sales"],
+            accounts["cogs"],
+            accounts["inventory"],
+            defer_ledger,
         )
+    except asyncpg.NoDataFoundError as e:
+        log.warning(f"{e.detail} not found", identifier=e.hint)
+        raise NotFoundError(resource=e.detail or "Resource", identifier=e.hint or "")
+    except asyncpg.ForeignKeyViolationError as e:
+        # Deleted since it was cached: drop the cache, report the missing key
+        key = _foreign_key_value(e.detail)
+        if e.constraint_name == PRODUCT_FK:
+            price_cache.invalidate(str(tenant_id))
+            log.warning("Order references a deleted product", identifier=key)
+            raise NotFoundError(
+                resource="Product",
+                identifier=key
+                or ",".join(str(item.product_id) for item in order.items),
+            )
+        if e.constraint_name == LEDGER_ACCOUNT_FK:
+            account_resolver.invalidate(str(tenant_id))
+            log.warning("Order references a deleted ledger account", identifier=key)
+            raise NotFoundError(resource="Ledger account", identifier=key or "")
+        raise
+
+    items = json.loads(row["items"])
+    total_price = row["total_price"]
+
+    log.bind(order_id=row["order_id"]).info(
+        "Order created successfully",
+        total_price=float(total_price),
+        items_count=len(items),
+    )
 
-        return {
-            "order_id": order_id,
-            "status": "pending",
-            "total_price": float(total_price),
-            "items": [
-                {
-                    "product_id": item.product_id,
-                    "product_name": products_dict[item.product_id]["name"],
-                    "quantity": item.quantity,
-                    "unit_price": float(products_dict[item.product_id]["sale_price"]),
-                    "subtotal": float(
-                        products_dict[item.product_id]["sale_price"] * item.quantity
-                    ),
-                }
-                for item in order.items
-            ],
-            "created_at": order_row["created_at"],
-        }
+    return {
+        "order_id": row["order_id"],
+        "status": "pending",
+        "total_price": float(total_price),
+        "items": [
+            {
+                "product_id": item["product_id"],
+                "product_name": item["product_name"],
+                "quantity": item["quantity"],
+                "unit_price": float(item["unit_price"]),
+                "subtotal": float(item["subtotal"]),
+            }
+            for item in items
+        ],
+        "created_at": row["created_at"],
+    }
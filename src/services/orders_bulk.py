@@ -0,0 +1,305 @@
+import json
+from typing import AsyncIterable, AsyncIterator
+
+import asyncpg
+from loguru import logger
+from pydantic import ValidationError
+
+from src.api.schemas import ManualOrderRequest, OrderSource
+from src.core.exceptions import InvalidPayloadError, NotFoundError
+from src.services.ledger_accounts import (
+    BANK_ACCOUNT,
+    CASH_ACCOUNT,
+    COGS_ACCOUNT,
+    INVENTORY_ACCOUNT,
+    SALES_ACCOUNT,
+    account_resolver,
+)
+from src.services.ledger_posting import post_ledger_entries
+
+NDJSON_MEDIA_TYPES = ("application/x-ndjson", "application/ndjson", "application/jsonl")
+
+
+async def iter_bulk_payloads(
+    chunks: AsyncIterable[bytes], content_type: str
+) -> AsyncIterator[tuple[int, object]]:
+    """Yield (row_number, decoded_json) from a JSON array or NDJSON body.
+
+    NDJSON is decoded line by line as the body streams in; a JSON array has
+    to be read whole. Undecodable NDJSON lines are yielded as ``None``.
+    """
+    if content_type.split(";")[0].strip() in NDJSON_MEDIA_TYPES:
+        row_no = 0
+        buffer = b""
+        async for chunk in chunks:
+            buffer += chunk
+            *lines, buffer = buffer.split(b"\n")
+            for line in lines:
+                if line.strip():
+                    row_no += 1
+                    yield row_no, _decode_line(line)
+        if buffer.strip():
+            yield row_no + 1, _decode_line(buffer)
+        return
+
+    body = b"".join([chunk async for chunk in chunks])
+    try:
+        data = json.loads(body)
+    except json.JSONDecodeError as e:
+        raise InvalidPayloadError(f"Invalid JSON body: {e.msg}")
+
+    if not isinstance(data, list):
+        raise InvalidPayloadError("Expected a JSON array of orders")
+
+    for row_no, payload in enumerate(data, start=1):
+        yield row_no, payload
+
+
+def _decode_line(line: bytes) -> object:
+    try:
+        return json.loads(line)
+    except json.JSONDecodeError:
+        return None
+
+
+async def _stage_records(
+    payloads: AsyncIterable[tuple[int, object]], errors: list[dict]
+) -> AsyncIterator[tuple]:
+    """Validate each payload and yield the valid ones as COPY records"""
+    async for row_no, payload in payloads:
+        if payload is None:
+            errors.append({"row": row_no, "errors": ["Invalid JSON"]})
+            continue
+        try:
+            order = ManualOrderRequest.model_validate(payload)
+        except ValidationError as e:
+            errors.append(
+                {
+                    "row": row_no,
+                    "errors": [
+                        f"{'.'.join(map(str, err['loc']))}: {err['msg']}"
+                        for err in e.errors()
+                    ],
+                }
+            )
+            continue
+
+        bad_quantities = [i.product_id for i in order.items if i.quantity <= 0]
+        if not order.items or bad_quantities:
+            errors.append(
+                {
+                    "row": row_no,
+                    "errors": [
+                        f"Invalid quantity for product {pid} (must be > 0)"
+                        for pid in bad_quantities
+                    ]
+                    or ["Order has no items"],
+                }
+            )
+            continue
+
+        yield (
+            row_no,
+            order.customer_id,
+            order.payment_method.value,
+            order.notes,
+            json.dumps([item.model_dump() for item in order.items]),
+        )
+
+
+async def bulk_ingest_orders(
+    payloads: AsyncIterable[tuple[int, object]],
+    conn: asyncpg.Connection,
+    tenant_id: int = 3,
+    source: OrderSource | None = None,
+) -> dict:
+    """Ingest many orders in one transaction.
+
+    Valid payloads are streamed through COPY into a staging table, rejected
+    rows are reported per row, and the rest are written to ``order``,
+    ``order_product``, ``ledger_entry`` and ``ledger_line`` with set-based
+    inserts (ids are pre-allocated from the sequences).
+    """
+    log = logger.bind(tenant_id=tenant_id)
+    errors: list[dict] = []
+
+    chart = await account_resolver.get_chart(conn, tenant_id)
+    accounts = {
+        code: chart.get(code)
+        for code in (
+            CASH_ACCOUNT,
+            BANK_ACCOUNT,
+            SALES_ACCOUNT,
+            COGS_ACCOUNT,
+            INVENTORY_ACCOUNT,
+        )
+    }
+    # Cash/bank are checked per row; the rest are needed by every order
+    for code in (SALES_ACCOUNT, COGS_ACCOUNT, INVENTORY_ACCOUNT):
+        if accounts[code] is None:
+            raise NotFoundError(resource="Ledger account", identifier=code)
+
+    async with conn.transaction():
+        await conn.execute(
+            """
+            CREATE TEMP TABLE bulk_order_stage (
+                row_no INTEGER PRIMARY KEY,
+                customer_id INTEGER,
+                payment_method TEXT NOT NULL,
+                notes TEXT,
+                items JSONB NOT NULL
+            ) ON COMMIT DROP
+            """
+        )
+
+        await conn.copy_records_to_table(
+            "bulk_order_stage",
+            records=_stage_records(payloads, errors),
+            columns=["row_no", "customer_id", "payment_method", "notes", "items"],
+        )
+
+        await conn.execute(
+            """
+            CREATE TEMP TABLE bulk_item_stage ON COMMIT DROP AS
+            SELECT
+                s.row_no,
+                i.product_id,
+                i.quantity,
+                p.id IS NOT NULL AS found,
+                p.name AS product_name,
+                p.sale_price AS unit_price,
+                COALESCE(p.historical_cost, 0) AS unit_cost
+            FROM bulk_order_stage AS s
+            CROSS JOIN LATERAL jsonb_to_recordset(s.items) AS i(product_id INTEGER, quantity INTEGER)
+            LEFT JOIN product AS p ON p.id = i.product_id AND p.tenant_id = $1
+            """,
+            tenant_id,
+        )
+
+        rejected = await conn.fetch(
+            """
+            SELECT row_no, 'Customer not found: ' || customer_id AS error
+            FROM bulk_order_stage AS s
+            WHERE customer_id IS NOT NULL AND NOT EXISTS (
+                SELECT 1 FROM customer AS c WHERE c.id = s.customer_id AND c.tenant_id = $1
+            )
+            UNION ALL
+            SELECT row_no, 'Product not found: ' || product_id
+            FROM bulk_item_stage
+            WHERE NOT found
+            UNION ALL
+            SELECT row_no, 'Duplicate product in order: ' || product_id
+            FROM bulk_item_stage
+            GROUP BY row_no, product_id
+            HAVING COUNT(*) > 1
+            UNION ALL
+            SELECT row_no, 'Order total must be > 0'
+            FROM bulk_item_stage
+            GROUP BY row_no
+            HAVING bool_and(found) AND SUM(unit_price * quantity) <= 0
+            -- Column limits: one out-of-range value would abort the whole batch
+            UNION ALL
+            SELECT row_no, 'Quantity too large for product ' || product_id
+            FROM bulk_item_stage
+            WHERE quantity >= 100000000  -- order_product.quantity NUMERIC(10,2)
+            UNION ALL
+            SELECT row_no, 'Order total exceeds 999999.99'
+            FROM bulk_item_stage
+            GROUP BY row_no
+            HAVING bool_and(found) AND SUM(unit_price * quantity) >= 1000000  -- "order".total_price NUMERIC(8,2)
+            UNION ALL
+            SELECT row_no, 'Order cost exceeds 9999999999.99'
+            FROM bulk_item_stage
+            GROUP BY row_no
+            HAVING bool_and(found) AND SUM(unit_cost * quantity) >= 10000000000  -- ledger amounts NUMERIC(12,2)
+            UNION ALL
+            SELECT row_no, 'Ledger account not found: '
+                || CASE WHEN payment_method = 'cash' THEN $2::TEXT ELSE $3::TEXT END
+            FROM bulk_order_stage
+            WHERE CASE WHEN payment_method = 'cash' THEN $4::INTEGER ELSE $5::INTEGER END IS NULL
+            ORDER BY row_no
+            """,
+            tenant_id,
+            CASH_ACCOUNT,
+            BANK_ACCOUNT,
+            accounts[CASH_ACCOUNT],
+            accounts[BANK_ACCOUNT],
+        )
+
+        rejected_rows: dict[int, list[str]] = {}
+        for row in rejected:
+            rejected_rows.setdefault(row["row_no"], []).append(row["error"])
+        errors.extend({"row": r, "errors": e} for r, e in rejected_rows.items())
+
+        await conn.execute(
+            """
+            CREATE TEMP TABLE bulk_order_ready ON COMMIT DROP AS
+            SELECT
+                s.row_no,
+                s.customer_id,
+                s.payment_method,
+                s.notes,
+                $2::BIGINT AS tenant_id,
+                NOW() AS entry_date,
+                t.total,
+                t.cost,
+                nextval(pg_get_serial_sequence('"order"', 'id'))::INTEGER AS order_id,
+                nextval(pg_get_serial_sequence('ledger_entry', 'id'))::INTEGER AS sale_entry_id,
+                nextval(pg_get_serial_sequence('ledger_entry', 'id'))::INTEGER AS cogs_entry_id,
+                CASE WHEN s.payment_method = 'cash' THEN $3::INTEGER ELSE $4::INTEGER END
+                    AS cash_or_bank_account_id,
+                $5::INTEGER AS sales_account_id,
+                $6::INTEGER AS cogs_account_id,
+                $7::INTEGER AS inventory_account_id
+            FROM bulk_order_stage AS s
+            JOIN (
+                SELECT row_no, SUM(unit_price * quantity) AS total, SUM(unit_cost * quantity) AS cost
+                FROM bulk_item_stage
+                GROUP BY row_no
+            ) AS t USING (row_no)
+            WHERE s.row_no <> ALL($1::INTEGER[])
+            """,
+            list(rejected_rows),
+            tenant_id,
+            accounts[CASH_ACCOUNT],
+            accounts[BANK_ACCOUNT],
+            accounts[SALES_ACCOUNT],
+            accounts[COGS_ACCOUNT],
+            accounts[INVENTORY_ACCOUNT],
+        )
+
+        await conn.execute(
+            """
+            INSERT INTO "order" (id, customer_id, order_date, payment_method, notes, total_price, source, tenant_id)
+            SELECT order_id, customer_id, entry_date, payment_method::payment_method, notes, total, $1::order_source, tenant_id
+            FROM bulk_order_ready
+            """,
+            source.value if source else None,
+        )
+
+        await conn.execute(
+            """
+            INSERT INTO order_product (order_id, product_name, product_id, quantity, unit_price, unit_cost, iva_rate, tenant_id)
+            SELECT r.order_id, i.product_name, i.product_id, i.quantity, i.unit_price, i.unit_cost, 21.00, $1
+            FROM bulk_order_ready AS r
+            JOIN bulk_item_stage AS i USING (row_no)
+            """,
+            tenant_id,
+        )
+
+        await post_ledger_entries(conn, "bulk_order_ready")
+
+        created = await conn.fetch(
+            "SELECT row_no, order_id FROM bulk_order_ready ORDER BY row_no"
+        )
+
+    errors.sort(key=lambda e: e["row"])
+    log.info("Bulk orders ingested", inserted=len(created), failed=len(errors))
+
+    return {
+        "received": len(created) + len(errors),
+        "inserted": len(created),
+        "failed": len(errors),
+        "orders": [{"row": r["row_no"], "order_id": r["order_id"]} for r in created],
+        "errors": errors,
+    }
@@ -0,0 +1,200 @@
+import time
+from collections import OrderedDict
+
+import asyncpg
+from loguru import logger
+
+from src.api.schemas import (
+    OrderQuote,
+    OrderResponseItem,
+    ProductPrice,
+    ProductQty,
+)
+from src.core.config import settings
+from src.core.exceptions import InvalidQuantityError, NotFoundError
+from src.core.notifications import pg_listener
+from src.core.statements import statement_registry
+from src.services.product_search import PRODUCT_CHANNEL
+
+statement_registry.register(
+    "prices",
+    {
+        "by_id": """
+            SELECT
+                id AS product_id, name, sku, sale_price, historical_cost,
+                iva_rate, is_active
+            FROM product
+            WHERE tenant_id = $1 AND id = ANY($2::INT[])
+        """
+    },
+)
+
+
+# product_id -> (price, monotonic load time)
+TenantPrices = dict[int, tuple[ProductPrice, float]]
+
+
+class PriceCache:
+    """Read-through cache of product pricing columns, per tenant.
+
+    Products are loaded on first use, in one query per batch of misses, and
+    versioned by a per-tenant generation so a load racing an invalidation is
+    never cached. ``product_changed`` drops a tenant's prices. Stock-only
+    updates send no notification, so orders never flush the cache. Tenants
+    are kept in LRU order, up to PRICE_CACHE_MAX_TENANTS. PRICE_CACHE_TTL
+    bounds staleness if a notification is lost.
+    """
+
+    def __init__(self):
+        self._tenants: OrderedDict[int, TenantPrices] = OrderedDict()
+        self._generation: dict[int, int] = {}
+        self.hits = 0
+        self.misses = 0
+        self.expired = 0
+        self.invalidations = 0
+        self.evictions = 0
+        # Age of the entries served from cache
+        self._served_age_total = 0.0
+        self._served_age_max = 0.0
+
+    def generation(self, tenant_id: int) -> int:
+        return self._generation.get(tenant_id, 0)
+
+    def _tenant(self, tenant_id: int) -> TenantPrices:
+        tenant = self._tenants.get(tenant_id)
+        if tenant is None:
+            tenant = self._tenants[tenant_id] = {}
+            while len(self._tenants) > settings.PRICE_CACHE_MAX_TENANTS:
+                self._tenants.popitem(last=False)
+                self.evictions += 1
+        self._tenants.move_to_end(tenant_id)
+        return tenant
+
+    async def get_many(
+        self, conn: asyncpg.Connection, tenant_id: int, product_ids: list[int]
+    ) -> dict[int, ProductPrice]:
+        """Prices of ``product_ids``; raises NotFoundError for unknown ids"""
+        tenant = self._tenant(tenant_id)
+        now = time.monotonic()
+        prices: dict[int, ProductPrice] = {}
+        missing: list[int] = []
+
+        for product_id in dict.fromkeys(product_ids):
+            entry = tenant.get(product_id)
+            if entry is not None and now - entry[1] > settings.PRICE_CACHE_TTL:
+                self.expired += 1
+                entry = None
+            if entry is None:
+                missing.append(product_id)
+                continue
+            prices[product_id] = entry[0]
+            age = now - entry[1]
+            self._served_age_total += age
+            self._served_age_max = max(self._served_age_max, age)
+
+        self.hits += len(prices)
+        self.misses += len(missing)
+
+        if missing:
+            version = self.generation(tenant_id)
+            rows = await statement_registry.fetch(
+                conn, "prices", "by_id", tenant_id, missing
+            )
+            loaded = {row["product_id"]: ProductPrice(**row) for row in rows}
+            prices.update(loaded)
+
+            # An invalidation raced the load: serve it but don't cache it
+            if self.generation(tenant_id) == version:
+                entries = self._tenant(tenant_id)
+                for product_id, price in loaded.items():
+                    entries[product_id] = (price, now)
+
+        unknown = [product_id for product_id in product_ids if product_id not in prices]
+        if unknown:
+            raise NotFoundError(
+                resource="Product", identifier=",".join(map(str, unknown))
+            )
+        return prices
+
+    def invalidate(self, payload: str | None = None) -> None:
+        """NOTIFY handler: payload is the tenant id, None drops every tenant"""
+        if payload is None:
+            tenants = set(self._tenants) | set(self._generation)
+        else:
+            tenants = {int(payload)}
+
+        for tenant_id in tenants:
+            self._tenants.pop(tenant_id, None)
+            self._generation[tenant_id] = self._generation.get(tenant_id, 0) + 1
+        self.invalidations += 1
+
+        logger.debug("Price cache invalidated", tenants=sorted(tenants))
+
+    def stats(self) -> dict:
+        lookups = self.hits + self.misses
+        now = time.monotonic()
+        oldest = min(
+            (
+                loaded_at
+                for tenant in self._tenants.values()
+                for _, loaded_at in tenant.values()
+            ),
+            default=None,
+        )
+        return {
+            "tenants": len(self._tenants),
+            "entries": sum(len(tenant) for tenant in self._tenants.values()),
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / lookups, 4) if lookups else None,
+            "expired": self.expired,
+            "invalidations": self.invalidations,
+            "evictions": self.evictions,
+            "staleness_seconds": {
+                "mean_served": (
+                    round(self._served_age_total / self.hits, 3) if self.hits else None
+                ),
+                "max_served": round(self._served_age_max, 3),
+                "oldest_entry": round(now - oldest, 3) if oldest is not None else None,
+            },
+        }
+
+
+price_cache = PriceCache()
+pg_listener.subscribe(PRODUCT_CHANNEL, price_cache.invalidate)
+
+
+async def get_product_prices(
+    conn: asyncpg.Connection, tenant_id: int, product_ids: list[int]
+) -> list[ProductPrice]:
+    """POS price screen: prices in the requested order"""
+    prices = await price_cache.get_many(conn, tenant_id, product_ids)
+    return [prices[product_id] for product_id in dict.fromkeys(product_ids)]
+
+
+async def quote_order(
+    conn: asyncpg.Connection, tenant_id: int, items: list[ProductQty]
+) -> OrderQuote:
+    """Order total at current cached prices (nothing is written).
+
+    ``create_new_order`` prices from the same cache, so a quote matches the
+    order placed right after it unless a price change lands in between.
+    """
+    for item in items:
+        if item.quantity <= 0:
+            raise InvalidQuantityError(quantity=item.quantity)
+
+    prices = await price_cache.get_many(
+        conn, tenant_id, [item.product_id for item in items]
+    )
+    lines = [
+        OrderResponseItem(
+            product_id=item.product_id,
+            product_name=prices[item.product_id].name,
+            quantity=item.quantity,
+            unit_price=prices[item.product_id].sale_price,
+            subtotal=prices[item.product_id].sale_price * item.quantity,
+        )
+        for item in items
+    ]
+    return OrderQuote(total_price=sum(line.subtotal for line in lines), items=lines)
@@ -0,0 +1,187 @@
+import time
+from collections import OrderedDict
+
+import asyncpg
+from loguru import logger
+
+from src.api.schemas import ProductListItem
+from src.core.config import settings
+from src.core.notifications import pg_listener
+from src.core.statements import statement_registry
+from src.services.products import PRODUCT_LIST_COLUMNS
+
+PRODUCT_CHANNEL = "product_changed"
+
+# Below this length trigrams can't narrow the search: prefix match only
+MIN_TRIGRAM_LENGTH = 3
+
+PRODUCT_SEARCH_QUERIES = {
+    # UNIQUE(tenant_id, sku): a scanned barcode is a single index probe
+    "sku": f"SELECT {PRODUCT_LIST_COLUMNS} FROM product WHERE tenant_id = $1 AND sku = $2",
+    # Two ordered index range scans that stop after $3 rows each
+    "prefix": f"""
+        SELECT {PRODUCT_LIST_COLUMNS} FROM (
+            (SELECT {PRODUCT_LIST_COLUMNS} FROM product
+             WHERE tenant_id = $1 AND lower(name) COLLATE "C" LIKE $2
+             ORDER BY lower(name) COLLATE "C"
+             LIMIT $3)
+            UNION
+            (SELECT {PRODUCT_LIST_COLUMNS} FROM product
+             WHERE tenant_id = $1 AND lower(sku) COLLATE "C" LIKE $2
+             ORDER BY lower(sku) COLLATE "C"
+             LIMIT $3)
+        ) AS matches
+        ORDER BY lower(name), id
+        LIMIT $3
+    """,
+    # Substring or fuzzy word match through the trigram GIN indexes
+    "ranked": f"""
+        SELECT {PRODUCT_LIST_COLUMNS} FROM product
+        WHERE tenant_id = $1
+          AND (name ILIKE $2 OR sku ILIKE $2 OR $3 <% name)
+        ORDER BY
+            starts_with(lower(name), lower($3)) DESC,
+            GREATEST(word_similarity($3, name), word_similarity($3, COALESCE(sku, ''))) DESC,
+            lower(name),
+            id
+        LIMIT $4
+    """,
+}
+
+statement_registry.register("product_search", PRODUCT_SEARCH_QUERIES)
+
+
+def _escape_like(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+
+
+class ProductSearchCache:
+    """Per-tenant LRU of search results for short queries.
+
+    The first keystrokes of a search ("a", "ac", "ace") are the most frequent
+    and match the most rows, so they are the ones worth caching; longer
+    queries are selective and cheap. A tenant's entries are dropped when
+    ``product_changed`` is notified for it; stock is not part of that
+    notification, so entries also expire after PRODUCT_SEARCH_CACHE_TTL.
+    """
+
+    def __init__(self):
+        self._entries: dict[int, OrderedDict[tuple[str, int], tuple]] = {}
+        self._generation: dict[int, int] = {}
+        self.hits = 0
+        self.misses = 0
+        self.invalidations = 0
+
+    @staticmethod
+    def cacheable(query: str) -> bool:
+        return len(query) <= settings.PRODUCT_SEARCH_CACHE_MAX_LENGTH
+
+    def generation(self, tenant_id: int) -> int:
+        return self._generation.get(tenant_id, 0)
+
+    def get(
+        self, tenant_id: int, query: str, limit: int
+    ) -> list[ProductListItem] | None:
+        entries = self._entries.get(tenant_id)
+        entry = entries.get((query, limit)) if entries else None
+        if entry is None or entry[0] < time.monotonic():
+            self.misses += 1
+            return None
+        entries.move_to_end((query, limit))
+        self.hits += 1
+        return entry[1]
+
+    def put(
+        self,
+        tenant_id: int,
+        query: str,
+        limit: int,
+        products: list[ProductListItem],
+        generation: int,
+    ) -> None:
+        # An invalidation raced the search: don't cache what it returned
+        if self.generation(tenant_id) != generation:
+            return
+        entries = self._entries.setdefault(tenant_id, OrderedDict())
+        entries[(query, limit)] = (
+            time.monotonic() + settings.PRODUCT_SEARCH_CACHE_TTL,
+            products,
+        )
+        entries.move_to_end((query, limit))
+        while len(entries) > settings.PRODUCT_SEARCH_CACHE_SIZE:
+            entries.popitem(last=False)
+
+    def invalidate(self, payload: str | None = None) -> None:
+        """NOTIFY handler: payload is the tenant id, None drops every tenant"""
+        if payload is None:
+            tenants = set(self._entries) | set(self._generation)
+        else:
+            tenants = {int(payload)}
+
+        for tenant_id in tenants:
+            self._entries.pop(tenant_id, None)
+            self._generation[tenant_id] = self._generation.get(tenant_id, 0) + 1
+        self.invalidations += 1
+
+        logger.debug("Product search cache invalidated", tenants=sorted(tenants))
+
+    def stats(self) -> dict:
+        lookups = self.hits + self.misses
+        return {
+            "tenants": len(self._entries),
+            "entries": sum(len(entries) for entries in self._entries.values()),
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / lookups, 4) if lookups else None,
+            "invalidations": self.invalidations,
+        }
+
+
+product_search_cache = ProductSearchCache()
+pg_listener.subscribe(PRODUCT_CHANNEL, product_search_cache.invalidate)
+
+
+async def search_products(
+    conn: asyncpg.Connection,
+    tenant_id: int,
+    query: str | None = None,
+    limit: int = 20,
+) -> list[ProductListItem]:
+    """Exact SKU, then prefix (short queries) or ranked trigram match"""
+    raw = (query or "").strip()
+    if not raw:
+        return []
+
+    cacheable = product_search_cache.cacheable(raw)
+    if cacheable:
+        cached = product_search_cache.get(tenant_id, raw, limit)
+        if cached is not None:
+            return cached
+        generation = product_search_cache.generation(tenant_id)
+
+    rows = await statement_registry.fetch(conn, "product_search", "sku", tenant_id, raw)
+    if not rows:
+        if len(raw) < MIN_TRIGRAM_LENGTH:
+            rows = await statement_registry.fetch(
+                conn,
+                "product_search",
+                "prefix",
+                tenant_id,
+                f"{_escape_like(raw.lower())}%",
+                limit,
+            )
+        else:
+            rows = await statement_registry.fetch(
+                conn,
+                "product_search",
+                "ranked",
+                tenant_id,
+                f"%{_escape_like(raw)}%",
+                raw,
+                limit,
+            )
+
+    products = [ProductListItem(**row) for row in rows]
+    if cacheable:
+        product_search_cache.put(tenant_id, raw, limit, products, generation)
+    return products
@@ -0,0 +1,311 @@
+import asyncio
+from collections import defaultdict
+from dataclasses import dataclass, field
+from decimal import ROUND_CEILING, ROUND_FLOOR, Decimal
+
+import asyncpg
+from loguru import logger
+
+from src.api.schemas import (
+    ComponentAvailability,
+    ComponentDemand,
+    MaxProducibleQuantity,
+    ProductionBatchAvailability,
+    ProductionItemAvailability,
+    ProductQty,
+)
+from src.core.exceptions import InvalidQuantityError, NotFoundError
+from src.core.notifications import pg_listener
+from src.services.product_search import PRODUCT_CHANNEL
+
+PRODUCTION_CHANNEL = "production_changed"
+
+# BOM quantities and component stock are NUMERIC(10,3): compared as integer
+# thousandths, floor division gives exact unit counts
+QUANTITY_SCALE = 1000
+
+BOM_GRAPH_QUERY = """
+    SELECT
+        p.id AS product_id,
+        p.name AS product_name,
+        b.component_id,
+        c.name AS component_name,
+        c.current_stock,
+        b.quantity
+    FROM product AS p
+    LEFT JOIN bill_of_materials AS b ON b.product_id = p.id
+    LEFT JOIN component AS c ON c.id = b.component_id
+    WHERE p.tenant_id = $1 AND p.requires_production
+    ORDER BY p.id, b.component_id
+"""
+
+
+@dataclass
+class BomGraph:
+    """A tenant's manufactured products, their BOM and component stock"""
+
+    # product_id -> name
+    products: dict[int, str] = field(default_factory=dict)
+    # product_id -> [(component_id, quantity per unit)]
+    bom: dict[int, list[tuple[int, Decimal]]] = field(default_factory=dict)
+    # component_id -> (name, current stock)
+    components: dict[int, tuple[str, Decimal]] = field(default_factory=dict)
+    # Computed on first request, lives as long as the graph
+    max_producible: list[MaxProducibleQuantity] | None = None
+
+    @classmethod
+    def from_rows(cls, rows: list[asyncpg.Record]) -> "BomGraph":
+        graph = cls()
+        for row in rows:
+            graph.products[row["product_id"]] = row["product_name"]
+            lines = graph.bom.setdefault(row["product_id"], [])
+            if row["component_id"] is None:
+                continue
+            lines.append((row["component_id"], row["quantity"]))
+            graph.components[row["component_id"]] = (
+                row["component_name"],
+                row["current_stock"] or Decimal(0),
+            )
+        return graph
+
+
+class BomGraphCache:
+    """In-process BOM graph per tenant.
+
+    Loaded on first use and dropped when ``production_changed`` (BOM or
+    component stock) or ``product_changed`` is notified for the tenant.
+    """
+
+    def __init__(self):
+        self._graphs: dict[int, BomGraph] = {}
+        self._generation: dict[int, int] = {}
+        self._locks: dict[int, asyncio.Lock] = {}
+        self.hits = 0
+        self.loads = 0
+        self.invalidations = 0
+        self.max_producible_computations = 0
+
+    def generation(self, tenant_id: int) -> int:
+        return self._generation.get(tenant_id, 0)
+
+    async def get(self, conn: asyncpg.Connection, tenant_id: int) -> BomGraph:
+        graph = self._graphs.get(tenant_id)
+        if graph is not None:
+            self.hits += 1
+            return graph
+
+        lock = self._locks.setdefault(tenant_id, asyncio.Lock())
+        async with lock:
+            graph = self._graphs.get(tenant_id)
+            if graph is not None:
+                self.hits += 1
+                return graph
+
+            generation = self.generation(tenant_id)
+            graph = BomGraph.from_rows(await conn.fetch(BOM_GRAPH_QUERY, tenant_id))
+            self.loads += 1
+
+            # An invalidation raced the load: serve it but don't cache it
+            if self.generation(tenant_id) == generation:
+                self._graphs[tenant_id] = graph
+
+            logger.bind(tenant_id=tenant_id).debug(
+                "BOM graph loaded",
+                products=len(graph.products),
+                components=len(graph.components),
+            )
+            return graph
+
+    def invalidate(self, payload: str | None = None) -> None:
+        """NOTIFY handler: payload is the tenant id, None drops every tenant"""
+        if payload is None:
+            tenants = set(self._graphs) | set(self._generation)
+        else:
+            tenants = {int(payload)}
+
+        for tenant_id in tenants:
+            self._graphs.pop(tenant_id, None)
+            self._generation[tenant_id] = self._generation.get(tenant_id, 0) + 1
+        self.invalidations += 1
+
+        logger.debug("BOM graph invalidated", tenants=sorted(tenants))
+
+    def stats(self) -> dict:
+        return {
+            "tenants": len(self._graphs),
+            "hits": self.hits,
+            "loads": self.loads,
+            "invalidations": self.invalidations,
+            "max_producible_computations": self.max_producible_computations,
+        }
+
+
+bom_graphs = BomGraphCache()
+pg_listener.subscribe(PRODUCTION_CHANNEL, bom_graphs.invalidate)
+pg_listener.subscribe(PRODUCT_CHANNEL, bom_graphs.invalidate)
+
+
+def _availability(
+    component_id: int, name: str, available: Decimal, needed: Decimal
+) -> ComponentAvailability:
+    return ComponentAvailability(
+        component_id=component_id,
+        component_name=name,
+        available=available,
+        total_needed=needed,
+        can_produce=available >= needed,
+        missing_quantity=max(needed - available, Decimal(0)),
+    )
+
+
+async def check_production_batch(
+    conn: asyncpg.Connection, tenant_id: int, items: list[ProductQty]
+) -> ProductionBatchAvailability:
+    """Explode the BOM of every (product, quantity) pair in one pass.
+
+    Each item reports whether it could be built on its own; ``components``
+    sums the demand of the whole batch, flagging shared components whose
+    stock covers each product but not all of them together.
+    """
+    graph = await bom_graphs.get(conn, tenant_id)
+
+    demand: dict[int, Decimal] = defaultdict(Decimal)
+    largest_line: dict[int, Decimal] = defaultdict(Decimal)
+    demanded_by: dict[int, list[int]] = defaultdict(list)
+    results = []
+
+    for item in items:
+        if item.quantity <= 0:
+            raise InvalidQuantityError(quantity=item.quantity)
+        if item.product_id not in graph.products:
+            raise NotFoundError(
+                resource="Manufactured product", identifier=item.product_id
+            )
+
+        components = []
+        for component_id, per_unit in graph.bom[item.product_id]:
+            name, available = graph.components[component_id]
+            needed = per_unit * item.quantity
+            components.append(_availability(component_id, name, available, needed))
+
+            demand[component_id] += needed
+            largest_line[component_id] = max(largest_line[component_id], needed)
+            if item.product_id not in demanded_by[component_id]:
+                demanded_by[component_id].append(item.product_id)
+
+        results.append(
+            ProductionItemAvailability(
+                product_id=item.product_id,
+                product_name=graph.products[item.product_id],
+                quantity=item.quantity,
+                can_produce=all(c.can_produce for c in components),
+                components=components,
+            )
+        )
+
+    totals = []
+    for component_id, needed in demand.items():
+        name, available = graph.components[component_id]
+        availability = _availability(component_id, name, available, needed)
+        totals.append(
+            ComponentDemand(
+                **availability.model_dump(),
+                product_ids=demanded_by[component_id],
+                contended=(
+                    len(demanded_by[component_id]) > 1
+                    and largest_line[component_id] <= available < needed
+                ),
+            )
+        )
+
+    logger.bind(tenant_id=tenant_id).info(
+        "Production batch checked",
+        items=len(items),
+        components=len(totals),
+        short=sum(not c.can_produce for c in totals),
+    )
+
+    return ProductionBatchAvailability(
+        can_produce_all=all(c.can_produce for c in totals),
+        items=results,
+        components=totals,
+    )
+
+
+def _scaled(quantity: Decimal, rounding: str) -> int:
+    return int((quantity * QUANTITY_SCALE).to_integral_value(rounding=rounding))
+
+
+def compute_max_producible(graph: BomGraph) -> list[MaxProducibleQuantity]:
+    """Units of every product buildable from current stock, each on its own.
+
+    The BOM is laid out as parallel edge arrays (product row, component
+    column, scaled quantity per unit), so memory follows the number of BOM
+    lines rather than products x components. Per-unit quantities round up
+    and stock rounds down, so results never overstate what can be built.
+    """
+    import numpy as np
+
+    product_ids = list(graph.products)
+    column = {component_id: i for i, component_id in enumerate(graph.components)}
+    component_ids = list(column)
+
+    edges = [
+        (row, column[component_id], _scaled(per_unit, ROUND_CEILING))
+        for row, product_id in enumerate(product_ids)
+        for component_id, per_unit in graph.bom[product_id]
+    ]
+    results = [
+        MaxProducibleQuantity(
+            product_id=product_id,
+            product_name=graph.products[product_id],
+            max_quantity=None,
+        )
+        for product_id in product_ids
+    ]
+    if not edges:
+        return results
+
+    rows, columns, needed = np.array(edges, dtype=np.int64).T
+    stock = np.array(
+        [_scaled(stock, ROUND_FLOOR) for _, stock in graph.components.values()],
+        dtype=np.int64,
+    ).clip(min=0)
+
+    units = stock[columns] // needed
+
+    # Sort by (product, units): each product's first edge is its bottleneck
+    order = np.lexsort((units, rows))
+    products_with_bom, first = np.unique(rows[order], return_index=True)
+    bottleneck = order[first]
+
+    for row, max_quantity, col in zip(
+        products_with_bom.tolist(),
+        units[bottleneck].tolist(),
+        columns[bottleneck].tolist(),
+    ):
+        component_id = component_ids[col]
+        result = results[row]
+        result.max_quantity = max_quantity
+        result.limiting_component_id = component_id
+        result.limiting_component_name = graph.components[component_id][0]
+
+    return results
+
+
+async def get_max_producible(
+    conn: asyncpg.Connection, tenant_id: int
+) -> list[MaxProducibleQuantity]:
+    """Max producible quantity of every manufactured product.
+
+    Cached with the tenant's BOM graph, so it is recomputed only after
+    component stock, the BOM or the products change.
+    """
+    graph = await bom_graphs.get(conn, tenant_id)
+    if graph.max_producible is None:
+        graph.max_producible = compute_max_producible(graph)
+        bom_graphs.max_producible_computations += 1
+        logger.bind(tenant_id=tenant_id).debug(
+            "Max producible quantities computed", products=len(graph.products)
+        )
+    return graph.max_producible
@@ -1,14 +1,97 @@
+from itertools import chain, combinations
+
 import asyncpg
 
-from src.api.schemas import ComponentAvailability, Product
+from src.api.schemas import ComponentAvailability, ProductListItem
 from src.core.exceptions import InvalidQuantityError, NotFoundError
+from src.core.pagination import DEFAULT_PAGE_SIZE, decode_cursor, encode_cursor
+from src.core.statements import statement_registry
+
+# Listed explicitly: prepared statements must not change shape with the table
+PRODUCT_LIST_COLUMNS = """
+    id, tenant_id, name, description, sku, sale_price, category,
+    current_stock, min_stock, replacement_cost, iva_rate, supplier,
+    is_active, requires_production, concept, created_at
+"""
+
+# Optional listing filters in placeholder order ($1 is always tenant_id)
+PRODUCT_FILTERS = {
+    "is_active": "is_active = ${}",
+    "category": "category = ${}",
+    "requires_production": "requires_production = ${}",
+    "cursor": "id > ${}",
+}
+
+
+async def get_catalog_version(conn: asyncpg.Connection, tenant_id: int) -> int:
+    """Bumped by any change to the tenant's products (stock included)"""
+    version = await conn.fetchval(
+        "SELECT version FROM product_catalog_version WHERE tenant_id = $1", tenant_id
+    )
+    return version or 0
+
+
+def build_products_query(filters: frozenset[str]) -> str:
+    """Catalog page in id order ($1 = tenant_id, then PRODUCT_FILTERS, LIMIT)"""
+    conditions = ["tenant_id = $1"]
+    param_count = 1
+
+    for name, template in PRODUCT_FILTERS.items():
+        if name in filters:
+            param_count += 1
+            conditions.append(template.format(param_count))
+
+    return (
+        f"SELECT {PRODUCT_LIST_COLUMNS} FROM product"
+        f" WHERE {' AND '.join(conditions)}"
+        f" ORDER BY id LIMIT ${param_count + 1}"
+    )
+
+
+statement_registry.register(
+    "products",
+    {
+        filters: build_products_query(filters)
+        for filters in map(
+            frozenset,
+            chain.from_iterable(
+                combinations(PRODUCT_FILTERS, n)
+                for n in range(len(PRODUCT_FILTERS) + 1)
+            ),
+        )
+    },
+)
+
 
+async def get_products_list(
+    conn: asyncpg.Connection,
+    tenant_id: int,
+    is_active: bool | None = None,
+    category: str | None = None,
+    requires_production: bool | None = None,
+    cursor: str | None = None,
+    limit: int = DEFAULT_PAGE_SIZE,
+) -> dict:
+    """Page of the tenant's catalog, keyset-paginated on id"""
+    values = {
+        "is_active": is_active,
+        "category": category,
+        "requires_production": requires_production,
+        "cursor": decode_cursor(cursor, int)[0] if cursor else None,
+    }
+    filters = frozenset(name for name, value in values.items() if value is not None)
+    params = [tenant_id, *(values[name] for name in PRODUCT_FILTERS if name in filters)]
 
-async def get_products_list(conn: asyncpg.Connection, is_active: bool | None = None):
-    """Get all products, optionally filtered by is_active"""
-    if is_active is not None:
-        await conn.fetch("SELECT * FROM product WHERE is_active = $1", is_active)
-    return await conn.fetch("SELECT * FROM product")
+    rows = await statement_registry.fetch(conn, "products", filters, *params, limit + 1)
+
+    page = rows[:limit]
+    next_cursor = encode_cursor(page[-1]["id"]) if len(rows) > limit else None
+
+    return {
+        "data": [ProductListItem(**row) for row in page],
+        "next_cursor": next_cursor,
+        "limit": limit,
+    }
 
 
 async def check_production_availability(
@@ -36,19 +119,3 @@ async def check_production_availability(
         "detailed_data": row_list,
         "can_produce": all(row.can_produce for row in row_list),
     }
-
-
-async def search_products(
-    conn: asyncpg.Connection,
-    tenant_id: int,
-    query: str | None = None,
-) -> list[Product]:
-    view = await conn.fetch(
-        'SELECT * FROM product WHERE ("name" ILIKE $1 OR sku ILIKE $1) AND tenant_id = $2 LIMIT 20',
-        f"%{query}%",
-        tenant_id,
-    )
-    if view:
-        products = [Product(**row) for row in view]
-        return products
-    return []
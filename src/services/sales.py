@@ -1,53 +1,296 @@
+from datetime import datetime
+from itertools import product as cartesian
+
 import asyncpg
+from fastapi.responses import StreamingResponse
 from loguru import logger
 
-from src.api.schemas import SaleResponse
+from src.api.schemas import SaleResponse, SalesGrouping, SalesRollupResponse
+from src.core.columnar import (
+    COLUMNAR_CHUNK_SIZE,
+    COLUMNAR_MEDIA_TYPES,
+    stream_columnar,
+)
+from src.core.pagination import DEFAULT_PAGE_SIZE, decode_cursor, encode_cursor
+from src.core.statements import statement_registry
+from src.core.streaming import iter_record_batches, stream_records
+
+# Optional rollup filters, in placeholder order ($1 is always tenant_id)
+ROLLUP_FILTERS = {
+    "date_from": "r.day >= sales_day(${})",
+    "date_to": "r.day < sales_day(${})",
+}
+
+ROLLUP_TOTALS = """
+    SUM(r.quantity) AS quantity,
+    SUM(r.revenue) AS revenue,
+    SUM(r.cost) AS cost,
+    SUM(r.profit) AS profit,
+    SUM(r.line_count)::INTEGER AS line_count
+"""
+
+
+def _conditions(
+    first: str, templates: dict[str, str], filters: frozenset[str]
+) -> tuple[str, int]:
+    """WHERE clause for the filters present, and the last placeholder used"""
+    conditions = [first]
+    param_count = 1
+
+    for name, template in templates.items():
+        if name in filters:
+            placeholders = range(
+                param_count + 1, param_count + 1 + template.count("{}")
+            )
+            conditions.append(template.format(*placeholders))
+            param_count += len(placeholders)
+
+    return " AND ".join(conditions), param_count
+
+
+def _filter_sets(names) -> list[frozenset[str]]:
+    """Every subset of ``names``"""
+    return [
+        frozenset(n for n, present in zip(names, mask) if present)
+        for mask in cartesian((False, True), repeat=len(names))
+    ]
+
+
+def build_rollup_query(group_by: SalesGrouping, filters: frozenset[str]) -> str:
+    """Report over sales_daily_rollup ($1 = tenant_id, then ROLLUP_FILTERS)"""
+    where, _ = _conditions("r.tenant_id = $1", ROLLUP_FILTERS, filters)
+
+    if group_by in (SalesGrouping.DAY, SalesGrouping.WEEK, SalesGrouping.MONTH):
+        return f"""
+            SELECT date_trunc('{group_by.value}', r.day)::DATE AS period, {ROLLUP_TOTALS}
+            FROM sales_daily_rollup AS r
+            WHERE {where}
+            GROUP BY 1
+            HAVING SUM(r.line_count) > 0
+            ORDER BY 1
+        """
+
+    if group_by is SalesGrouping.PRODUCT:
+        return f"""
+            SELECT r.product_id, p.sku, p.name AS product_name, {ROLLUP_TOTALS}
+            FROM sales_daily_rollup AS r
+            JOIN product AS p ON p.id = r.product_id
+            WHERE {where}
+            GROUP BY r.product_id, p.sku, p.name
+            HAVING SUM(r.line_count) > 0
+            ORDER BY revenue DESC, r.product_id
+        """
+
+    return f"""
+        SELECT p.sku, {ROLLUP_TOTALS}
+        FROM sales_daily_rollup AS r
+        JOIN product AS p ON p.id = r.product_id
+        WHERE {where}
+        GROUP BY p.sku
+        HAVING SUM(r.line_count) > 0
+        ORDER BY revenue DESC, p.sku
+    """
+
+
+statement_registry.register(
+    "sales_rollup",
+    {
+        (group_by, filters): build_rollup_query(group_by, filters)
+        for group_by in SalesGrouping
+        for filters in _filter_sets(ROLLUP_FILTERS)
+    },
+)
+
+
+async def fetch_sales_rollup(
+    conn: asyncpg.Connection,
+    group_by: SalesGrouping,
+    tenant_id: int = 3,
+    date_from: datetime | None = None,
+    date_to: datetime | None = None,
+) -> list[SalesRollupResponse]:
+    """Sales totals per day/week/month/product/SKU from the daily rollup.
+
+    ``date_from`` / ``date_to`` are rounded to their business day
+    (``date_to`` exclusive).
+    """
+    values = {"date_from": date_from, "date_to": date_to}
+    filters = frozenset(name for name, value in values.items() if value is not None)
+    params = [values[name] for name in ROLLUP_FILTERS if name in filters]
+
+    rows = await statement_registry.fetch(
+        conn, "sales_rollup", (group_by, filters), tenant_id, *params
+    )
+    return [SalesRollupResponse(**row) for row in rows]
+
+
+async def rebuild_sales_rollup(
+    conn: asyncpg.Connection, tenant_id: int | None = None
+) -> int:
+    """Recompute the daily rollup of one tenant (None = all); returns its row count"""
+    async with conn.transaction():
+        return await conn.fetchval("SELECT rebuild_sales_daily_rollup($1)", tenant_id)
 
+
+# (expression, column kind for columnar exports)
 # Fecha | Código | Cantidad | Precio Unit | Costo | Ingreso | Costo Total | Ganancia
-# ```
+SALES_REPORT_COLUMNS = {
+    "order_date": ("o.order_date", "timestamp"),
+    "line_id": ("op.id", "int"),
+    "order_id": ("o.id", "int"),
+    "customer_id": ("o.customer_id", "int"),
+    "status": ("o.status", "text"),
+    "total_price": ("o.total_price", "decimal"),
+    "payment_method": ("o.payment_method", "text"),
+    "sku": ("p.sku", "text"),
+    "product_id": ("op.product_id", "int"),
+    "product_name": ("op.product_name", "text"),
+    "quantity": ("op.quantity", "decimal"),
+    "unit_price": ("op.unit_price", "decimal"),
+    "unit_cost": ("op.unit_cost", "decimal"),
+    "total": ("op.quantity * op.unit_price", "decimal"),
+    "total_cost": ("op.unit_cost * op.quantity", "decimal"),
+    "profit": (
+        "(op.quantity * op.unit_price) - (op.unit_cost * op.quantity)",
+        "decimal",
+    ),
+}
+
+SALES_REPORT_KINDS = {name: kind for name, (_, kind) in SALES_REPORT_COLUMNS.items()}
+
+# Optional filters in placeholder order ($1 is always tenant_id, LIMIT last)
+SALES_REPORT_FILTERS = {
+    "date_from": "o.order_date >= ${}",
+    "date_to": "o.order_date < ${}",
+    "cursor": "(o.order_date, op.id) > (${}, ${})",
+}
+
+
+def build_sales_report_query(filters: frozenset[str], paginate: bool = True) -> str:
+    """Line-item sales report, oldest first on (order_date, line id)"""
+    where, param_count = _conditions("o.tenant_id = $1", SALES_REPORT_FILTERS, filters)
+    select = ", ".join(
+        f"{expr} AS {name}" for name, (expr, _) in SALES_REPORT_COLUMNS.items()
+    )
+
+    query = f"""
+        SELECT {select}
+        FROM "order" AS o
+        JOIN order_product AS op ON op.order_id = o.id
+        JOIN product AS p ON p.id = op.product_id
+        WHERE {where}
+        ORDER BY o.order_date, op.id
+    """
+    if paginate:
+        query += f" LIMIT ${param_count + 1}"
+    return query
+
+
+statement_registry.register(
+    "sales_report",
+    {
+        filters: build_sales_report_query(filters)
+        for filters in _filter_sets(SALES_REPORT_FILTERS)
+    },
+)
+
+
+def _sales_report_params(
+    tenant_id: int,
+    date_from: datetime | None,
+    date_to: datetime | None,
+    cursor: str | None,
+) -> tuple[frozenset[str], list]:
+    """Filters present and their parameters, in SALES_REPORT_FILTERS order"""
+    values = {
+        "date_from": date_from,
+        "date_to": date_to,
+        "cursor": decode_cursor(cursor, datetime, int) if cursor else None,
+    }
+    filters = frozenset(name for name, value in values.items() if value is not None)
+
+    params: list = [tenant_id]
+    for name in SALES_REPORT_FILTERS:
+        if name == "cursor" and "cursor" in filters:
+            params.extend(values["cursor"])
+        elif name in filters:
+            params.append(values[name])
+
+    return filters, params
+
+
+def sales_report_source(
+    tenant_id: int, date_from: datetime | None, date_to: datetime | None
+) -> tuple[str, list]:
+    """Unpaginated line-item query and its parameters (streams and exports)"""
+    filters, params = _sales_report_params(tenant_id, date_from, date_to, None)
+    return build_sales_report_query(filters, paginate=False), params
 
 
 async def fetch_sales_report(
-    conn: asyncpg.Connection, tenant_id: int = 3
-) -> list[SaleResponse] | list:
-    logger.info("Fetching sales report")
-    log = logger.bind(tenant_id=tenant_id)
+    conn: asyncpg.Connection,
+    tenant_id: int = 3,
+    date_from: datetime | None = None,
+    date_to: datetime | None = None,
+    cursor: str | None = None,
+    limit: int = DEFAULT_PAGE_SIZE,
+) -> dict:
+    """Page of sale line items, keyset-paginated on (order_date, line id).
 
-    view = await conn.fetch(
-        """
-    SELECT
-        ORDER_DATE,
-        CUSTOMER_ID,
-        STATUS,
-        TOTAL_PRICE,
-        PAYMENT_METHOD,
-        P.SKU,
-        OP.PRODUCT_ID,
-        OP.PRODUCT_NAME,
-        OP.QUANTITY,
-        OP.UNIT_PRICE,
-        OP.UNIT_COST,
-        OP.QUANTITY * OP.UNIT_PRICE AS TOTAL,
-        OP.UNIT_COST * OP.QUANTITY AS TOTAL_COST,
-        (OP.QUANTITY * OP.UNIT_PRICE) - (OP.UNIT_COST * OP.QUANTITY) AS PROFIT
-    FROM
-        "order" AS O
-        JOIN ORDER_PRODUCT AS OP ON OP.ORDER_ID = O.ID
-        JOIN PRODUCT AS P ON OP.PRODUCT_ID = P.ID
-    WHERE
-        O.TENANT_ID = $1
-    ORDER BY
-        P.ID
-    """,
-        tenant_id,
+    ``date_to`` is exclusive.
+    """
+    log = logger.bind(tenant_id=tenant_id, date_from=date_from, date_to=date_to)
+    log.info("Fetching sales report")
+
+    filters, params = _sales_report_params(tenant_id, date_from, date_to, cursor)
+    rows = await statement_registry.fetch(
+        conn, "sales_report", filters, *params, limit + 1
+    )
+
+    page = rows[:limit]
+    next_cursor = (
+        encode_cursor(page[-1]["order_date"], page[-1]["line_id"])
+        if len(rows) > limit
+        else None
     )
 
-    if not view:
+    if not page:
         log.warning("Sales not found")
-        return []
 
-    sales_data = [SaleResponse(**row) for row in view]
+    sales_data = [SaleResponse(**row) for row in page]
+
+    log.info(
+        "Sales fetched successfully",
+        items_count=len(sales_data),
+        has_more=next_cursor is not None,
+    )
+
+    return {"data": sales_data, "next_cursor": next_cursor, "limit": limit}
+
+
+def stream_sales_report(
+    conn: asyncpg.Connection,
+    fmt: str,
+    tenant_id: int = 3,
+    date_from: datetime | None = None,
+    date_to: datetime | None = None,
+) -> StreamingResponse:
+    """Every matching sale line item as NDJSON/CSV/Parquet/Arrow, read
+    through a server-side cursor"""
+    logger.bind(tenant_id=tenant_id).info("Streaming sales report", format=fmt)
+
+    query, params = sales_report_source(tenant_id, date_from, date_to)
 
-    log.info("Sales fetched successfully", items_count=len(sales_data))
+    if fmt in COLUMNAR_MEDIA_TYPES:
+        batches = iter_record_batches(
+            conn, query, *params, chunk_size=COLUMNAR_CHUNK_SIZE
+        )
+        return stream_columnar(
+            batches,
+            SALES_REPORT_KINDS,
+            fmt,
+            filename="ventas",
+        )
 
-    return sales_data
+    batches = iter_record_batches(conn, query, *params)
+    return stream_records(batches, tuple(SALES_REPORT_COLUMNS), fmt, filename="ventas")
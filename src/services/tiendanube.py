@@ -1,3 +1,7 @@
+import asyncio
+import math
+from datetime import datetime, timedelta, timezone
+
 import asyncpg
 import httpx
 from fastapi import HTTPException
@@ -6,95 +10,256 @@ from pydantic import ValidationError
 
 from src.api.schemas import TiendaNubeProductDB, TiendaNubeVariantDB
 from src.api.schemas.tiendanube import TiendaNubeProduct, Variant
-from src.repositories import save_products_batch, save_variant_batch
+from src.core.config import settings
+from src.core.http_clients import http_clients
+from src.repositories import (
+    get_sync_watermark,
+    save_products_batch,
+    save_sync_watermark,
+    save_variant_batch,
+)
 
 
-async def _fetch_products_in_batches(
-    store_id: str, access_token: str, batch_size: int = 50, tenant_id: int = 2
-):
-    products_batch = []
-    variants_batch = []
-    page = 1
+TIENDANUBE_API_URL = "https://api.tiendanube.com/v1"
+TIENDANUBE_USER_AGENT = "TALOS ERP (tomasgilamoedo@gmail.com)"
+
+# Shared, lifespan-managed client (src/core/http_clients.py)
+TIENDANUBE_CLIENT = "tiendanube"
+http_clients.register(TIENDANUBE_CLIENT)
+
+
+def _last_page(response: httpx.Response, per_page: int) -> int | None:
+    """Page count from X-Total-Count, else from the Link header (rel=last).
+
+    None when only a "next" link says there is more: the count is unknown.
+    """
+    total = response.headers.get("X-Total-Count")
+    if total is not None:
+        return max(math.ceil(int(total) / per_page), 1)
+
+    last = response.links.get("last", {}).get("url")
+    if last:
+        return int(httpx.URL(last).params.get("page", 1))
+
+    return None if "next" in response.links else 1
 
-    async with httpx.AsyncClient() as client:
-        while True:
+
+def _has_next_page(response: httpx.Response, per_page: int) -> bool:
+    """Without a page count: go on while pages link to a next one or are full"""
+    products = response.json()
+    return bool(products) and ("next" in response.links or len(products) >= per_page)
+
+
+async def _get_products_page(
+    client: httpx.AsyncClient,
+    store_id: str,
+    access_token: str,
+    page: int,
+    per_page: int,
+    semaphore: asyncio.Semaphore,
+    updated_since: datetime | None = None,
+) -> httpx.Response | None:
+    """One page of products; None past the last page (TiendaNube answers 404)"""
+    params = {"page": page, "per_page": per_page}
+    if updated_since is not None:
+        params["updated_at_min"] = updated_since.isoformat()
+
+    for attempt in range(settings.TIENDANUBE_MAX_RETRIES + 1):
+        async with semaphore:
             response = await client.get(
-                f"https://api.tiendanube.com/v1/{store_id}/products",
-                params={"page": page, "per_page": 30},
+                f"{TIENDANUBE_API_URL}/{store_id}/products",
+                params=params,
                 headers={
                     "Authentication": f"bearer {access_token}",
-                    "User-Agent": "TALOS ERP (tomasgilamoedo@gmail.com)",
+                    "User-Agent": TIENDANUBE_USER_AGENT,
                 },
             )
 
-            logger.info(f"Response headers: {response.headers}")
-            logger.info(f"Total products: {response.headers.get('X-Total-Count')}")
-            logger.info(f"Link header: {response.headers.get('Link')}")
+        if response.status_code == 404:
+            return None
 
-            if response.status_code == 404:
-                break
+        if response.status_code == 429 and attempt < settings.TIENDANUBE_MAX_RETRIES:
+            # x-rate-limit-reset: milliseconds until the bucket has room again
+            reset_ms = int(response.headers.get("x-rate-limit-reset", 1000))
+            logger.warning("TiendaNube rate limited", page=page, retry_in_ms=reset_ms)
+            await asyncio.sleep(reset_ms / 1000)
+            continue
 
-            if response.status_code != 200:
-                logger.error(f"TiendaNube API error: {response.status_code}")
-                raise HTTPException(
-                    status_code=502, detail="Failed to fetch products from TiendaNube"
-                )
+        if response.status_code != 200:
+            logger.error(f"TiendaNube API error: {response.status_code}", page=page)
+            raise HTTPException(
+                status_code=502, detail="Failed to fetch products from TiendaNube"
+            )
 
-            raw_products = response.json()
-
-            # Parse and Transform:
-            products = []
-            variants = []
-            for p in raw_products:
-                try:
-                    products.append(TiendaNubeProduct(**p))
-                    variants.append([Variant(**var) for var in p.get("variants", [])])
-                except ValidationError as e:
-                    logger.warning(
-                        "Validation error", id=p["id"], errors_list=e.errors()
-                    )
-                    continue
+        return response
+
+    raise HTTPException(
+        status_code=502, detail="Failed to fetch products from TiendaNube"
+    )
+
+
+def _parse_products(
+    raw_products: list[dict], tenant_id: int
+) -> list[tuple[TiendaNubeProductDB, list[TiendaNubeVariantDB]]]:
+    parsed = []
+    for p in raw_products:
+        try:
+            product = TiendaNubeProduct(**p)
+            variants = [Variant(**var) for var in p.get("variants", [])]
+        except ValidationError as e:
+            logger.warning("Validation error", id=p["id"], errors_list=e.errors())
+            continue
 
-            db_products = [
+        parsed.append(
+            (
                 TiendaNubeProductDB.from_tiendanube_response(
-                    tn_product=prod, tenant_id=tenant_id
-                )
-                for prod in products
-            ]
-            db_variants = [
+                    tn_product=product, tenant_id=tenant_id
+                ),
                 [
                     TiendaNubeVariantDB.from_tiendanube_variant(
                         variant=v, tenant_id=tenant_id
                     )
-                    for v in variant_list
-                ]
-                for variant_list in variants
-            ]
+                    for v in variants
+                ],
+            )
+        )
+    return parsed
+
 
-            for i, db_product in enumerate(db_products):
-                products_batch.append(db_product)
+async def _fetch_products_in_batches(
+    store_id: str,
+    access_token: str,
+    batch_size: int = 50,
+    tenant_id: int = 2,
+    updated_since: datetime | None = None,
+):
+    """Yield (products, variants) batches of the catalog, or only of the
+    products updated since ``updated_since``.
 
-                variants_batch.extend(db_variants[i])
+    Page 1 tells how many pages there are (X-Total-Count / Link); the rest
+    are requested concurrently, at most TIENDANUBE_MAX_CONCURRENCY at a
+    time, and batched in whatever order they arrive. If the API gives no
+    page count, pages are followed one by one until the last.
+    """
+    per_page = settings.TIENDANUBE_PAGE_SIZE
+    semaphore = asyncio.Semaphore(settings.TIENDANUBE_MAX_CONCURRENCY)
+    products_batch = []
+    variants_batch = []
+
+    client = http_clients.get(TIENDANUBE_CLIENT)
+    first = await _get_products_page(
+        client, store_id, access_token, 1, per_page, semaphore, updated_since
+    )
+    if first is None:
+        return
+
+    last_page = _last_page(first, per_page)
+    logger.info(
+        "Fetching TiendaNube products",
+        total=first.headers.get("X-Total-Count"),
+        pages=last_page,
+        updated_since=updated_since,
+    )
+
+    tasks = [
+        asyncio.create_task(
+            _get_products_page(
+                client, store_id, access_token, page, per_page, semaphore, updated_since
+            )
+        )
+        for page in range(2, (last_page or 1) + 1)
+    ]
+
+    async def pages():
+        yield first
+        for task in asyncio.as_completed(tasks):
+            yield await task
+
+        if last_page is None:
+            response, page = first, 1
+            while response is not None and _has_next_page(response, per_page):
+                page += 1
+                response = await _get_products_page(
+                    client,
+                    store_id,
+                    access_token,
+                    page,
+                    per_page,
+                    semaphore,
+                    updated_since,
+                )
+                yield response
+
+    try:
+        async for response in pages():
+            if response is None:
+                continue
+
+            for product, variants in _parse_products(response.json(), tenant_id):
+                products_batch.append(product)
+                variants_batch.extend(variants)
 
                 if len(products_batch) >= batch_size:
                     yield (products_batch, variants_batch)
                     products_batch = []
                     variants_batch = []
+    finally:
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
 
-            page += 1
-
-        # Yield last partial batch
-        if products_batch:
-            yield (products_batch, variants_batch)
+    # Yield last partial batch
+    if products_batch:
+        yield (products_batch, variants_batch)
 
 
 async def sync_products_from_tiendanube(
-    store_id: str, access_token: str, conn: asyncpg.Connection
+    store_id: str,
+    access_token: str,
+    conn: asyncpg.Connection,
+    tenant_id: int = 2,
+    full: bool = False,
 ):
+    """Upsert the store's products into tiendanube_product(_variant).
+
+    Incremental by default: only products updated since the tenant's last
+    successful sync are requested (``updated_at_min``, moved back by
+    TIENDANUBE_SYNC_OVERLAP for clock skew). The first sync, or ``full``,
+    downloads the whole catalog. The watermark is the start of this sync,
+    saved only once every batch is stored, so a failed run is retried from
+    the old one. Products deleted in TiendaNube are not detected either way.
+    """
+    started_at = datetime.now(timezone.utc)
+    watermark = None if full else await get_sync_watermark(tenant_id, conn)
+    updated_since = (
+        watermark - timedelta(seconds=settings.TIENDANUBE_SYNC_OVERLAP)
+        if watermark is not None
+        else None
+    )
+    synced = 0
+
     async for products, variants in _fetch_products_in_batches(
-        store_id=store_id, access_token=access_token, batch_size=50
+        store_id=store_id,
+        access_token=access_token,
+        batch_size=50,
+        tenant_id=tenant_id,
+        updated_since=updated_since,
     ):
         await save_products_batch(products=products, conn=conn)
         await save_variant_batch(variants=variants, conn=conn)
+        synced += len(products)
+
+    await save_sync_watermark(tenant_id, started_at, watermark is None, conn)
+
+    mode = "full" if watermark is None else "incremental"
+    logger.bind(tenant_id=tenant_id).info(
+        "TiendaNube products synced", mode=mode, products=synced
+    )
 
-    return {"status": "success", "synced": True}
+    return {
+        "status": "success",
+        "synced": True,
+        "mode": mode,
+        "products": synced,
+        "updated_since": updated_since,
+    }
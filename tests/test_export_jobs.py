@@ -0,0 +1,124 @@
+import asyncio
+import os
+import time
+
+import pytest
+
+from src.api.schemas import (
+    ExportCompression,
+    ExportFormat,
+    ExportJobStatus,
+    ExportKind,
+)
+from src.core.config import settings
+from src.services.export_jobs import ExportJobManager
+
+WATERMARK = "12/3"
+
+
+class FakeConn:
+    def __init__(self, release: asyncio.Event | None = None):
+        self.release = release
+
+    async def fetchval(self, query, tenant_id):
+        if self.release is not None:
+            await self.release.wait()
+        return WATERMARK
+
+
+class FakePool:
+    def __init__(self, conn: FakeConn):
+        self.conn = conn
+
+    def acquire(self):
+        pool = self
+
+        class Acquire:
+            async def __aenter__(self):
+                return pool.conn
+
+            async def __aexit__(self, *exc):
+                return False
+
+        return Acquire()
+
+
+@pytest.fixture
+def manager(monkeypatch, tmp_path) -> ExportJobManager:
+    monkeypatch.setattr(settings, "EXPORT_ARTIFACT_TTL", 60)
+    manager = ExportJobManager()
+    manager.directory = tmp_path
+    return manager
+
+
+def age(path, seconds: float) -> None:
+    mtime = time.time() - seconds
+    os.utime(path, (mtime, mtime))
+
+
+async def submit(manager: ExportJobManager):
+    return await manager.submit(
+        ExportKind.INVENTORY, 3, ExportFormat.CSV, ExportCompression.NONE
+    )
+
+
+def test_finished_jobs_prune_expired_files_when_due(monkeypatch, manager, tmp_path):
+    monkeypatch.setattr(settings, "EXPORT_PRUNE_INTERVAL", 0)
+
+    async def run():
+        await manager.start(FakePool(FakeConn()))
+        stale = [tmp_path / "inventario-3-old.csv", tmp_path / "jobs" / "old.json"]
+        for path in stale:
+            path.write_text("old")
+            age(path, 120)
+
+        job = await submit(manager)
+        # Served from an existing artifact: nothing to encode
+        (tmp_path / manager._artifact_name(job, WATERMARK)).write_text("id\n")
+        await asyncio.gather(*manager._tasks)
+        return job, stale
+
+    job, stale = asyncio.run(run())
+
+    assert manager.get(job.id).status == ExportJobStatus.DONE
+    assert manager.get(job.id).cached
+    assert not any(path.exists() for path in stale)
+    assert manager.stats()["pruned"] == 2
+
+
+def test_pruning_is_throttled(monkeypatch, manager, tmp_path):
+    monkeypatch.setattr(settings, "EXPORT_PRUNE_INTERVAL", 3600)
+
+    async def run():
+        await manager.start(FakePool(FakeConn()))
+        expired = tmp_path / "inventario-3-old.csv"
+        expired.write_text("old")
+        age(expired, 120)
+
+        job = await submit(manager)
+        (tmp_path / manager._artifact_name(job, WATERMARK)).write_text("id\n")
+        await asyncio.gather(*manager._tasks)
+        return expired
+
+    expired = asyncio.run(run())
+
+    # Pruned on start; the next prune is an hour away
+    assert expired.exists()
+    assert manager.stats()["pruned"] == 0
+
+
+def test_jobs_cancelled_on_shutdown_count_as_failed(manager):
+    async def run():
+        await manager.start(FakePool(FakeConn(release=asyncio.Event())))
+        job = await submit(manager)
+        await asyncio.sleep(0)  # Let the job reach the watermark query
+        await manager.stop()
+        return job
+
+    job = asyncio.run(run())
+
+    saved = manager.get(job.id)
+    assert saved.status == ExportJobStatus.FAILED
+    assert saved.error == "Cancelled on shutdown"
+    stats = manager.stats()
+    assert (stats["failed"], stats["cancelled"], stats["completed"]) == (1, 1, 0)
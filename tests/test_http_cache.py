@@ -0,0 +1,102 @@
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from src.api.routes import products as product_routes
+from src.core.database import get_conn
+from src.core.http_cache import etag_matches, make_etag
+
+ETAG = make_etag("3.7", None, "Tortas", None, None, 50)
+
+
+def test_etag_is_weak_and_carries_the_version():
+    assert ETAG.startswith('W/"3.7-')
+    assert ETAG.endswith('"')
+
+
+def test_etag_depends_on_version_and_variant():
+    assert make_etag("3.7", None, "Tortas", None, None, 50) == ETAG
+    assert make_etag("3.8", None, "Tortas", None, None, 50) != ETAG
+    assert make_etag("3.7", None, "Panes", None, None, 50) != ETAG
+    assert make_etag("3.7", None, "Tortas", None, "cursor", 50) != ETAG
+
+
+@pytest.mark.parametrize(
+    "if_none_match",
+    [
+        ETAG,
+        ETAG.removeprefix("W/"),  # Weak comparison ignores W/
+        "*",
+        " * ",
+        f'W/"other", {ETAG}',
+        f'"other",{ETAG.removeprefix("W/")} , W/"more"',
+    ],
+)
+def test_matching_if_none_match(if_none_match):
+    assert etag_matches(if_none_match, ETAG)
+
+
+@pytest.mark.parametrize(
+    "if_none_match",
+    [
+        None,
+        "",
+        'W/"other"',
+        'W/"other", "another"',
+        make_etag("3.8", None, "Tortas", None, None, 50),
+        ETAG[:-2] + '"',  # Prefix of the tag
+        "*, " + 'W/"other"',  # * only counts on its own
+    ],
+)
+def test_non_matching_if_none_match(if_none_match):
+    assert not etag_matches(if_none_match, ETAG)
+
+
+@pytest.fixture
+def client(monkeypatch):
+    catalog = {"version": 1, "listings": 0}
+
+    async def get_catalog_version(conn, tenant_id):
+        return catalog["version"]
+
+    async def get_products_list(conn, **filters):
+        catalog["listings"] += 1
+        return {"data": [], "next_cursor": None, "limit": filters["limit"]}
+
+    monkeypatch.setattr(product_routes, "get_catalog_version", get_catalog_version)
+    monkeypatch.setattr(product_routes, "get_products_list", get_products_list)
+
+    app = FastAPI()
+    app.include_router(product_routes.router)
+    app.dependency_overrides[get_conn] = lambda: None
+
+    client = TestClient(app)
+    client.catalog = catalog
+    return client
+
+
+def test_listing_revalidates_to_304_until_the_catalog_changes(client):
+    first = client.get("/products", params={"category": "Tortas"})
+    assert first.status_code == 200
+    assert first.headers["cache-control"] == "no-cache"
+    etag = first.headers["etag"]
+
+    cached = client.get(
+        "/products", params={"category": "Tortas"}, headers={"If-None-Match": etag}
+    )
+    assert cached.status_code == 304
+    assert cached.headers["etag"] == etag
+    assert cached.content == b""
+    assert client.catalog["listings"] == 1
+
+    other_page = client.get(
+        "/products", params={"category": "Panes"}, headers={"If-None-Match": etag}
+    )
+    assert other_page.status_code == 200
+
+    client.catalog["version"] += 1
+    changed = client.get(
+        "/products", params={"category": "Tortas"}, headers={"If-None-Match": etag}
+    )
+    assert changed.status_code == 200
+    assert changed.headers["etag"] != etag
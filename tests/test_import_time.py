@@ -0,0 +1,32 @@
+import pytest
+
+from benchmarks.import_time import DEFAULT_BUDGET, LAZY_MODULES, profile_import
+
+RUNS = 3
+
+
+@pytest.fixture(scope="module")
+def import_profile() -> list[tuple[str, int, int]]:
+    """Fastest of RUNS ``-X importtime`` profiles of src.main (the required
+    settings come from conftest)"""
+    runs = [profile_import("src.main") for _ in range(RUNS)]
+    return min(
+        runs,
+        key=lambda rows: next(cum for name, _, cum in rows if name == "src.main"),
+    )
+
+
+def test_import_within_budget(import_profile):
+    seconds = next(cum for name, _, cum in import_profile if name == "src.main") / 1e6
+    slowest = sorted(import_profile, key=lambda row: row[2], reverse=True)[:5]
+
+    assert seconds <= DEFAULT_BUDGET, (
+        f"import src.main took {seconds:.3f}s, budget is {DEFAULT_BUDGET:.3f}s; "
+        f"slowest: {[(name, round(cum / 1000, 1)) for name, _, cum in slowest]}"
+    )
+
+
+def test_heavy_modules_are_lazy(import_profile):
+    imported = {name.split(".")[0] for name, _, _ in import_profile}
+
+    assert not imported & set(LAZY_MODULES)
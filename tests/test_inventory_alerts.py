@@ -0,0 +1,143 @@
+import asyncio
+import signal
+import threading
+
+import pytest
+
+from src.core.streaming import ExitSignalHook
+from src.services import inventory_alerts
+from src.services.inventory_alerts import CLOSE, LowStockAlertHub
+
+
+class ServerHandler:
+    """Stands in for uvicorn's ``handle_exit``"""
+
+    def __init__(self):
+        self.signals: list[int] = []
+
+    def __call__(self, signum, frame) -> None:
+        self.signals.append(signum)
+
+
+@pytest.fixture
+def server_handler():
+    handler = ServerHandler()
+    original = {sig: signal.getsignal(sig) for sig in ExitSignalHook.SIGNALS}
+    for sig in ExitSignalHook.SIGNALS:
+        signal.signal(sig, handler)
+    yield handler
+    for sig, previous in original.items():
+        signal.signal(sig, previous)
+
+
+def drain(queue: asyncio.Queue) -> list:
+    return [queue.get_nowait() for _ in range(queue.qsize())]
+
+
+def test_exit_signal_closes_streams_and_still_reaches_the_server(server_handler):
+    hub = LowStockAlertHub()
+
+    async def run():
+        hub.start()
+        queue = hub.subscribe()
+        hub.publish('{"alert_id": 1}')
+        signal.raise_signal(signal.SIGTERM)
+        await asyncio.sleep(0)  # The close runs on the loop
+        return queue
+
+    queue = asyncio.run(run())
+
+    assert server_handler.signals == [signal.SIGTERM]
+    assert drain(queue) == [CLOSE]
+    assert drain(hub.subscribe()) == [CLOSE]  # Late subscribers too
+
+
+def test_stop_restores_the_server_handlers(server_handler):
+    hub = LowStockAlertHub()
+
+    async def run():
+        hub.start()
+        assert signal.getsignal(signal.SIGINT) != server_handler
+        await hub.stop()
+
+    asyncio.run(run())
+
+    for sig in ExitSignalHook.SIGNALS:
+        assert signal.getsignal(sig) is server_handler
+
+
+def test_a_handler_installed_later_is_left_in_place(server_handler):
+    hub = LowStockAlertHub()
+    outer = ServerHandler()
+
+    async def run():
+        hub.start()
+        hook = signal.getsignal(signal.SIGINT)
+        signal.signal(signal.SIGINT, lambda s, f: (outer(s, f), hook(s, f)))
+        await hub.stop()
+        signal.raise_signal(signal.SIGINT)
+
+    asyncio.run(run())
+
+    # Still chained through the inactive hook, without closing anything
+    assert outer.signals == server_handler.signals == [signal.SIGINT]
+    assert signal.getsignal(signal.SIGTERM) is server_handler
+
+
+def test_hook_is_not_installed_outside_the_main_thread(server_handler):
+    hook = ExitSignalHook(lambda: None)
+    thread = threading.Thread(target=lambda: asyncio.run(_install(hook)))
+    thread.start()
+    thread.join()
+
+    assert not hook.active
+    assert signal.getsignal(signal.SIGTERM) is server_handler
+
+
+async def _install(hook: ExitSignalHook) -> None:
+    hook.install()
+
+
+def test_publish_after_close_keeps_the_close_marker(monkeypatch):
+    monkeypatch.setattr(inventory_alerts.settings, "ALERT_STREAM_QUEUE_SIZE", 1)
+    hub = LowStockAlertHub()
+    queue = hub.subscribe()
+
+    hub.close()
+    hub.publish('{"alert_id": 1}')
+    hub.publish(None)
+
+    assert drain(queue) == [CLOSE]
+    assert hub.stats()["published"] == 0
+
+
+class FakeRequest:
+    async def is_disconnected(self) -> bool:
+        return False
+
+
+def test_stream_ends_when_the_hub_closes(monkeypatch):
+    hub = LowStockAlertHub()
+    monkeypatch.setattr(inventory_alerts, "low_stock_alerts", hub)
+
+    async def snapshot(pool):
+        return "event: snapshot\ndata: []\n\n"
+
+    monkeypatch.setattr(inventory_alerts, "_snapshot", snapshot)
+
+    async def run():
+        stream = inventory_alerts.stream_low_stock_alerts(None, FakeRequest())
+        events = [await anext(stream)]
+        hub.publish('{"alert_id": 1}')
+        events.append(await anext(stream))
+        hub.close()
+        events += [event async for event in stream]
+        return events
+
+    events = asyncio.run(run())
+
+    assert events == [
+        "event: snapshot\ndata: []\n\n",
+        'id: 1\nevent: alert\ndata: {"alert_id": 1}\n\n',
+    ]
+    assert hub.stats()["subscribers"] == 0
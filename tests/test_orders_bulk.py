@@ -0,0 +1,126 @@
+import asyncio
+import json
+
+import pytest
+
+from src.core.exceptions import InvalidPayloadError
+from src.services.orders_bulk import _stage_records, iter_bulk_payloads
+
+ORDER = {"payment_method": "cash", "items": [{"product_id": 1, "quantity": 2}]}
+
+
+async def _chunks(*chunks: bytes):
+    for chunk in chunks:
+        yield chunk
+
+
+async def _collect(iterator) -> list:
+    return [item async for item in iterator]
+
+
+def payloads(content_type: str, *chunks: bytes) -> list[tuple[int, object]]:
+    return asyncio.run(_collect(iter_bulk_payloads(_chunks(*chunks), content_type)))
+
+
+def stage(*rows: object) -> tuple[list[tuple], list[dict]]:
+    errors: list[dict] = []
+
+    async def numbered():
+        for row_no, payload in enumerate(rows, start=1):
+            yield row_no, payload
+
+    records = asyncio.run(_collect(_stage_records(numbered(), errors)))
+    return records, errors
+
+
+def test_json_array_rows_are_numbered_from_one():
+    body = json.dumps([ORDER, {"payment_method": "card", "items": []}]).encode()
+
+    rows = payloads("application/json", body[:10], body[10:])
+
+    assert [row_no for row_no, _ in rows] == [1, 2]
+    assert rows[0][1] == ORDER
+
+
+@pytest.mark.parametrize(
+    "body, message",
+    [(b"[{", "Invalid JSON body"), (json.dumps(ORDER).encode(), "JSON array")],
+)
+def test_json_body_must_be_an_array(body, message):
+    with pytest.raises(InvalidPayloadError) as exc_info:
+        payloads("application/json", body)
+
+    assert message in str(exc_info.value)
+
+
+@pytest.mark.parametrize(
+    "content_type",
+    ["application/x-ndjson", "application/ndjson; charset=utf-8", "application/jsonl"],
+)
+def test_ndjson_is_detected_from_the_content_type(content_type):
+    body = (json.dumps(ORDER) + "\n" + json.dumps(ORDER)).encode()
+
+    assert payloads(content_type, body) == [(1, ORDER), (2, ORDER)]
+
+
+def test_ndjson_lines_split_across_chunks_and_blank_lines():
+    line = json.dumps(ORDER).encode()
+    body = b"\n" + line + b"\r\n  \n" + line + b"\n\n"
+
+    rows = payloads(
+        "application/x-ndjson", *(body[i : i + 7] for i in range(0, len(body), 7))
+    )
+
+    # Blank lines are skipped without using up a row number
+    assert rows == [(1, ORDER), (2, ORDER)]
+
+
+def test_malformed_ndjson_lines_do_not_stop_the_stream():
+    line = json.dumps(ORDER).encode()
+    body = line + b"\n{not json\n" + line  # Last line without a newline
+
+    assert payloads("application/x-ndjson", body) == [(1, ORDER), (2, None), (3, ORDER)]
+
+
+def test_valid_orders_become_copy_records():
+    order = {**ORDER, "customer_id": 5, "notes": "Retira a las 18"}
+
+    records, errors = stage(order)
+
+    assert errors == []
+    row_no, customer_id, payment_method, notes, items = records[0]
+    assert (row_no, customer_id, payment_method, notes) == (
+        1,
+        5,
+        "cash",
+        "Retira a las 18",
+    )
+    assert json.loads(items) == [{"product_id": 1, "quantity": 2}]
+
+
+def test_invalid_rows_are_reported_per_row():
+    records, errors = stage(
+        ORDER,
+        None,
+        {"payment_method": "barter", "items": []},
+        {"payment_method": "cash", "items": []},
+        {
+            "payment_method": "cash",
+            "items": [
+                {"product_id": 1, "quantity": 0},
+                {"product_id": 2, "quantity": 1},
+                {"product_id": 3, "quantity": -4},
+            ],
+        },
+        ORDER,
+    )
+
+    assert [record[0] for record in records] == [1, 6]
+    by_row = {error["row"]: error["errors"] for error in errors}
+    assert by_row[2] == ["Invalid JSON"]
+    assert any(message.startswith("payment_method:") for message in by_row[3])
+    assert by_row[4] == ["Order has no items"]
+    assert by_row[5] == [
+        "Invalid quantity for product 1 (must be > 0)",
+        "Invalid quantity for product 3 (must be > 0)",
+    ]
@@ -0,0 +1,116 @@
+import asyncio
+import base64
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+from src.core.exceptions import InvalidQueryError
+from src.core.pagination import decode_cursor, encode_cursor, parse_fields
+from src.services.orders import (
+    ORDER_COLUMNS,
+    _order_filter_params,
+    build_orders_query,
+    fetch_orders,
+)
+
+NOW = datetime(2026, 3, 1, 12, 30, tzinfo=timezone.utc)
+
+
+def test_cursor_round_trip():
+    cursor = encode_cursor(NOW, 42)
+
+    assert "=" not in cursor
+    assert decode_cursor(cursor, datetime, int) == (NOW, 42)
+
+
+@pytest.mark.parametrize(
+    "cursor",
+    [
+        "not base64 at all!",
+        base64.urlsafe_b64encode(b"{not json").decode(),
+        encode_cursor(NOW.isoformat()),  # Too few values
+        encode_cursor(NOW, 1, 2),  # Too many values
+        encode_cursor("yesterday", 1),
+        encode_cursor(NOW, "one"),
+    ],
+)
+def test_malformed_cursor_is_a_query_error(cursor):
+    with pytest.raises(InvalidQueryError) as exc_info:
+        decode_cursor(cursor, datetime, int)
+
+    assert exc_info.value.parameter == "cursor"
+
+
+def test_parse_fields_defaults_to_every_column():
+    assert parse_fields(None, ORDER_COLUMNS, ("id", "order_date")) == ORDER_COLUMNS
+    assert parse_fields("", ORDER_COLUMNS, ("id", "order_date")) == ORDER_COLUMNS
+
+
+def test_parse_fields_adds_required_fields_in_table_order():
+    columns = parse_fields(" status ,total_price,", ORDER_COLUMNS, ("id", "order_date"))
+
+    assert set(columns) == {"id", "order_date", "status", "total_price"}
+    assert list(columns) == [c for c in ORDER_COLUMNS if c in columns]
+
+
+def test_parse_fields_rejects_unknown_fields():
+    with pytest.raises(InvalidQueryError) as exc_info:
+        parse_fields("id,password,secret", ORDER_COLUMNS, ("id",))
+
+    assert exc_info.value.parameter == "fields"
+    assert "password, secret" in str(exc_info.value)
+
+
+def test_cursor_filter_continues_a_newest_first_listing():
+    filters, params = _order_filter_params(
+        3, None, None, 7, None, None, encode_cursor(NOW, 42)
+    )
+    query = build_orders_query(("id", "order_date"), filters)
+
+    assert params == [3, 7, NOW, 42]
+    assert "customer_id = $2" in query
+    assert "(order_date, id) < ($3, $4)" in query
+    assert query.endswith("ORDER BY order_date DESC, id DESC LIMIT $5")
+
+
+class FakeOrdersConn:
+    """Runs the listing's keyset predicate over in-memory rows"""
+
+    def __init__(self, rows: list[dict]):
+        self.rows = rows
+
+    async def fetch(self, query: str, *params):
+        tenant_id, *rest, limit = params
+        assert "tenant_id = $1" in query
+        rows = [r for r in self.rows if r["tenant_id"] == tenant_id]
+        if "(order_date, id) <" in query:
+            cursor = tuple(rest[-2:])
+            rows = [r for r in rows if (r["order_date"], r["id"]) < cursor]
+        rows.sort(key=lambda r: (r["order_date"], r["id"]), reverse=True)
+        return rows[:limit]
+
+
+def test_pages_cover_every_order_once_newest_first():
+    # Shared timestamps: the id breaks the tie
+    rows = [
+        {"id": i, "order_date": NOW - timedelta(minutes=i // 3), "tenant_id": 3}
+        for i in range(1, 24)
+    ] + [{"id": 100, "order_date": NOW, "tenant_id": 4}]
+    conn = FakeOrdersConn(rows)
+
+    seen, cursor = [], None
+    while True:
+        page = asyncio.run(
+            fetch_orders(conn, None, None, None, 3, cursor=cursor, limit=5, fields="id")
+        )
+        seen.extend(row["id"] for row in page["data"])
+        cursor = page["next_cursor"]
+        if cursor is None:
+            break
+
+    expected = sorted(
+        (r for r in rows if r["tenant_id"] == 3),
+        key=lambda r: (r["order_date"], r["id"]),
+        reverse=True,
+    )
+    assert seen == [r["id"] for r in expected]
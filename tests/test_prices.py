@@ -0,0 +1,185 @@
+import asyncio
+from decimal import Decimal
+from types import SimpleNamespace
+
+import pytest
+
+from src.core.config import settings
+from src.core.exceptions import NotFoundError
+from src.services import prices
+from src.services.prices import PriceCache
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+class FakeProducts:
+    """Stands in for the prepared ``prices/by_id`` statement"""
+
+    def __init__(self):
+        self.prices: dict[tuple[int, int], Decimal] = {}
+        self.queries: list[tuple[int, list[int]]] = []
+        self.during_load = None
+
+    def set(self, tenant_id: int, product_id: int, price: str) -> None:
+        self.prices[(tenant_id, product_id)] = Decimal(price)
+
+    async def fetch(self, conn, service, key, tenant_id, product_ids):
+        assert (service, key) == ("prices", "by_id")
+        self.queries.append((tenant_id, list(product_ids)))
+        if self.during_load is not None:
+            self.during_load()
+        return [
+            {
+                "product_id": product_id,
+                "name": f"Producto {product_id}",
+                "sku": None,
+                "sale_price": self.prices[(tenant_id, product_id)],
+                "historical_cost": None,
+                "iva_rate": Decimal("21.00"),
+                "is_active": True,
+            }
+            for product_id in product_ids
+            if (tenant_id, product_id) in self.prices
+        ]
+
+
+@pytest.fixture
+def clock(monkeypatch) -> FakeClock:
+    clock = FakeClock()
+    monkeypatch.setattr(prices, "time", SimpleNamespace(monotonic=clock))
+    return clock
+
+
+@pytest.fixture
+def products(monkeypatch) -> FakeProducts:
+    products = FakeProducts()
+    monkeypatch.setattr(prices.statement_registry, "fetch", products.fetch)
+    return products
+
+
+@pytest.fixture
+def cache(monkeypatch, clock, products) -> PriceCache:
+    monkeypatch.setattr(settings, "PRICE_CACHE_TTL", 60)
+    monkeypatch.setattr(settings, "PRICE_CACHE_MAX_TENANTS", 2)
+    return PriceCache()
+
+
+def get(cache: PriceCache, tenant_id: int, *product_ids: int) -> dict[int, Decimal]:
+    loaded = asyncio.run(cache.get_many(None, tenant_id, list(product_ids)))
+    return {product_id: price.sale_price for product_id, price in loaded.items()}
+
+
+def test_misses_load_once_then_hit(cache, products):
+    products.set(1, 10, "100.00")
+    products.set(1, 11, "250.50")
+
+    assert get(cache, 1, 10, 11, 10) == {10: Decimal("100.00"), 11: Decimal("250.50")}
+    assert get(cache, 1, 11) == {11: Decimal("250.50")}
+
+    assert products.queries == [(1, [10, 11])]
+    stats = cache.stats()
+    assert (stats["hits"], stats["misses"], stats["hit_rate"]) == (1, 2, 0.3333)
+
+
+def test_unknown_products_are_not_found(cache, products):
+    products.set(1, 10, "100.00")
+
+    with pytest.raises(NotFoundError) as exc_info:
+        get(cache, 1, 10, 98, 99)
+
+    assert "98,99" in str(exc_info.value)
+    # The known product was still cached
+    assert get(cache, 1, 10) == {10: Decimal("100.00")}
+    assert len(products.queries) == 1
+
+
+def test_entries_expire_after_the_ttl(cache, products, clock):
+    products.set(1, 10, "100.00")
+    get(cache, 1, 10)
+
+    products.set(1, 10, "120.00")
+    clock.now += 60
+    assert get(cache, 1, 10) == {10: Decimal("100.00")}  # Not yet expired
+
+    clock.now += 1
+    assert get(cache, 1, 10) == {10: Decimal("120.00")}
+    assert cache.stats()["expired"] == 1
+
+
+def test_invalidating_a_tenant_reloads_only_that_tenant(cache, products):
+    products.set(1, 10, "100.00")
+    products.set(2, 20, "5.00")
+    get(cache, 1, 10)
+    get(cache, 2, 20)
+
+    products.set(1, 10, "110.00")
+    products.set(2, 20, "6.00")
+    cache.invalidate("1")
+
+    assert cache.generation(1) == 1
+    assert cache.generation(2) == 0
+    assert get(cache, 1, 10) == {10: Decimal("110.00")}
+    assert get(cache, 2, 20) == {20: Decimal("5.00")}
+
+
+def test_invalidating_everything_after_a_listener_reconnect(cache, products):
+    products.set(1, 10, "100.00")
+    products.set(2, 20, "5.00")
+    get(cache, 1, 10)
+    get(cache, 2, 20)
+
+    products.set(1, 10, "110.00")
+    products.set(2, 20, "6.00")
+    cache.invalidate(None)
+
+    assert cache.stats()["tenants"] == 0
+    assert get(cache, 1, 10) == {10: Decimal("110.00")}
+    assert get(cache, 2, 20) == {20: Decimal("6.00")}
+    assert cache.stats()["invalidations"] == 1
+
+
+def test_a_load_racing_an_invalidation_is_served_but_not_cached(cache, products):
+    products.set(1, 10, "100.00")
+    products.during_load = lambda: cache.invalidate("1")
+
+    assert get(cache, 1, 10) == {10: Decimal("100.00")}
+
+    products.during_load = None
+    get(cache, 1, 10)
+    assert len(products.queries) == 2
+
+
+def test_least_recently_used_tenant_is_evicted(cache, products):
+    for tenant_id in (1, 2, 3):
+        products.set(tenant_id, 10, "1.00")
+
+    get(cache, 1, 10)
+    get(cache, 2, 10)
+    get(cache, 1, 10)  # Tenant 2 is now the least recently used
+    get(cache, 3, 10)
+
+    assert cache.stats()["evictions"] == 1
+    queries = len(products.queries)
+    get(cache, 1, 10)
+    assert len(products.queries) == queries
+    get(cache, 2, 10)
+    assert len(products.queries) == queries + 1
+
+
+def test_staleness_of_served_entries(cache, products, clock):
+    products.set(1, 10, "100.00")
+    get(cache, 1, 10)
+
+    clock.now += 10
+    get(cache, 1, 10)
+    clock.now += 20
+    get(cache, 1, 10)
+
+    staleness = cache.stats()["staleness_seconds"]
+    assert staleness == {"mean_served": 20.0, "max_served": 30.0, "oldest_entry": 30.0}
@@ -0,0 +1,155 @@
+import asyncio
+from decimal import Decimal
+
+import pytest
+
+from src.api.schemas import ProductQty
+from src.core.exceptions import InvalidQuantityError, NotFoundError
+from src.services import production
+from src.services.production import BomGraph, compute_max_producible
+
+TENANT_ID = 7
+
+FLOUR, SUGAR, EGGS, COCOA = 1, 2, 3, 4
+
+
+def bom_row(product_id, product_name, component_id=None, stock=None, quantity=None):
+    names = {FLOUR: "Harina", SUGAR: "Azúcar", EGGS: "Huevos", COCOA: "Cacao"}
+    return {
+        "product_id": product_id,
+        "product_name": product_name,
+        "component_id": component_id,
+        "component_name": names.get(component_id),
+        "current_stock": None if stock is None else Decimal(stock),
+        "quantity": None if quantity is None else Decimal(quantity),
+    }
+
+
+def make_graph(stock: dict[int, str]) -> BomGraph:
+    """Cake (flour, sugar, eggs), brownie (flour, cocoa), bread without a BOM"""
+    return BomGraph.from_rows(
+        [
+            bom_row(10, "Torta", FLOUR, stock[FLOUR], "0.500"),
+            bom_row(10, "Torta", SUGAR, stock[SUGAR], "0.250"),
+            bom_row(10, "Torta", EGGS, stock[EGGS], "4"),
+            bom_row(11, "Brownie", FLOUR, stock[FLOUR], "0.200"),
+            bom_row(11, "Brownie", COCOA, stock[COCOA], "0.150"),
+            bom_row(12, "Pan"),
+        ]
+    )
+
+
+def by_product(results):
+    return {r.product_id: r for r in results}
+
+
+def test_max_producible_reports_the_limiting_component():
+    graph = make_graph({FLOUR: "10", SUGAR: "1.000", EGGS: "30", COCOA: "3"})
+
+    results = by_product(compute_max_producible(graph))
+
+    # Cake: flour 20, sugar 4, eggs 7 -> sugar limits
+    assert results[10].max_quantity == 4
+    assert results[10].limiting_component_id == SUGAR
+    assert results[10].limiting_component_name == "Azúcar"
+    # Brownie: flour 50, cocoa 20
+    assert results[11].max_quantity == 20
+    assert results[11].limiting_component_id == COCOA
+
+
+def test_product_without_bom_has_no_max_quantity():
+    graph = make_graph({FLOUR: "10", SUGAR: "1", EGGS: "30", COCOA: "3"})
+
+    bread = by_product(compute_max_producible(graph))[12]
+
+    assert bread.product_name == "Pan"
+    assert bread.max_quantity is None
+    assert bread.limiting_component_id is None
+
+
+def test_graph_without_any_bom_lines():
+    graph = BomGraph.from_rows([bom_row(12, "Pan")])
+
+    assert [r.max_quantity for r in compute_max_producible(graph)] == [None]
+
+
+def test_zero_and_negative_stock_produce_nothing():
+    graph = make_graph({FLOUR: "10", SUGAR: "0", EGGS: "30", COCOA: "-2"})
+
+    results = by_product(compute_max_producible(graph))
+
+    assert (results[10].max_quantity, results[10].limiting_component_id) == (0, SUGAR)
+    assert (results[11].max_quantity, results[11].limiting_component_id) == (0, COCOA)
+
+
+def test_fractional_quantities_never_overstate():
+    # 1 / 0.3335 = 2.99...: rounding the per-unit quantity up keeps it at 2
+    graph = BomGraph.from_rows(
+        [
+            bom_row(20, "Alfajor", SUGAR, "1.000", "0.3335"),
+            bom_row(21, "Galletita", FLOUR, "0.6659", "0.333"),
+        ]
+    )
+
+    results = by_product(compute_max_producible(graph))
+
+    assert results[20].max_quantity == 2
+    assert results[21].max_quantity == 1  # 0.6659 / 0.333 = 1.99...
+
+
+@pytest.fixture
+def cached_graph(monkeypatch):
+    """Serve a fixed graph from the BOM cache, no database involved"""
+
+    def install(graph: BomGraph) -> None:
+        monkeypatch.setattr(production.bom_graphs, "_graphs", {TENANT_ID: graph})
+
+    return install
+
+
+def check(items: list[tuple[int, int]]):
+    return asyncio.run(
+        production.check_production_batch(
+            None, TENANT_ID, [ProductQty(product_id=p, quantity=q) for p, q in items]
+        )
+    )
+
+
+def test_batch_flags_components_short_only_for_the_combined_demand(cached_graph):
+    # Flour: 3 cakes need 1.5, 10 brownies need 2.0, 3.0 in stock
+    cached_graph(make_graph({FLOUR: "3", SUGAR: "5", EGGS: "30", COCOA: "5"}))
+
+    result = check([(10, 3), (11, 10)])
+
+    assert all(item.can_produce for item in result.items)
+    assert not result.can_produce_all
+
+    components = {c.component_id: c for c in result.components}
+    flour = components[FLOUR]
+    assert flour.total_needed == Decimal("3.5")
+    assert flour.missing_quantity == Decimal("0.5")
+    assert flour.product_ids == [10, 11]
+    assert flour.contended
+    assert components[SUGAR].can_produce and not components[SUGAR].contended
+
+
+def test_batch_shortage_of_a_single_product_is_not_contention(cached_graph):
+    cached_graph(make_graph({FLOUR: "3", SUGAR: "5", EGGS: "30", COCOA: "1"}))
+
+    result = check([(10, 1), (11, 10)])
+
+    brownie = {item.product_id: item for item in result.items}[11]
+    assert not brownie.can_produce
+
+    cocoa = {c.component_id: c for c in result.components}[COCOA]
+    assert not cocoa.can_produce
+    assert not cocoa.contended
+
+
+def test_batch_rejects_bad_items(cached_graph):
+    cached_graph(make_graph({FLOUR: "3", SUGAR: "5", EGGS: "30", COCOA: "1"}))
+
+    with pytest.raises(InvalidQuantityError):
+        check([(10, 0)])
+    with pytest.raises(NotFoundError):
+        check([(99, 1)])